@@ -1,11 +1,136 @@
+import functools
+import hashlib
+import hmac
+import math
+from dataclasses import dataclass
 from typing import Optional
-from fastapi import Header, HTTPException, status
+
+from fastapi import Header, HTTPException, Request, status
+
 from accounting_api.app.core.config import settings
+from accounting_api.app.core.metrics import REGISTRY, Counter
+from accounting_api.app.core.rate_limit import RateLimiter
+
+# No key label: /metrics is public and must not list the client names
+API_KEY_REQUESTS = REGISTRY.register(Counter(
+    "api_key_requests_total",
+    "Authenticated requests by result (allowed, throttled, rejected).",
+    ("result",),
+))
+READ_REQUESTS_THROTTLED = REGISTRY.register(Counter(
+    "read_requests_throttled_total",
+    "Unauthenticated reads refused with 429, by caller (key, client).",
+    ("caller",),
+))
+
+RATE_LIMITER = RateLimiter()
+
 
+@dataclass(frozen=True)
+class ApiKey:
+    name: str
+    digest: bytes
+    rate_per_second: float  # 0 = unlimited
+    burst: int
+
+
+def hash_api_key(key: str) -> str:
+    """SHA-256 hex digest of `key`, as stored in `settings.api_keys`."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def api_key_table() -> dict[bytes, ApiKey]:
+    """
+    Configured keys by digest, built once. Without `settings.api_keys`
+    the single `settings.api_key` is accepted under the name "default".
+    Call `api_key_table.cache_clear()` after changing the settings.
+    """
+    entries = [
+        (name, bytes.fromhex(key.sha256), key.rate_per_second, key.burst)
+        for name, key in settings.api_keys.items()
+    ]
+    if not entries:
+        digest = bytes.fromhex(hash_api_key(settings.api_key))
+        entries = [("default", digest, None, None)]
+    return {
+        digest: ApiKey(
+            name,
+            digest,
+            settings.rate_limit_per_second if rate is None else rate,
+            settings.rate_limit_burst if burst is None else burst,
+        )
+        for name, digest, rate, burst in entries
+    }
 
-def get_api_key(x_api_key: str = Header(...)) -> Optional[str]:
-    if x_api_key != settings.api_key:
+
+def _lookup(x_api_key: str) -> Optional[ApiKey]:
+    # Only digests are kept, and the table is keyed by the digest of the
+    # presented key, so lookup timing depends on that hash, never on the
+    # stored keys; the final comparison is constant-time.
+    digest = hashlib.sha256(x_api_key.encode()).digest()
+    key = api_key_table().get(digest)
+    if key is None or not hmac.compare_digest(key.digest, digest):
+        return None
+    return key
+
+
+def _throttle(bucket: str, rate: float, burst: int) -> Optional[HTTPException]:
+    """A 429 when the `bucket` is out of tokens, else None."""
+    if rate <= 0:
+        return None
+    wait = RATE_LIMITER.acquire(bucket, rate, burst)
+    if not wait:
+        return None
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded",
+        headers={"Retry-After": str(math.ceil(wait))},
+    )
+
+
+def get_api_key(x_api_key: str = Header(...)) -> str:
+    """
+    Authenticate the request and charge it to the key's rate limit.
+    Returns the key's name.
+    """
+    key = _lookup(x_api_key)
+    if key is None:
+        API_KEY_REQUESTS.inc("rejected")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key",
         )
+
+    throttled = _throttle(key.name, key.rate_per_second, key.burst)
+    if throttled is not None:
+        API_KEY_REQUESTS.inc("throttled")
+        raise throttled
+    API_KEY_REQUESTS.inc("allowed")
+    return key.name
+
+
+def rate_limit(
+        request: Request,
+        x_api_key: Optional[str] = Header(None)
+        ) -> None:
+    """
+    Rate limit for endpoints that do not require a key. A valid key is
+    charged to its own bucket; anything else (no key, or an unknown one)
+    to a bucket per client address with the global defaults.
+    """
+    key = _lookup(x_api_key) if x_api_key else None
+    if key is not None:
+        throttled = _throttle(key.name, key.rate_per_second, key.burst)
+        caller = "key"
+    else:
+        host = request.client.host if request.client else "unknown"
+        throttled = _throttle(
+            f"client:{host}",
+            settings.rate_limit_per_second,
+            settings.rate_limit_burst,
+        )
+        caller = "client"
+    if throttled is not None:
+        READ_REQUESTS_THROTTLED.inc(caller)
+        raise throttled
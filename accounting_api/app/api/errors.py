@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from accounting_api.app.core.jobs import QueueClosedError, QueueFullError
 from accounting_api.app.services.errors import (
     NotFoundError,
     InvalidOperationError
@@ -39,6 +40,33 @@ def invalid_operation_handler(request: Request, exc: InvalidOperationError):
     )
 
 
+def queue_full_handler(request: Request, exc: QueueFullError):
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": "1"},
+        content={
+            "error": {
+                "type": "queue_full",
+                "message": str(exc),
+                "request_id": _request_id(request),
+            }
+        },
+    )
+
+
+def queue_closed_handler(request: Request, exc: QueueClosedError):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": {
+                "type": "unavailable",
+                "message": str(exc),
+                "request_id": _request_id(request),
+            }
+        },
+    )
+
+
 def unhandled_exception_handler(request: Request, exc: Exception):
     # Don’t leak internal details
     return JSONResponse(
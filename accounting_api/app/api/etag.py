@@ -0,0 +1,37 @@
+"""
+Weak ETags for entity reads.
+
+Tags are derived from the row's `version` column, so checking a
+conditional request only needs the version, not the serialized document.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def entity_etag(kind: str, entity_id: int, version: int) -> str:
+    return f'W/"{kind}-{entity_id}-v{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """`If-None-Match` check using weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={ETAG_HEADER: etag},
+    )
@@ -3,56 +3,101 @@ from __future__ import annotations
 import time
 import uuid
 import logging
-from typing import Callable, Awaitable
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from accounting_api.app.core.instrumentation import (
+    RequestStats,
+    bind_request_stats,
+    reset_request_stats,
+)
+from accounting_api.app.core.metrics import record_request
 
 log = logging.getLogger("app")
 
 REQUEST_ID_HEADER = "X-Request-Id"
+SERVER_TIMING_HEADER = "Server-Timing"
+# Metrics label for requests that matched no route, so unknown paths
+# cannot create unbounded label values
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestContextMiddleware:
+    """
+    Plain ASGI middleware (no `BaseHTTPMiddleware` task or body wrapping,
+    so streaming responses pass through untouched).
+
+    Assigns each request an id (taken from `X-Request-Id` when provided),
+    exposes it as `request.state.request_id`, and adds `X-Request-Id` and
+    `Server-Timing` (total, db and serialize durations up to the response
+    headers) to the response. Request metrics are recorded per route
+    template once the response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-            self,
-            request: Request,
-            call_next: Callable[[Request], Awaitable[Response]]
-            ) -> Response:
-        request_id = request.headers.get(
-            REQUEST_ID_HEADER) or str(uuid.uuid4()
-                                      )
+        request_id = (
+            Headers(scope=scope).get(REQUEST_ID_HEADER) or str(uuid.uuid4())
+        )
         start = time.perf_counter()
 
         # attach to request.state so handlers can access it
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        stats = RequestStats(request_id=request_id)
+        token = bind_request_stats(stats)
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                headers[SERVER_TIMING_HEADER] = stats.server_timing(total_ms)
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_headers)
         except Exception:
             duration_ms = int((time.perf_counter() - start) * 1000)
             log.exception(
                 "Unhandled exception",
                 extra={
                     "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": scope["method"],
+                    "path": scope["path"],
                     "duration_ms": duration_ms,
                 },
             )
             raise
+        finally:
+            reset_request_stats(token)
+            route = scope.get("route")
+            record_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+                stats.db_statements,
+            )
 
         duration_ms = int((time.perf_counter() - start) * 1000)
-        response.headers[REQUEST_ID_HEADER] = request_id
-
         log.info(
             "request",
             extra={
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
                 "duration_ms": duration_ms,
+                "db_statements": stats.db_statements,
+                "db_ms": round(stats.db_ms, 3),
             },
         )
-        return response
@@ -1,17 +1,77 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from accounting_api.app.api.dependencies.auth import get_api_key
+from accounting_api.app.api.dependencies.auth import get_api_key, rate_limit
+from accounting_api.app.api.etag import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    not_modified,
+)
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.api.serialization import (
+    CUSTOMER_ADAPTER,
+    CUSTOMER_INVOICE_LIST_ADAPTER,
+    CUSTOMER_LIST_ADAPTER,
+    typed_json,
+)
 from accounting_api.app.core.db_adapter import get_db
+from accounting_api.app.models.sqlalchemy_models import Customer
 from accounting_api.app.services.customer_service import CustomerService
+from accounting_api.app.services.invoice_service import InvoiceService
+from accounting_api.app.services.customer_import import (
+    DEFAULT_CHUNK_SIZE,
+    CustomerImporter,
+    aiter_lines,
+)
 from accounting_api.app.models.schemas.customer import (
     CustomerCreate,
+    CustomerImportReport,
     CustomerRead,
 )
+from accounting_api.app.models.schemas.invoice import (
+    InvoiceRead,
+    InvoiceSummaryRead,
+)
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+
+router = APIRouter(
+    prefix="/customers", tags=["customers"], route_class=TimedRoute
+)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+STREAM_CHUNK_ROWS = 500
+# Summaries unless `include=line_items`; the richer model is tried second so
+# a summary is never padded with an empty `line_items`
+CustomerInvoiceList = list[Union[InvoiceSummaryRead, InvoiceRead]]
 
-router = APIRouter(prefix="/customers", tags=["customers"])
+
+def _ndjson_chunks(customers: Iterable[Customer]) -> Iterator[bytes]:
+    """Encode customers as NDJSON, a few hundred rows per chunk."""
+    buffer: list[str] = []
+    for customer in customers:
+        buffer.append(CustomerRead.model_validate(customer).model_dump_json())
+        if len(buffer) >= STREAM_CHUNK_ROWS:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
 
 
 # ---- Routes ---- #
@@ -31,18 +91,67 @@ def create_customer(
     )
 
 
-@router.get("/{customer_id}", response_model=CustomerRead)
+@router.post(
+    "/import",
+    response_model=CustomerImportReport,
+    dependencies=[Depends(get_api_key)]
+)
+async def import_customers(
+    request: Request,
+    format: Optional[str] = Query(default=None, pattern="^(ndjson|csv)$"),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=1, le=50_000),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk import customers from an NDJSON or CSV request body.
+
+    The body is read as a stream and inserted in committed chunks of
+    `chunk_size` rows; invalid rows are skipped and reported by line
+    number. The format defaults to CSV for `text/csv` bodies and NDJSON
+    otherwise.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    importer = CustomerImporter(db, fmt=format, chunk_size=chunk_size)
+    async for line in aiter_lines(request.stream()):
+        if importer.add_line(line):
+            # Database work stays off the event loop
+            await run_in_threadpool(importer.flush)
+    return await run_in_threadpool(importer.finish)
+
+
+@router.get(
+    "/{customer_id}",
+    response_model=CustomerRead,
+    dependencies=[Depends(rate_limit)]
+)
 def read_customer(
     customer_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
-    customer = CustomerService(db).get_customer(customer_id)
+    service = CustomerService(db)
+    if if_none_match:
+        # Only the version is needed to answer a matching poll
+        version = service.customer_version(customer_id)
+        if version is not None:
+            etag = entity_etag("customer", customer_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    customer = service.read_customer(customer_id)
     if customer is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Customer not found",
         )
-    return customer
+    response.headers[ETAG_HEADER] = entity_etag(
+        "customer", customer.id, customer.version
+    )
+    return typed_json(CUSTOMER_ADAPTER, customer, response)
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -59,8 +168,72 @@ def delete_customer(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/", response_model=list[CustomerRead])
+@router.get(
+    "/",
+    response_model=list[CustomerRead],
+    dependencies=[Depends(rate_limit)]
+)
 def list_customers(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: Optional[int] = Query(default=None, ge=0),
+    stream: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Keyset-paginated customer listing.
+
+    Pass the `X-Next-Cursor` response header back as `after` to fetch the
+    next page; the header is absent on the last page. With `stream=true`
+    every customer is streamed as NDJSON instead and paging is ignored.
+    """
+    service = CustomerService(db)
+    if stream:
+        return StreamingResponse(
+            _ndjson_chunks(service.iter_customers()),
+            media_type="application/x-ndjson",
+        )
+
+    customers, next_cursor = service.list_customers(limit=limit, after=after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return typed_json(CUSTOMER_LIST_ADAPTER, customers, response)
+
+
+@router.get(
+    "/{customer_id}/invoices",
+    response_model=CustomerInvoiceList,
+    dependencies=[Depends(rate_limit)]
+)
+def list_customer_invoices(
+    customer_id: int,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: Optional[int] = Query(default=None, ge=0),
+    status: Optional[InvoiceStatus] = None,
+    issued_from: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None,
+    include: Optional[str] = Query(default=None, pattern="^line_items$"),
     db: Session = Depends(get_db),
 ):
-    return CustomerService(db).list_customers()
+    """
+    Keyset-paginated invoices of one customer, optionally filtered by
+    status and by issue date (`issued_from` inclusive, `issued_before`
+    exclusive).
+
+    Each invoice carries its stored `total_amount` and `line_item_count`,
+    so a page is one query; `include=line_items` adds the line items with
+    one more. Paging works as for `GET /customers/`.
+    """
+    invoices, next_cursor = InvoiceService(db).list_customer_invoices(
+        customer_id,
+        limit=limit,
+        after=after,
+        status=status,
+        issued_from=issued_from,
+        issued_before=issued_before,
+        include_line_items=include == "line_items",
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return typed_json(CUSTOMER_INVOICE_LIST_ADAPTER, invoices, response)
@@ -0,0 +1,190 @@
+"""
+AsyncSession-backed variants of the routes in `customers.py`.
+
+Included ahead of the sync router when `settings.db_mode == "async"`, so
+these handlers take precedence for the paths they define.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from accounting_api.app.api.dependencies.auth import get_api_key, rate_limit
+from accounting_api.app.api.etag import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    not_modified,
+)
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.api.serialization import (
+    CUSTOMER_ADAPTER,
+    CUSTOMER_INVOICE_LIST_ADAPTER,
+    CUSTOMER_LIST_ADAPTER,
+    typed_json,
+)
+from accounting_api.app.api.routes.customers import (
+    NEXT_CURSOR_HEADER,
+    STREAM_CHUNK_ROWS,
+    CustomerInvoiceList,
+)
+from accounting_api.app.core.db_adapter import get_async_db
+from accounting_api.app.models.sqlalchemy_models import (
+    Customer,
+    InvoiceStatus,
+)
+from accounting_api.app.services.customer_service import AsyncCustomerService
+from accounting_api.app.services.invoice_service import AsyncInvoiceService
+from accounting_api.app.models.schemas.customer import (
+    CustomerCreate,
+    CustomerRead,
+)
+
+router = APIRouter(
+    prefix="/customers", tags=["customers"], route_class=TimedRoute
+)
+
+
+async def _ndjson_chunks(
+        customers: AsyncIterable[Customer]
+        ) -> AsyncIterator[bytes]:
+    buffer: list[str] = []
+    async for customer in customers:
+        buffer.append(CustomerRead.model_validate(customer).model_dump_json())
+        if len(buffer) >= STREAM_CHUNK_ROWS:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+# ---- Routes ---- #
+@router.post(
+    "/",
+    response_model=CustomerRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_api_key)]
+)
+async def create_customer(
+    payload: CustomerCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncCustomerService(db).create_customer(
+        name=payload.name,
+        email=payload.email,
+    )
+
+
+@router.get(
+    "/{customer_id}",
+    response_model=CustomerRead,
+    dependencies=[Depends(rate_limit)]
+)
+async def read_customer(
+    customer_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncCustomerService(db)
+    if if_none_match:
+        version = await service.customer_version(customer_id)
+        if version is not None:
+            etag = entity_etag("customer", customer_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    customer = await service.read_customer(customer_id)
+    if customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found",
+        )
+    response.headers[ETAG_HEADER] = entity_etag(
+        "customer", customer.id, customer.version
+    )
+    return typed_json(CUSTOMER_ADAPTER, customer, response)
+
+
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_customer(
+    customer_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    deleted = await AsyncCustomerService(db).delete_customer(customer_id)
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found",
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/",
+    response_model=list[CustomerRead],
+    dependencies=[Depends(rate_limit)]
+)
+async def list_customers(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: Optional[int] = Query(default=None, ge=0),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncCustomerService(db)
+    if stream:
+        return StreamingResponse(
+            _ndjson_chunks(service.iter_customers()),
+            media_type="application/x-ndjson",
+        )
+
+    customers, next_cursor = await service.list_customers(
+        limit=limit, after=after
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return typed_json(CUSTOMER_LIST_ADAPTER, customers, response)
+
+
+@router.get(
+    "/{customer_id}/invoices",
+    response_model=CustomerInvoiceList,
+    dependencies=[Depends(rate_limit)]
+)
+async def list_customer_invoices(
+    customer_id: int,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: Optional[int] = Query(default=None, ge=0),
+    status: Optional[InvoiceStatus] = None,
+    issued_from: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None,
+    include: Optional[str] = Query(default=None, pattern="^line_items$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncInvoiceService(db)
+    invoices, next_cursor = await service.list_customer_invoices(
+        customer_id,
+        limit=limit,
+        after=after,
+        status=status,
+        issued_from=issued_from,
+        issued_before=issued_before,
+        include_line_items=include == "line_items",
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return typed_json(CUSTOMER_INVOICE_LIST_ADAPTER, invoices, response)
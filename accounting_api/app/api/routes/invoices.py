@@ -1,17 +1,41 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Response, status
 from sqlalchemy.orm import Session
 
-from accounting_api.app.api.dependencies.auth import get_api_key
+from accounting_api.app.api.dependencies.auth import get_api_key, rate_limit
+from accounting_api.app.api.etag import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    not_modified,
+)
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.api.serialization import (
+    INVOICE_ADAPTER,
+    typed_json,
+)
 from accounting_api.app.core.db_adapter import get_db
+from accounting_api.app.core.db_infrastructure import call_after_commit
+from accounting_api.app.core.jobs import get_job_queue
 from accounting_api.app.models.schemas.invoice import (
+    MAX_LINE_ITEM_BATCH,
+    BulkTransitionRead,
+    InvoiceBulkIssue,
+    InvoiceBulkTransition,
     InvoiceCreate,
     InvoiceRead,
+    LineItemBatchRead,
     LineItemCreate,
     LineItemRead,
 )
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.services import invoice_jobs
 from accounting_api.app.services.invoice_service import InvoiceService
 
-router = APIRouter(prefix="/invoices", tags=["invoices"])
+router = APIRouter(
+    prefix="/invoices", tags=["invoices"], route_class=TimedRoute
+)
 
 
 @router.post(
@@ -24,15 +48,84 @@ def create_invoice(
     payload: InvoiceCreate,
     db: Session = Depends(get_db),
 ):
-    return InvoiceService(db).create_invoice(payload.customer_id)
+    return InvoiceService(db).create_invoice(
+        payload.customer_id, payload.currency
+    )
+
+
+def _bulk_transition(
+    to_status: InvoiceStatus,
+    payload: InvoiceBulkTransition,
+    db: Session,
+) -> BulkTransitionRead:
+    selection = payload.filter
+    return InvoiceService(db).bulk_transition(
+        to_status,
+        ids=payload.ids,
+        customer_id=getattr(selection, "customer_id", None),
+        issued_before=getattr(selection, "issued_before", None),
+    )
+
+
+@router.post(
+    ":issue",
+    response_model=BulkTransitionRead,
+    dependencies=[Depends(get_api_key)]
+)
+def issue_invoices(
+    payload: InvoiceBulkIssue,
+    db: Session = Depends(get_db),
+):
+    """
+    Issue draft invoices in bulk, by `ids` or a `customer_id` filter
+    (drafts have no issue date to filter on), with chunked
+    set-based UPDATEs. Returns how many were issued, and how many of the
+    requested ids were not drafts or do not exist.
+    """
+    return _bulk_transition(InvoiceStatus.issued, payload, db)
+
+
+@router.post(
+    ":pay",
+    response_model=BulkTransitionRead,
+    dependencies=[Depends(get_api_key)]
+)
+def pay_invoices(
+    payload: InvoiceBulkTransition,
+    db: Session = Depends(get_db),
+):
+    """Mark issued invoices as paid in bulk; see `POST /invoices:issue`."""
+    return _bulk_transition(InvoiceStatus.paid, payload, db)
 
 
-@router.get("/{invoice_id}", response_model=InvoiceRead)
+@router.get(
+    "/{invoice_id}",
+    response_model=InvoiceRead,
+    dependencies=[Depends(rate_limit)]
+)
 def get_invoice(
     invoice_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
-    return InvoiceService(db).get_invoice(invoice_id)
+    """
+    Supports conditional requests: a matching `If-None-Match` gets a 304
+    after a version lookup, without loading or serializing line items.
+    """
+    service = InvoiceService(db)
+    if if_none_match:
+        etag = entity_etag(
+            "invoice", invoice_id, service.invoice_version(invoice_id)
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    invoice = service.read_invoice(invoice_id)
+    response.headers[ETAG_HEADER] = entity_etag(
+        "invoice", invoice.id, invoice.version
+    )
+    return typed_json(INVOICE_ADAPTER, invoice, response)
 
 
 @router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -43,6 +136,27 @@ def delete_invoice(
     return InvoiceService(db).delete_invoice(invoice_id)
 
 
+@router.post(
+    "/{invoice_id}/issue",
+    response_model=InvoiceRead,
+    dependencies=[Depends(get_api_key)]
+)
+def issue_invoice(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Issue a draft invoice and return it; 404 for an unknown invoice, 409
+    for one that is not a draft. Slow follow-up work runs in an
+    `invoice.issued` background job, queued once the issue committed.
+    """
+    invoice = InvoiceService(db).issue_invoice(invoice_id)
+    call_after_commit(db, lambda: get_job_queue().submit_threadsafe(
+        invoice_jobs.INVOICE_ISSUED, invoice_jobs.invoice_issued, invoice_id
+    ))
+    return invoice
+
+
 @router.post(
     "/{invoice_id}/items",
     response_model=LineItemRead,
@@ -54,9 +168,34 @@ def add_line_item(
     db: Session = Depends(get_db),
 ):
     service = InvoiceService(db)
-    return service.add_line_item(
+    return service.add_line_item(invoice_id=invoice_id, **payload.to_row())
+
+
+@router.post(
+    "/{invoice_id}/items/batch",
+    response_model=LineItemBatchRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_api_key)]
+)
+def add_line_items(
+    invoice_id: int,
+    payload: Annotated[
+        List[LineItemCreate],
+        Body(min_length=1, max_length=MAX_LINE_ITEM_BATCH),
+    ],
+    db: Session = Depends(get_db),
+):
+    """
+    Add up to `MAX_LINE_ITEM_BATCH` line items in one request, inserted
+    with a single batched statement.
+    """
+    lines, invoice = InvoiceService(db).add_line_items(
         invoice_id=invoice_id,
-        description=payload.description,
-        quantity=payload.quantity,
-        unit_price=payload.unit_price,
+        items=[item.to_row() for item in payload],
+    )
+    return LineItemBatchRead(
+        invoice_id=invoice.id,
+        items=[LineItemRead.model_validate(line) for line in lines],
+        total_cents=invoice.total_cents,
+        line_item_count=invoice.line_item_count,
     )
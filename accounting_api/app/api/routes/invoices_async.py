@@ -0,0 +1,99 @@
+"""
+AsyncSession-backed variants of the routes in `invoices.py`.
+
+Included ahead of the sync router when `settings.db_mode == "async"`, so
+these handlers take precedence for the paths they define.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from accounting_api.app.api.dependencies.auth import get_api_key, rate_limit
+from accounting_api.app.api.etag import (
+    ETAG_HEADER,
+    entity_etag,
+    etag_matches,
+    not_modified,
+)
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.api.serialization import (
+    INVOICE_ADAPTER,
+    typed_json,
+)
+from accounting_api.app.core.db_adapter import get_async_db
+from accounting_api.app.models.schemas.invoice import (
+    InvoiceCreate,
+    InvoiceRead,
+    LineItemCreate,
+    LineItemRead,
+)
+from accounting_api.app.services.invoice_service import AsyncInvoiceService
+
+router = APIRouter(
+    prefix="/invoices", tags=["invoices"], route_class=TimedRoute
+)
+
+
+@router.post(
+        "/",
+        response_model=InvoiceRead,
+        status_code=status.HTTP_201_CREATED,
+        dependencies=[Depends(get_api_key)]
+)
+async def create_invoice(
+    payload: InvoiceCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncInvoiceService(db).create_invoice(
+        payload.customer_id, payload.currency
+    )
+
+
+@router.get(
+    "/{invoice_id}",
+    response_model=InvoiceRead,
+    dependencies=[Depends(rate_limit)]
+)
+async def get_invoice(
+    invoice_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncInvoiceService(db)
+    if if_none_match:
+        etag = entity_etag(
+            "invoice", invoice_id, await service.invoice_version(invoice_id)
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    invoice = await service.read_invoice(invoice_id)
+    response.headers[ETAG_HEADER] = entity_etag(
+        "invoice", invoice.id, invoice.version
+    )
+    return typed_json(INVOICE_ADAPTER, invoice, response)
+
+
+@router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_invoice(
+    invoice_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncInvoiceService(db).delete_invoice(invoice_id)
+
+
+@router.post(
+    "/{invoice_id}/items",
+    response_model=LineItemRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_line_item(
+    invoice_id: int,
+    payload: LineItemCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncInvoiceService(db).add_line_item(
+        invoice_id=invoice_id, **payload.to_row()
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from accounting_api.app.api.dependencies.auth import rate_limit
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.core.jobs import get_job_queue
+from accounting_api.app.models.schemas.job import JobRead
+from accounting_api.app.services.errors import NotFoundError
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TimedRoute)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobRead,
+    dependencies=[Depends(rate_limit)]
+)
+async def get_job(job_id: str):
+    """Status of a background job (kept for a while after it finishes)."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise NotFoundError(f"Job with ID {job_id} not found.")
+    return JobRead.model_validate(job)
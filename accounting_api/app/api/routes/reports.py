@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from accounting_api.app.api.dependencies.auth import get_api_key
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.core.db_adapter import get_db
+from accounting_api.app.models.schemas.report import AgingReportRead
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.services.report_service import ReportService
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+    route_class=TimedRoute,
+    dependencies=[Depends(get_api_key)],
+)
+
+
+@router.get("/aging", response_model=AgingReportRead)
+def aging_report(
+    as_of: Optional[datetime] = None,
+    status: Optional[List[InvoiceStatus]] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Accounts-receivable aging: invoice totals per customer and status in
+    current / 30 / 60 / 90+ day buckets by `issued_at`, plus overall totals
+    per status. Defaults to issued invoices as of now; repeat `status` to
+    report on several.
+    """
+    return ReportService(db).aging_report(as_of=as_of, statuses=status)
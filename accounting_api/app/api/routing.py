@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from accounting_api.app.core.instrumentation import (
+    mark_endpoint_done,
+    mark_response_serialized,
+)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # `functools.wraps` keeps the signature FastAPI reads parameters from
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                mark_endpoint_done()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            mark_endpoint_done()
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that records how long FastAPI spends turning the endpoint's
+    return value into a response (validation against `response_model`
+    and JSON encoding), reported as `serialize` in `Server-Timing`.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            endpoint: Callable[..., Any],
+            **kwargs: Any
+            ) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(
+            self
+            ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            response = await handler(request)
+            mark_response_serialized()
+            return response
+
+        return timed_handler
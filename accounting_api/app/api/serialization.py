@@ -0,0 +1,83 @@
+"""
+Opt-in fast JSON path (`settings.fast_json`).
+
+FastAPI validates whatever an endpoint returns against its
+`response_model` before encoding it, even when the endpoint already built
+that model (cached read models) or a list of them. Endpoints on the hot
+read paths instead hand their result to `typed_json`, which validates ORM
+rows with a prebuilt `TypeAdapter` and dumps them to JSON bytes in one
+pass in pydantic-core, and returns the bytes as the response.
+
+Everything else uses `FastJSONResponse`, encoded with orjson when it is
+installed. With `fast_json` off both are inert and FastAPI's own
+serialization applies.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from accounting_api.app.core.config import settings
+from accounting_api.app.models.schemas.customer import CustomerRead
+from accounting_api.app.models.schemas.invoice import (
+    InvoiceRead,
+    InvoiceSummaryRead,
+)
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+T = TypeVar("T")
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Built once: constructing an adapter compiles its validator and serializer
+CUSTOMER_ADAPTER = TypeAdapter(CustomerRead)
+CUSTOMER_LIST_ADAPTER = TypeAdapter(list[CustomerRead])
+INVOICE_ADAPTER = TypeAdapter(InvoiceRead)
+# Mirrors `CustomerInvoiceList` in routes/customers.py
+CUSTOMER_INVOICE_LIST_ADAPTER = TypeAdapter(
+    list[InvoiceSummaryRead | InvoiceRead]
+)
+
+
+class FastJSONResponse(JSONResponse):
+    """`JSONResponse` encoded with orjson, or the stdlib without it."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+def default_response_class() -> type[Response]:
+    return FastJSONResponse if settings.fast_json else JSONResponse
+
+
+def typed_json(
+        adapter: TypeAdapter[T],
+        value: Any,
+        response: Optional[Response] = None
+        ) -> Any:
+    """
+    `value` (ORM objects or models matching `adapter`) encoded to a JSON
+    response by `adapter`, keeping headers already set on the endpoint's
+    `response`. Returns `value` untouched when `fast_json` is off.
+    """
+    if not settings.fast_json:
+        return value
+    value = adapter.validate_python(value, from_attributes=True)
+    fast = Response(
+        content=adapter.dump_json(value), media_type=JSON_MEDIA_TYPE
+    )
+    if response is not None:
+        # Returning a Response skips FastAPI's merge of these headers
+        fast.raw_headers.extend(
+            h for h in response.raw_headers if h[0] != b"content-length"
+        )
+    return fast
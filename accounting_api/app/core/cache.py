@@ -0,0 +1,225 @@
+"""
+Read-through cache for entity read models.
+
+Services cache the response schemas they build (immutable Pydantic
+models, safe to share between requests) under keys from `customer_key`
+and `invoice_key`. Repositories invalidate a key with
+`invalidate_on_commit` whenever they change the row: the entry is dropped
+immediately and once more after the session commits, so a reader that
+loaded the old row while the write was in flight cannot keep it cached.
+Rows read from a read replica are served but never cached, so replica
+lag cannot outlive the replica catching up.
+
+The default backend is an in-process LRU with a TTL. Each worker process
+has its own, so the TTL bounds how long other processes may serve a stale
+entry. A shared backend only needs to implement the `Cache` protocol and
+be installed with `set_cache`.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Protocol, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.metrics import REGISTRY, Counter
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total",
+    "Entity cache lookups by result (hit or miss).",
+    ("result",),
+))
+
+# Session.info key holding the cache keys to drop after commit
+_PENDING_KEYS = "cache_invalidations"
+# Session.info flag: read through to the database, ignoring cached values
+_FRESH_READS = "cache_fresh_reads"
+
+T = TypeVar("T")
+
+
+def customer_key(customer_id: int) -> str:
+    return f"customer:{customer_id}"
+
+
+def invoice_key(invoice_id: int) -> str:
+    return f"invoice:{invoice_id}"
+
+
+class Cache(Protocol):
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache of at most `max_entries` values, each expiring
+    `ttl_seconds` after it was stored.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 10_000,
+            ttl_seconds: float = 30.0,
+            clock: Callable[[], float] = time.monotonic
+            ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc("hit")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        CACHE_REQUESTS.inc("miss")
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NullCache:
+    """Cache that stores nothing; used when caching is disabled."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+def _make_default_cache() -> Cache:
+    if settings.cache_max_entries <= 0:
+        return NullCache()
+    return LRUCache(
+        max_entries=settings.cache_max_entries,
+        ttl_seconds=settings.cache_ttl_seconds,
+    )
+
+
+_cache: Cache = _make_default_cache()
+
+
+def get_cache() -> Cache:
+    return _cache
+
+
+def set_cache(cache: Cache) -> Cache:
+    """Install `cache` as the process-wide backend; returns the old one."""
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def invalidate_on_commit(db: Session | AsyncSession, *keys: str) -> None:
+    """Drop `keys` now and again once `db` commits."""
+    _cache.delete(*keys)
+    db.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+def require_fresh_reads(db: Session | AsyncSession) -> None:
+    """
+    Make `db` ignore cached values (it still fills the cache), e.g. for a
+    client that must see its own recent write.
+    """
+    db.info[_FRESH_READS] = True
+
+
+def cached(db: Session | AsyncSession, key: str) -> Optional[Any]:
+    """Cached value for `key`, unless `db` requires fresh reads."""
+    if db.info.get(_FRESH_READS):
+        return None
+    return _cache.get(key)
+
+
+def _fill(db: Session | AsyncSession, key: str, value: Any) -> None:
+    # A row this session changed may still be rolled back; never cache it
+    if value is None or key in db.info.get(_PENDING_KEYS, ()):
+        return
+    # A lagging replica may return a row older than the last invalidation;
+    # caching it would serve that row to everyone until the TTL expires
+    if getattr(db, "use_replica", False):
+        return
+    _cache.set(key, value)
+
+
+def read_through(
+        db: Session,
+        key: str,
+        load: Callable[[], Optional[T]]
+        ) -> Optional[T]:
+    """Cached value for `key`, else `load()` (cached unless None)."""
+    value = cached(db, key)
+    if value is None:
+        value = load()
+        _fill(db, key, value)
+    return value
+
+
+async def aread_through(
+        db: AsyncSession,
+        key: str,
+        load: Callable[[], Awaitable[Optional[T]]]
+        ) -> Optional[T]:
+    """`read_through` for an `AsyncSession`."""
+    value = cached(db, key)
+    if value is None:
+        value = await load()
+        _fill(db, key, value)
+    return value
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    keys = session.info.pop(_PENDING_KEYS, None)
+    if keys:
+        _cache.delete(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    # Nothing was written, and the keys were already dropped once
+    session.info.pop(_PENDING_KEYS, None)
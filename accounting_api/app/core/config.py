@@ -1,14 +1,51 @@
 from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class ApiKeyConfig(BaseModel):
+    """A client API key, stored as the SHA-256 hex digest of the key."""
+
+    sha256: str
+    # Requests per second and bucket size; None uses the global defaults
+    rate_per_second: Optional[float] = None
+    burst: Optional[int] = None
+
+
 class Settings(BaseSettings):
     app_name: str = "Accounting API"
     environment: str = "dev"  # dev | test | prod
     debug: bool = True
     database_url: str = "sqlite:///./dev.db"
+    # Optional read-only replica for GET requests (see db_adapter.py)
+    database_replica_url: Optional[str] = None
+    read_your_writes_seconds: float = 5.0
+    db_mode: str = "sync"  # sync | async
+    sqlite_profile: str = "default"  # default | performance
     echo_sql: bool = False
-    api_key: str = "dev-secret-key"
+    slow_query_ms: float = 200.0  # 0 disables the slow-query log
+    # Logging (see app/core/logging.py)
+    log_format: str = "json"  # json | text
+    log_queue_size: int = 10_000
+    log_success_sample_rate: float = 1.0  # share of 2xx/3xx request logs
+    cache_max_entries: int = 10_000  # 0 disables the entity cache
+    cache_ttl_seconds: float = 30.0
+    fast_json: bool = False  # see app/api/serialization.py
+    # Background jobs (see app/core/jobs.py)
+    job_workers: int = 2
+    job_queue_capacity: int = 1000
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 0.5
+    job_drain_timeout_seconds: float = 30.0
+    api_key: str = "dev-secret-key"  # only used while `api_keys` is empty
+    # Named client keys, e.g. API_KEYS='{"billing": {"sha256": "<hex>"}}'
+    api_keys: dict[str, ApiKeyConfig] = {}
+    # Per key, or per client address for reads without a key; 0 disables
+    rate_limit_per_second: float = 0.0
+    rate_limit_burst: int = 20
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -1,27 +1,121 @@
-from typing import Generator
-from sqlalchemy.orm import Session
+import time
+from typing import AsyncGenerator, Generator, Optional
 
+from fastapi import Request, Response
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from accounting_api.app.core.cache import require_fresh_reads
 from accounting_api.app.core.config import settings
 from accounting_api.app.core.db_infrastructure import (
+    RoutingSession,
+    make_async_engine,
+    make_async_session_factory,
     make_engine,
     make_session_factory,
 )
 
-engine = make_engine(
-    settings.database_url,
-    echo=settings.echo_sql,
-)
+# Engines are built on first use (`get_engine`, `get_session_factory`),
+# not at import, so importing the app stays cheap for new workers.
+engine: Optional[Engine] = None
+replica_engine: Optional[Engine] = None
+SessionLocal: Optional[sessionmaker[Session]] = None
+
+# Read-your-writes: every write response carries the time (unix seconds)
+# until which the client's reads should go to the primary. Clients echo
+# it back; reads sent before then skip the replica and the entity cache.
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# The async engine is only built when the async path is first used, so the
+# sync deployment never needs the async driver installed.
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def _make_engine(url: str, pool_name: str) -> Engine:
+    return make_engine(
+        url,
+        echo=settings.echo_sql,
+        sqlite_profile=settings.sqlite_profile,
+        slow_query_ms=settings.slow_query_ms,
+        pool_name=pool_name,
+    )
+
+
+def get_engine() -> Engine:
+    global engine
+    if engine is None:
+        engine = _make_engine(settings.database_url, "primary")
+    return engine
+
+
+def get_session_factory() -> sessionmaker[Session]:
+    global replica_engine, SessionLocal
+    if SessionLocal is None:
+        if settings.database_replica_url:
+            replica_engine = _make_engine(
+                settings.database_replica_url, "replica"
+            )
+        SessionLocal = make_session_factory(
+            get_engine(), replica=replica_engine
+        )
+    return SessionLocal
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = make_async_engine(
+            settings.database_url,
+            echo=settings.echo_sql,
+            sqlite_profile=settings.sqlite_profile,
+            slow_query_ms=settings.slow_query_ms,
+        )
+        AsyncSessionLocal = make_async_session_factory(async_engine)
+    return AsyncSessionLocal
+
 
-SessionLocal = make_session_factory(engine)
+def _primary_until(request: Request) -> float:
+    try:
+        return float(request.headers.get(PRIMARY_UNTIL_HEADER, 0))
+    except ValueError:
+        return 0.0
 
 
-def get_db() -> Generator[Session, None, None]:
+def route_session(db: Session, request: Request, response: Response) -> None:
+    """
+    Point a `RoutingSession` at the replica for reads, unless the client
+    is inside its read-your-writes window; stamp that window on writes.
+    Other sessions (no replica configured) always use the primary.
+    """
+    if not isinstance(db, RoutingSession) or db.replica is None:
+        return
+    if request.method not in READ_METHODS:
+        deadline = time.time() + settings.read_your_writes_seconds
+        response.headers[PRIMARY_UNTIL_HEADER] = f"{deadline:.3f}"
+    elif _primary_until(request) > time.time():
+        require_fresh_reads(db)
+    else:
+        db.use_replica = True
+
+
+def get_db(
+        request: Request,
+        response: Response
+        ) -> Generator[Session, None, None]:
     """
     FastAPI database dependency defining the transactional boundary
     of the web application.
     We intentionally do NOT use `session_scope(SessionLocal)` here.
     """
-    db: Session = SessionLocal()
+    db: Session = get_session_factory()()
+    route_session(db, request, response)
     try:
         yield db
         db.commit()
@@ -30,3 +124,19 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of `get_db` with the same unit-of-work semantics,
+    used by the handlers in `api/routes/*_async.py`.
+    """
+    db: AsyncSession = get_async_session_factory()()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
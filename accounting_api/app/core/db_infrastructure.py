@@ -1,12 +1,80 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from sqlalchemy import create_engine, event
+from sqlalchemy import Select, create_engine, event, make_url
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Any
+from typing import Any, Callable, Optional
 from sqlalchemy.engine.interfaces import DBAPIConnection
 
+from accounting_api.app.core.instrumentation import (
+    install_query_instrumentation,
+)
+from accounting_api.app.core.metrics import instrument_pool, timed_pool_class
+
+# Async driver used for each backend when a sync URL is given
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+# Named sets of PRAGMAs applied to every new SQLite connection.
+#   - default: SQLite's own settings (rollback journal, fsync on commit)
+#   - performance: WAL so readers and the writer no longer block each other,
+#     fsync only at checkpoints (durable against crashes, not power loss),
+#     a larger page cache and memory-mapped reads, in-memory temp tables,
+#     and waiting on a locked database instead of failing immediately
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,  # negative = KiB, i.e. 64 MB
+        "mmap_size": 268_435_456,  # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5_000,  # ms
+    },
+}
+
+
+def _configure_sqlite(engine: Engine, profile: str = "default") -> None:
+    """
+    Enable foreign keys and apply the PRAGMAs of `profile` on connect.
+    Engines for other backends are left untouched.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}")
+    pragmas = SQLITE_PROFILES[profile]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn: DBAPIConnection, _):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _timed_poolclass(
+    url: str,
+    poolclass: type[Any] | None,
+    pool_name: str,
+) -> type[Any]:
+    # Resolve the pool the dialect would pick, so it can be wrapped too
+    if poolclass is None:
+        parsed = make_url(url)
+        poolclass = parsed.get_dialect().get_pool_class(parsed)
+    return timed_pool_class(poolclass, pool_name)
+
 
 def make_engine(
     url: str,
@@ -14,7 +82,14 @@ def make_engine(
     echo: bool = False,
     connect_args: dict[str, Any] | None = None,
     poolclass: type[Any] | None = None,
+    sqlite_profile: str = "default",
+    slow_query_ms: float = 0.0,
+    pool_name: str = "primary",
 ) -> Engine:
+    """
+    Engine for `url`, instrumented for the query and pool metrics;
+    `pool_name` labels its pool metrics.
+    """
     if connect_args is None:
         connect_args = {}
 
@@ -23,15 +98,15 @@ def make_engine(
         echo=echo,
         future=True,
         connect_args=connect_args,
-        poolclass=poolclass,
+        poolclass=_timed_poolclass(url, poolclass, pool_name),
     )
 
-    # Enable foreign keys for SQLite
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragma(dbapi_conn: DBAPIConnection, _):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    # Enable foreign keys (and the selected profile) for SQLite
+    _configure_sqlite(engine, sqlite_profile)
+
+    # Per-request statement count and time, slow-query log, pool metrics
+    install_query_instrumentation(engine, slow_query_ms)
+    instrument_pool(engine, pool_name)
 
     # # Add live SQL logger
     # @event.listens_for(engine, "before_cursor_execute")
@@ -52,13 +127,118 @@ def make_engine(
     return engine
 
 
-def make_session_factory(engine: Engine) -> sessionmaker[Session]:
-    """Return a configured session factory."""
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a read replica while `use_replica`
+    is set, and everything else (flushes, bulk UPDATE/DELETE/INSERT) to
+    the primary it is bound to.
+
+    The first write turns `use_replica` off, so the rest of the unit of
+    work reads what it wrote.
+    """
+
+    def __init__(
+            self,
+            *args: Any,
+            replica: Optional[Engine] = None,
+            **kwargs: Any
+            ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.use_replica = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any):
+        if self.use_replica and self.replica is not None:
+            if not self._flushing and isinstance(clause, Select):
+                return self.replica
+            self.use_replica = False
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def make_session_factory(
+        engine: Engine,
+        replica: Optional[Engine] = None
+        ) -> sessionmaker[Session]:
+    """
+    Return a configured session factory. With a `replica`, sessions are
+    `RoutingSession`s that can read from it.
+    """
+    if replica is None:
+        return sessionmaker(
+                   bind=engine,
+                   autoflush=False,
+                   autocommit=False,
+                   future=True
+        )
     return sessionmaker(
                bind=engine,
+               class_=RoutingSession,
                autoflush=False,
                autocommit=False,
-               future=True
+               future=True,
+               replica=replica,
+    )
+
+
+def to_async_url(url: str) -> str:
+    """
+    Rewrite a database URL to use the backend's asyncio driver, e.g.
+    `sqlite:///./dev.db` -> `sqlite+aiosqlite:///./dev.db` and
+    `postgresql://...` -> `postgresql+asyncpg://...`.
+    URLs that already name a driver for an unknown backend are kept.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or parsed.get_driver_name() == driver:
+        return url
+    # Only the scheme changes; the rest of the URL is kept verbatim
+    return f"{backend}+{driver}{url[url.index('://'):]}"
+
+
+def make_async_engine(
+    url: str,
+    *,
+    echo: bool = False,
+    connect_args: dict[str, Any] | None = None,
+    poolclass: type[Any] | None = None,
+    sqlite_profile: str = "default",
+    slow_query_ms: float = 0.0,
+    pool_name: str = "async",
+) -> AsyncEngine:
+    """Async counterpart of `make_engine`; accepts sync or async URLs."""
+    if connect_args is None:
+        connect_args = {}
+
+    async_url = to_async_url(url)
+    engine = create_async_engine(
+        async_url,
+        echo=echo,
+        connect_args=connect_args,
+        poolclass=_timed_poolclass(async_url, poolclass, pool_name),
+    )
+
+    # Connection events are registered on the wrapped sync engine
+    _configure_sqlite(engine.sync_engine, sqlite_profile)
+    install_query_instrumentation(engine.sync_engine, slow_query_ms)
+    instrument_pool(engine.sync_engine, pool_name)
+
+    return engine
+
+
+def make_async_session_factory(
+        engine: AsyncEngine
+        ) -> async_sessionmaker[AsyncSession]:
+    """
+    Return a configured async session factory.
+
+    `expire_on_commit` is disabled because expired attributes would need
+    an implicit (and in asyncio, impossible) lazy load to be read again.
+    """
+    return async_sessionmaker(
+               bind=engine,
+               autoflush=False,
+               expire_on_commit=False,
     )
 
 
@@ -77,3 +257,30 @@ def session_scope(SessionFactory: sessionmaker[Session]):
         raise
     finally:
         session.close()
+
+
+# Session.info key holding the callbacks to run once the session commits
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def call_after_commit(
+        db: Session | AsyncSession,
+        callback: Callable[[], None]
+        ) -> None:
+    """
+    Run `callback` once `db` commits, for work that must only start from
+    committed data (e.g. queueing a background job). It is dropped if the
+    session rolls back, and must not raise: the commit already happened.
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
@@ -0,0 +1,154 @@
+"""
+Per-request timing collected from inside the application.
+
+The request middleware binds a `RequestStats` to the current context;
+engine events add database time to it, and `TimedRoute` records when the
+endpoint returned so serialization time can be separated out. Code running
+outside a request (scripts, tests without the middleware) sees no stats
+and pays only a context variable lookup.
+
+Statements slower than a threshold are logged with their query plan,
+inside or outside a request.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+slow_log = logging.getLogger("app.sql")
+
+
+@dataclass
+class RequestStats:
+    request_id: Optional[str] = None
+    db_statements: int = 0
+    db_ms: float = 0.0
+    serialize_ms: float = 0.0
+    # perf_counter() when the endpoint function returned
+    endpoint_done: Optional[float] = None
+
+    def server_timing(self, total_ms: float) -> str:
+        """Value of the `Server-Timing` response header."""
+        return (
+            f"total;dur={total_ms:.2f}, "
+            f"db;dur={self.db_ms:.2f}, "
+            f"serialize;dur={self.serialize_ms:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def bind_request_stats(stats: RequestStats) -> Token:
+    return _current_stats.set(stats)
+
+
+def reset_request_stats(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def mark_endpoint_done() -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+
+def mark_response_serialized() -> None:
+    stats = _current_stats.get()
+    if stats is not None and stats.endpoint_done is not None:
+        elapsed = time.perf_counter() - stats.endpoint_done
+        stats.serialize_ms += elapsed * 1000
+        stats.endpoint_done = None
+
+
+def _before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool
+        ) -> None:
+    # A connection runs one statement at a time, so one slot is enough
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _query_plan(conn: Connection, statement: str, parameters: Any) -> str:
+    """SQLite `EXPLAIN QUERY PLAN` of `statement`, one step per `;`."""
+    if conn.dialect.name != "sqlite":
+        return "n/a"
+    # A raw DBAPI cursor, so the EXPLAIN itself is not instrumented
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "; ".join(str(row[-1]) for row in cursor.fetchall())
+    except Exception as exc:  # never fail the query being diagnosed
+        return f"unavailable ({exc})"
+    finally:
+        cursor.close()
+
+
+def _log_slow_query(
+        conn: Connection,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration_ms: float,
+        stats: Optional[RequestStats]
+        ) -> None:
+    plan = "n/a" if executemany else _query_plan(conn, statement, parameters)
+    slow_log.warning(
+        "slow query (%.1f ms): %s | plan: %s",
+        duration_ms,
+        " ".join(statement.split()),
+        plan,
+        extra={
+            "request_id": stats.request_id if stats else None,
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "query_plan": plan,
+        },
+    )
+
+
+def install_query_instrumentation(
+        engine: Engine,
+        slow_query_ms: float = 0.0
+        ) -> None:
+    """
+    Attribute statement count and time on `engine` to the current request,
+    and log statements taking `slow_query_ms` or longer (0 disables) with
+    their query plan.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+            conn: Connection,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            executemany: bool
+            ) -> None:
+        duration_ms = (time.perf_counter() - conn.info["query_start"]) * 1000
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.db_statements += 1
+            stats.db_ms += duration_ms
+        if slow_query_ms and duration_ms >= slow_query_ms:
+            _log_slow_query(
+                conn, statement, parameters, executemany, duration_ms, stats
+            )
@@ -0,0 +1,305 @@
+"""
+In-process background jobs.
+
+Work that does not have to finish inside the request (follow-ups of an
+invoice being issued, for instance) is submitted to a `JobQueue`: a FIFO
+(`data_structure.queue.Queue`) drained by a pool of asyncio workers.
+Synchronous handlers run in a thread, so they may use a sync database
+session.
+
+- Capacity is bounded: `submit` raises `QueueFullError` instead of
+  letting the backlog grow, and the API answers 429.
+- A failing job is retried with exponential backoff, up to
+  `max_attempts` in total. Handlers raise `PermanentJobError` for failures
+  a retry cannot fix.
+- `drain` stops accepting jobs and waits for queued, running and
+  retrying jobs, so a graceful shutdown loses nothing that was accepted.
+  Jobs still unfinished at its timeout are marked `cancelled`.
+- Finished jobs are kept for status lookups, the most recent
+  `max_finished` of them.
+
+Jobs live in the process: they are lost on a crash, and each worker
+process has its own queue.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from data_structure.queue import Queue
+
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.metrics import REGISTRY, Counter, Gauge
+
+logger = logging.getLogger("app.jobs")
+
+JOBS = REGISTRY.register(Counter(
+    "jobs_total",
+    "Finished background jobs by name and status (succeeded, failed, "
+    "cancelled).",
+    ("name", "status"),
+))
+JOBS_QUEUED = REGISTRY.register(Gauge(
+    "jobs_queued",
+    "Background jobs waiting for a worker.",
+))
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class QueueClosedError(Exception):
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure that retrying cannot fix."""
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    retrying = "retrying"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class Job:
+    name: str
+    handler: Callable[..., Any] = field(repr=False)
+    args: tuple[Any, ...] = ()
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.queued
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+    finished_at: Optional[datetime] = None
+
+
+class JobQueue:
+    def __init__(
+            self,
+            capacity: int = 1000,
+            workers: int = 2,
+            max_attempts: int = 3,
+            retry_backoff_seconds: float = 0.5,
+            max_finished: int = 10_000
+            ) -> None:
+        self.capacity = capacity
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_finished = max_finished
+        self._queue: Queue[Job] = Queue()
+        self._jobs: dict[str, Job] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._tasks: list[asyncio.Task] = []
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unfinished = 0
+        self._closed = True
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Semaphore(0)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{n}")
+            for n in range(self.workers)
+        ]
+
+    def submit(
+            self,
+            name: str,
+            handler: Callable[..., Any],
+            *args: Any
+            ) -> Job:
+        """
+        Queue `handler(*args)`. Must be called from the event loop
+        thread (i.e. from an `async def` endpoint).
+        """
+        if self._closed or self._ready is None or self._idle is None:
+            raise QueueClosedError("The job queue is not accepting jobs.")
+        if len(self._queue) >= self.capacity:
+            raise QueueFullError(
+                f"The job queue is full ({self.capacity} jobs waiting)."
+            )
+        job = Job(name, handler, args)
+        self._jobs[job.id] = job
+        self._unfinished += 1
+        self._idle.clear()
+        self._enqueue(job)
+        return job
+
+    def submit_threadsafe(
+            self,
+            name: str,
+            handler: Callable[..., Any],
+            *args: Any
+            ) -> None:
+        """
+        `submit` from any thread, e.g. a sync endpoint or a commit hook.
+        The job is queued on the event loop shortly after; as the caller
+        is gone by then, a full or closed queue is logged, not raised.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.error("job %s not queued: the queue is not running", name)
+            return
+
+        def submit() -> None:
+            try:
+                self.submit(name, handler, *args)
+            except (QueueFullError, QueueClosedError) as exc:
+                logger.error("job %s not queued: %s", name, exc)
+
+        loop.call_soon_threadsafe(submit)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs, wait up to `timeout` seconds for the accepted
+        ones to finish, then stop the workers. Returns False if jobs were
+        still unfinished at the timeout; those are marked cancelled.
+        """
+        self._closed = True
+        drained = True
+        if self._idle is not None:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                drained = False
+                logger.warning(
+                    "job queue drain timed out with %d unfinished jobs",
+                    self._unfinished,
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if not drained:
+            self._cancel_unfinished()
+        return drained
+
+    def _cancel_unfinished(self) -> None:
+        # Without workers nothing would ever finish these jobs. A handler
+        # already running in a thread cannot be interrupted; its outcome
+        # is no longer recorded.
+        while not self._queue.is_empty():
+            self._queue.dequeue()
+            JOBS_QUEUED.dec()
+        for job in list(self._jobs.values()):
+            if job.finished_at is None:
+                job.error = job.error or "Cancelled at shutdown."
+                self._finish(job, JobStatus.cancelled)
+
+    def _enqueue(self, job: Job) -> None:
+        assert self._ready is not None
+        if job.status is JobStatus.cancelled:
+            return  # a retry scheduled before the queue was drained
+        self._queue.enqueue(job)
+        JOBS_QUEUED.inc()
+        self._ready.release()
+
+    async def _work(self) -> None:
+        assert self._ready is not None
+        while True:
+            await self._ready.acquire()
+            job = self._queue.dequeue()
+            JOBS_QUEUED.dec()
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.running
+        job.attempts += 1
+        try:
+            if inspect.iscoroutinefunction(job.handler):
+                job.result = await job.handler(*job.args)
+            else:
+                job.result = await asyncio.to_thread(job.handler, *job.args)
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            retry = (
+                not isinstance(exc, PermanentJobError)
+                and job.attempts < self.max_attempts
+            )
+            if retry:
+                delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+                job.status = JobStatus.retrying
+                logger.warning(
+                    "job %s (%s) attempt %d failed, retrying in %.2fs: %s",
+                    job.id, job.name, job.attempts, delay, job.error,
+                )
+                # Retries bypass the capacity check: the job was accepted
+                asyncio.get_running_loop().call_later(
+                    delay, self._enqueue, job
+                )
+                return
+            logger.error(
+                "job %s (%s) failed after %d attempts: %s",
+                job.id, job.name, job.attempts, job.error,
+            )
+            self._finish(job, JobStatus.failed)
+        else:
+            job.error = None
+            self._finish(job, JobStatus.succeeded)
+
+    def _finish(self, job: Job, status: JobStatus) -> None:
+        assert self._idle is not None
+        job.status = status
+        job.finished_at = _now()
+        JOBS.inc(job.name, status.value)
+        self._finished[job.id] = None
+        while len(self._finished) > self.max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+
+def _make_default_queue() -> JobQueue:
+    return JobQueue(
+        capacity=settings.job_queue_capacity,
+        workers=settings.job_workers,
+        max_attempts=settings.job_max_attempts,
+        retry_backoff_seconds=settings.job_retry_backoff_seconds,
+    )
+
+
+_job_queue: JobQueue = _make_default_queue()
+
+
+def get_job_queue() -> JobQueue:
+    return _job_queue
+
+
+def set_job_queue(queue: JobQueue) -> JobQueue:
+    """Install `queue` as the process-wide queue; returns the old one."""
+    global _job_queue
+    previous, _job_queue = _job_queue, queue
+    return previous
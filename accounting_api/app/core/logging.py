@@ -1,12 +1,195 @@
+"""
+Non-blocking structured logging.
+
+Application code logs as usual; a `QueueHandler` on the root logger only
+puts the record on a bounded in-memory queue, and a `QueueListener`
+thread formats and writes it. A request thread never waits on stdout.
+The app lifespan installs the handler and starts the listener together
+(`setup_logging`), and removes both on shutdown (`stop_logging`), so
+records are never queued without a thread to take them off.
+
+- Records are formatted as one JSON object per line, including the
+  `extra=` fields (`request_id`, `duration_ms`, ...). `log_format="text"`
+  keeps the plain format for local reading.
+- When the queue is full the record is dropped rather than blocking the
+  caller, and counted in `log_records_dropped_total{reason="queue_full"}`.
+- At high request rates, successful request logs (`status_code` below
+  400) can be sampled with `log_success_sample_rate`; errors and all
+  other records are always kept. Sampled-out records are counted with
+  `reason="sampled"`.
+"""
 from __future__ import annotations
 
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional, TextIO
+
+from accounting_api.app.core.metrics import REGISTRY, Counter
+
+LOG_RECORDS_DROPPED = REGISTRY.register(Counter(
+    "log_records_dropped_total",
+    "Log records not written, by reason (queue_full, sampled).",
+    ("reason",),
+))
+
+TEXT_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the `extra=` fields at top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SuccessSampler(logging.Filter):
+    """Keep a `rate` fraction of records with a `status_code` below 400."""
+
+    def __init__(
+            self,
+            rate: float,
+            rng: Callable[[], float] = random.random
+            ) -> None:
+        super().__init__()
+        self.rate = rate
+        self.rng = rng
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        status_code = getattr(record, "status_code", None)
+        if status_code is None or status_code >= 400 or self.rate >= 1:
+            return True
+        if self.rng() < self.rate:
+            return True
+        LOG_RECORDS_DROPPED.inc("sampled")
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """A `QueueHandler` that drops, and counts, records on a full queue."""
 
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc("queue_full")
 
-def setup_logging(level: str) -> None:
-    logging.basicConfig(
-        level=level,
-        stream=sys.stdout,
-        format="%(levelname)s:%(name)s:%(message)s",
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now, while the arguments are
+        # current, but leave JSON formatting to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+
+class _Listener(QueueListener):
+    """A `QueueListener` whose `start()` and `stop()` are idempotent."""
+
+    def start(self) -> None:
+        if self._thread is None:
+            super().start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail on a full queue: the thread is draining it
+        self.queue.put(self._sentinel)
+
+
+def make_queue_logging(
+        handler: logging.Handler,
+        queue_size: int = 10_000,
+        success_sample_rate: float = 1.0
+        ) -> tuple[DroppingQueueHandler, QueueListener]:
+    """
+    A queue handler to attach to loggers, and the (not yet started)
+    listener that passes its records on to `handler`.
+    """
+    records: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+    queue_handler = DroppingQueueHandler(records)
+    if success_sample_rate < 1:
+        queue_handler.addFilter(SuccessSampler(success_sample_rate))
+    listener = _Listener(records, handler, respect_handler_level=True)
+    return queue_handler, listener
+
+
+# The queue handler on the root logger and its running listener
+_installed: Optional[tuple[logging.Handler, QueueListener]] = None
+
+
+def setup_logging(
+        level: str,
+        *,
+        log_format: str = "json",
+        queue_size: int = 10_000,
+        success_sample_rate: float = 1.0,
+        stream: Optional[TextIO] = None
+        ) -> QueueListener:
+    """
+    Route the root logger through a bounded queue to `stream` (stdout)
+    and start the listener. Replaces (and stops) a previous setup.
+    """
+    if log_format not in ("json", "text"):
+        raise ValueError(f"Unknown log format {log_format!r}")
+    global _installed
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if log_format == "json"
+        else logging.Formatter(TEXT_FORMAT)
     )
+    queue_handler, listener = make_queue_logging(
+        output, queue_size, success_sample_rate
+    )
+    stop_logging()
+    listener.start()
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    _installed = queue_handler, listener
+    return listener
+
+
+def stop_logging() -> None:
+    """
+    Remove the handler installed by `setup_logging` and stop its
+    listener once the queued records are written. Safe to call again.
+    """
+    global _installed
+    if _installed is None:
+        return
+    queue_handler, listener = _installed
+    _installed = None
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
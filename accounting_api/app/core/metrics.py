@@ -0,0 +1,287 @@
+"""
+In-process metrics exposed in the Prometheus text format at `/metrics`.
+
+Deliberately small: counters, gauges and fixed-bucket histograms keyed by
+label values, guarded by one lock each so updates from the threadpool stay
+consistent. Updating a metric is a dict lookup and an addition; all text
+formatting happens at scrape time.
+
+Metrics are process-wide. Pool metrics carry a `pool` label naming the
+engine (`primary`, `replica`, `async`). Engines created under the same
+name (benchmarks, tests) share its series: their counts add up, and
+`db_pool_overflow` shows whichever of them changed last.
+"""
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; the Prometheus client defaults
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = ()
+            ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._render_samples()
+
+    def _render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = ()
+            ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = (
+                self._values.get(labelvalues, 0.0) + amount
+            )
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    """Observation counts in fixed, cumulative `le` buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS
+            ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count], sum
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labelvalues] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total[0]))
+                for labels, (counts, total) in self._series.items()
+            )
+        names = self.labelnames + ("le",)
+        for labelvalues, (counts, total) in items:
+            cumulative = 0
+            bounds = self.buckets + (float("inf"),)
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(
+                    names, labelvalues + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+))
+HTTP_REQUEST_DB_STATEMENTS = REGISTRY.register(Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=STATEMENT_BUCKETS,
+))
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool.",
+    ("pool",),
+))
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ("pool",),
+))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while below it).",
+    ("pool",),
+))
+DB_POOL_CHECKOUT_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a connection, including waits for a free one.",
+    ("pool",),
+))
+
+
+def record_request(
+        method: str,
+        route: str,
+        status_code: int,
+        duration_s: float,
+        db_statements: int
+        ) -> None:
+    HTTP_REQUESTS.inc(method, route, str(status_code))
+    HTTP_REQUEST_DURATION.observe(duration_s, method, route)
+    HTTP_REQUEST_DB_STATEMENTS.observe(db_statements, method, route)
+
+
+@functools.cache
+def timed_pool_class(
+        pool_class: type[Pool],
+        pool_name: str = "primary"
+        ) -> type[Pool]:
+    """
+    Subclass of `pool_class` that records checkout wait time under
+    `pool_name`. The name is a class attribute, so it survives the pool
+    being recreated by `engine.dispose()`.
+    """
+
+    class TimedPool(pool_class):  # type: ignore[valid-type, misc]
+        metrics_pool = pool_name
+
+        def connect(self) -> Any:
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                DB_POOL_CHECKOUT_WAIT.observe(
+                    time.perf_counter() - start, self.metrics_pool
+                )
+
+    TimedPool.__name__ = TimedPool.__qualname__ = (
+        f"Timed{pool_class.__name__}"
+    )
+    return TimedPool
+
+
+def _record_overflow(pool: Pool, pool_name: str) -> None:
+    overflow = getattr(pool, "overflow", None)
+    if overflow is not None:
+        DB_POOL_OVERFLOW.set(overflow(), pool_name)
+
+
+def instrument_pool(engine: Engine, pool_name: str = "primary") -> None:
+    """Count checkouts and track pool occupancy for `engine`."""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(*_: Any) -> None:
+        DB_POOL_CHECKOUTS.inc(pool_name)
+        DB_POOL_CHECKED_OUT.inc(pool_name)
+        _record_overflow(engine.pool, pool_name)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(*_: Any) -> None:
+        DB_POOL_CHECKED_OUT.dec(pool_name)
+        _record_overflow(engine.pool, pool_name)
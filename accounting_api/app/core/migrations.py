@@ -0,0 +1,234 @@
+"""
+Additive schema migration for existing databases.
+
+`create_all` only creates missing tables: columns and indexes added to
+the models later never reach a database created by an older version.
+`upgrade_schema` brings such a database up to the models, additively:
+
+- creates missing tables (with their indexes)
+- adds missing columns that are nullable or have a server default
+- creates missing indexes
+- backfills the stored invoice aggregates if their columns were added
+
+Apart from the money conversion and the id rebuild below it never drops
+or alters anything.
+
+Reflecting every table is not free, so startup calls `ensure_schema`
+instead: it reads the version recorded in `schema_version` (one
+primary-key lookup) and only migrates when it is older than
+`SCHEMA_VERSION`. Bump `SCHEMA_VERSION` with every change to the models;
+`tests/test_migrations.py` fails until you do.
+
+Version 2 stores money as integer cents. Existing `line_item.unit_price`
+decimals are converted to `unit_price_cents`, and the float
+`invoice.total_amount` is dropped: the new `total_cents` is rebuilt from
+the line items instead of inheriting its rounding drift.
+
+Version 3 declares the entity ids AUTOINCREMENT, so the id of a deleted
+row is never handed out again. SQLite cannot alter a primary key, so
+each table still without it is rebuilt: created under a temporary name,
+copied, and swapped in for the old one (indexes are recreated by
+`_create_missing_indexes`). Foreign keys are switched off meanwhile,
+otherwise dropping the old `customer` table would cascade to every
+invoice; they are checked before the transaction commits.
+"""
+from __future__ import annotations
+
+import logging
+
+from typing import Optional
+
+from sqlalchemy import (
+    MetaData,
+    delete,
+    insert,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from accounting_api.app.models.sqlalchemy_models import (
+    Base,
+    Invoice,
+    SchemaVersion,
+)
+
+logger = logging.getLogger("app.migrations")
+
+SCHEMA_VERSION = 3
+
+# Columns derived from line items, backfilled when they are added
+_INVOICE_AGGREGATES = {"invoice.total_cents", "invoice.line_item_count"}
+
+
+def _convert_money_to_cents(conn: Connection) -> list[str]:
+    """Replace the version 1 decimal money columns (see module docs)."""
+    inspector = inspect(conn)
+    changes = []
+    line_item = {c["name"] for c in inspector.get_columns("line_item")}
+    if "unit_price" in line_item:
+        if "unit_price_cents" not in line_item:
+            conn.exec_driver_sql(
+                "ALTER TABLE line_item "
+                "ADD COLUMN unit_price_cents INTEGER NOT NULL DEFAULT 0"
+            )
+        conn.exec_driver_sql(
+            "UPDATE line_item "
+            "SET unit_price_cents = CAST(ROUND(unit_price * 100) AS INTEGER)"
+        )
+        conn.exec_driver_sql("ALTER TABLE line_item DROP COLUMN unit_price")
+        changes.append("line_item.unit_price -> unit_price_cents")
+    invoice = {c["name"] for c in inspector.get_columns("invoice")}
+    if "total_amount" in invoice:
+        conn.exec_driver_sql("ALTER TABLE invoice DROP COLUMN total_amount")
+        changes.append("drop invoice.total_amount")
+    return changes
+
+
+def _add_missing_columns(conn: Connection) -> list[str]:
+    inspector = inspect(conn)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} "
+                    f"without a server default"
+                )
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def _rebuild_for_autoincrement(conn: Connection) -> list[str]:
+    """Rebuild the tables missing AUTOINCREMENT (see module docs)."""
+    if conn.dialect.name != "sqlite":
+        return []
+    # Copies of the tables, so foreign keys of a renamed one still resolve
+    copies = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(copies)
+    rebuilt = []
+    for table in Base.metadata.sorted_tables:
+        if not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        ddl = conn.scalar(
+            text("SELECT sql FROM sqlite_master "
+                 "WHERE type = 'table' AND name = :name"),
+            {"name": table.name},
+        )
+        if "AUTOINCREMENT" in ddl.upper():
+            continue
+        new_name = f"_{table.name}_rebuild"
+        conn.execute(CreateTable(table.to_metadata(copies, name=new_name)))
+        columns = ", ".join(
+            c["name"] for c in inspect(conn).get_columns(table.name)
+        )
+        conn.exec_driver_sql(
+            f"INSERT INTO {new_name} ({columns}) "
+            f"SELECT {columns} FROM {table.name}"
+        )
+        conn.exec_driver_sql(f"DROP TABLE {table.name}")
+        conn.exec_driver_sql(
+            f"ALTER TABLE {new_name} RENAME TO {table.name}"
+        )
+        rebuilt.append(f"{table.name}.id -> AUTOINCREMENT")
+    if rebuilt and conn.exec_driver_sql("PRAGMA foreign_key_check").first():
+        raise RuntimeError("Foreign key violations after the id rebuild")
+    return rebuilt
+
+
+def _create_missing_indexes(conn: Connection) -> list[str]:
+    inspector = inspect(conn)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: str(i.name)):
+            if index.name not in existing:
+                index.create(bind=conn)
+                created.append(str(index.name))
+    return created
+
+
+def _upgrade(conn: Connection) -> list[str]:
+    Base.metadata.create_all(bind=conn)
+
+    converted = _convert_money_to_cents(conn)
+    columns = _add_missing_columns(conn)
+    rebuilt = _rebuild_for_autoincrement(conn)
+    changes = (
+        converted + columns + rebuilt + _create_missing_indexes(conn)
+    )
+
+    if _INVOICE_AGGREGATES & set(columns):
+        conn.execute(update(Invoice).values(
+            total_cents=Invoice.computed_total_cents,
+            line_item_count=Invoice.computed_line_item_count,
+        ))
+        changes.append("backfill invoice aggregates")
+
+    conn.execute(delete(SchemaVersion))
+    conn.execute(insert(SchemaVersion).values(id=1, version=SCHEMA_VERSION))
+    return changes
+
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    """
+    Apply the additive migration in one transaction. Returns the columns
+    and indexes that were added (empty when the schema is current).
+    """
+    with engine.connect() as conn:
+        # Only takes effect outside a transaction
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            conn.commit()
+        try:
+            with conn.begin():
+                changes = _upgrade(conn)
+        finally:
+            if conn.dialect.name == "sqlite":
+                conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+                conn.commit()
+
+    for change in changes:
+        logger.info("schema migration: %s", change)
+    return changes
+
+
+def schema_version(engine: Engine) -> Optional[int]:
+    """
+    The recorded schema version, or None for a database that has never
+    been migrated (no `schema_version` table or row).
+    """
+    with engine.connect() as conn:
+        try:
+            return conn.scalar(
+                select(SchemaVersion.version).where(SchemaVersion.id == 1)
+            )
+        except DBAPIError:
+            return None
+
+
+def ensure_schema(engine: Engine) -> list[str]:
+    """
+    Migrate the database only if its recorded version is behind
+    `SCHEMA_VERSION`: one query on an up-to-date database. Returns the
+    changes made.
+    """
+    version = schema_version(engine)
+    if version is not None and version >= SCHEMA_VERSION:
+        if version > SCHEMA_VERSION:
+            logger.warning(
+                "database schema version %d is newer than this code (%d)",
+                version, SCHEMA_VERSION,
+            )
+        return []
+    return upgrade_schema(engine)
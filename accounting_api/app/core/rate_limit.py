@@ -0,0 +1,89 @@
+"""
+In-memory token-bucket rate limiting, one bucket per client key.
+
+A bucket holds up to `burst` tokens and refills at `rate` tokens per
+second; each request takes one. Refill is computed lazily from the time
+elapsed since the bucket was last touched, so a check is O(1) and no
+background task is needed.
+
+Buckets live in the process: with several workers, each enforces the
+limit on its own share of the traffic. Anonymous callers get a bucket per
+client address, so the number of buckets is capped: past `max_buckets`
+the least recently used bucket is evicted, in O(1). A client evicted that
+way starts again with a full bucket.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+class TokenBucket:
+    def __init__(
+            self,
+            rate: float,
+            burst: int,
+            clock: Callable[[], float] = time.monotonic
+            ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("Need rate > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token. Returns 0 when one was available, else the number
+        of seconds until one will be.
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Lazily created token buckets keyed by client (e.g. API key name)."""
+
+    def __init__(
+            self,
+            clock: Callable[[], float] = time.monotonic,
+            max_buckets: int = 100_000
+            ) -> None:
+        self.clock = clock
+        self.max_buckets = max_buckets
+        # Least recently used first
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        """`TokenBucket.acquire` on the bucket of `key`."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(
+                    rate, burst, self.clock
+                )
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+        return bucket.acquire()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
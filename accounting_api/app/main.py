@@ -1,18 +1,29 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from accounting_api.app.core.db_adapter import engine
-from accounting_api.app.models.sqlalchemy_models import Base
+from fastapi.responses import PlainTextResponse
+from accounting_api.app.core.db_adapter import get_engine
+from accounting_api.app.core.migrations import ensure_schema
 from accounting_api.app.api.errors import (
     invalid_operation_handler,
     not_found_handler,
+    queue_closed_handler,
+    queue_full_handler,
     unhandled_exception_handler
 )
 from accounting_api.app.api.middleware.request_context import (
     RequestContextMiddleware
 )
-from accounting_api.app.api.routes import customers, invoices
+from accounting_api.app.api.routes import customers, invoices, jobs, reports
+from accounting_api.app.api.routing import TimedRoute
+from accounting_api.app.api.serialization import default_response_class
 from accounting_api.app.core.config import settings
-from accounting_api.app.core.logging import setup_logging
+from accounting_api.app.core.jobs import (
+    QueueClosedError,
+    QueueFullError,
+    get_job_queue,
+)
+from accounting_api.app.core.logging import setup_logging, stop_logging
+from accounting_api.app.core.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
 from accounting_api.app.services.errors import (
     InvalidOperationError,
     NotFoundError
@@ -21,21 +32,38 @@ from accounting_api.app.services.errors import (
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Ensure database tables are created at startup
-    Base.metadata.create_all(bind=engine)
+    setup_logging(
+        "DEBUG" if settings.debug else "INFO",
+        log_format=settings.log_format,
+        queue_size=settings.log_queue_size,
+        success_sample_rate=settings.log_success_sample_rate,
+    )
+    # A version lookup; migrates only a new or outdated database
+    ensure_schema(get_engine())
+    queue = get_job_queue()
+    await queue.start()
     yield
+    # Finish the jobs already accepted before the process exits
+    await queue.drain(settings.job_drain_timeout_seconds)
+    # Writes out the records still queued
+    stop_logging()
 
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
+)
+app.router.route_class = TimedRoute
 
 
 # middleware
 app.add_middleware(RequestContextMiddleware)
 
-setup_logging("DEBUG" if settings.debug else "INFO")
-
 app.add_exception_handler(NotFoundError, not_found_handler)
 app.add_exception_handler(InvalidOperationError, invalid_operation_handler)
+app.add_exception_handler(QueueFullError, queue_full_handler)
+app.add_exception_handler(QueueClosedError, queue_closed_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
 
@@ -46,6 +74,7 @@ def root():
         "status": "ok",
         "docs": "/docs",
         "health": "/healthz",
+        "metrics": "/metrics",
     }
 
 
@@ -54,5 +83,23 @@ def healthz():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+# In async mode the AsyncSession-backed routers are registered first so
+# their handlers win; paths they do not define fall through to the sync
+# routers below.
+if settings.db_mode == "async":
+    from accounting_api.app.api.routes import customers_async, invoices_async
+
+    app.include_router(customers_async.router)
+    app.include_router(invoices_async.router)
+
 app.include_router(customers.router)
 app.include_router(invoices.router)
+app.include_router(reports.router)
+app.include_router(jobs.router)
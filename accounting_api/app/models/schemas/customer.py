@@ -1,6 +1,6 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -19,5 +19,20 @@ class CustomerCreate(CustomerBase):
 class CustomerRead(CustomerBase):
     id: int
     created_at: datetime
+    version: int = 1
 
-    model_config = ConfigDict(from_attributes=True)
+    # Frozen: instances are shared between requests by the entity cache
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+# ---------- Import Schemas ---------- #
+class CustomerImportError(BaseModel):
+    line: int
+    error: str
+
+
+class CustomerImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    # Only the first errors are kept so huge bad files stay cheap to report
+    errors: List[CustomerImportError] = []
@@ -1,44 +1,176 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Annotated, List, Optional
+from decimal import Decimal
+from typing import Annotated, Any, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    computed_field,
+    model_validator,
+)
 
-from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.models.sqlalchemy_models import (
+    DEFAULT_CURRENCY,
+    InvoiceStatus,
+)
+
+# Amounts are decimals with at most two places in the API and integer
+# cents in the database; these schemas convert between the two. Read
+# amounts are exact `Decimal`s in Python, and stay JSON numbers (0.3, not
+# "0.30") in responses, as they always were.
+Amount = Annotated[Decimal, Field(gt=0, max_digits=12, decimal_places=2)]
+Money = Annotated[
+    Decimal, PlainSerializer(float, return_type=float, when_used="json")
+]
+Currency = Annotated[str, Field(pattern=r"^[A-Z]{3}$")]
+
+
+def to_cents(amount: Decimal) -> int:
+    """Exact for amounts with at most two decimal places."""
+    return int(amount.scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Exact, with two decimal places: 30 -> Decimal("0.30")."""
+    return Decimal(cents).scaleb(-2)
 
 
 # ---------- LineItem Schemas ---------- #
 class LineItemCreate(BaseModel):
     description: str
     quantity: Annotated[int, Field(gt=0)]
-    unit_price: Annotated[float, Field(gt=0)]
+    unit_price: Amount
+
+    def to_row(self) -> dict[str, Any]:
+        """Column values for the line item."""
+        return {
+            "description": self.description,
+            "quantity": self.quantity,
+            "unit_price_cents": to_cents(self.unit_price),
+        }
 
 
 class LineItemRead(BaseModel):
     id: int
     description: str
     quantity: int
-    unit_price: float
+    unit_price_cents: int
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @computed_field
+    @property
+    def unit_price(self) -> Money:
+        return from_cents(self.unit_price_cents)
+
+
+MAX_LINE_ITEM_BATCH = 1000
 
-    model_config = ConfigDict(from_attributes=True)
+
+class LineItemBatchRead(BaseModel):
+    invoice_id: int
+    items: List[LineItemRead]
+    total_cents: int
+    line_item_count: int
+
+    @computed_field
+    @property
+    def total_amount(self) -> Money:
+        return from_cents(self.total_cents)
 
 
 # ---------- Invoice Schemas ---------- #
 class InvoiceCreate(BaseModel):
     customer_id: int
+    currency: Currency = DEFAULT_CURRENCY
+
 
+class InvoiceSummaryRead(BaseModel):
+    """An invoice without its line items, built from the invoice row only."""
 
-class InvoiceRead(BaseModel):
     id: int
     customer_id: int
     status: InvoiceStatus
     issued_at: Optional[datetime] = None
+    version: int = 1
+    currency: str = DEFAULT_CURRENCY
+
+    # Aggregates stored on the invoice row
+    total_cents: int
+    line_item_count: int = 0
+
+    # Frozen: instances are shared between requests by the entity cache
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @computed_field
+    @property
+    def total_amount(self) -> Money:
+        return from_cents(self.total_cents)
+
+
+class InvoiceRead(InvoiceSummaryRead):
+    # Nested relationship from ORM; a tuple so cached reads stay immutable
+    line_items: tuple[LineItemRead, ...] = ()
+
 
-    # Derived field from ORM hybrid_property
-    total_amount: float
+# ---------- Bulk Transition Schemas ---------- #
+MAX_BULK_INVOICE_IDS = 50_000
 
-    # Nested relationship from ORM
-    line_items: List[LineItemRead] = []
 
-    model_config = ConfigDict(from_attributes=True)
+class InvoiceFilter(BaseModel):
+    """
+    All invoices matching every given field. At least one field is
+    required, so a bulk change never silently covers every invoice.
+    """
+
+    customer_id: Optional[int] = None
+    issued_before: Optional[datetime] = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def _not_empty(self) -> InvoiceFilter:
+        if self.customer_id is None and self.issued_before is None:
+            raise ValueError("Give at least one filter field.")
+        return self
+
+
+class DraftInvoiceFilter(BaseModel):
+    """Drafts have no `issued_at`, so they are selected by customer only."""
+
+    customer_id: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class InvoiceBulkTransition(BaseModel):
+    """Invoices to transition: explicit `ids` or a `filter`, not both."""
+
+    ids: Optional[List[int]] = Field(
+        default=None, min_length=1, max_length=MAX_BULK_INVOICE_IDS
+    )
+    filter: Optional[InvoiceFilter] = None
+
+    @model_validator(mode="after")
+    def _one_selection(self) -> InvoiceBulkTransition:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give either `ids` or `filter`.")
+        return self
+
+
+class InvoiceBulkIssue(InvoiceBulkTransition):
+    """`InvoiceBulkTransition` of drafts, which only filter by customer."""
+
+    filter: Optional[DraftInvoiceFilter] = None  # type: ignore[assignment]
+
+
+class BulkTransitionRead(BaseModel):
+    status: InvoiceStatus
+    transitioned: int
+    # Requested ids in another status than the transition starts from
+    rejected: int = 0
+    not_found: int = 0
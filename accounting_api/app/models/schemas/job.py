@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from accounting_api.app.core.jobs import JobStatus
+
+
+# ---------- Job Schemas ---------- #
+class JobRead(BaseModel):
+    id: str
+    name: str
+    status: JobStatus
+    attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+from pydantic import BaseModel
+
+from accounting_api.app.models.schemas.invoice import Money
+from accounting_api.app.models.sqlalchemy_models import (
+    DEFAULT_CURRENCY,
+    InvoiceStatus,
+)
+
+
+# ---------- Aging Report Schemas ---------- #
+class AgingBuckets(BaseModel):
+    """
+    Invoice totals by days since issue: <30, 30-59, 60-89 and 90+, all in
+    `currency`.
+    """
+
+    currency: str = DEFAULT_CURRENCY
+    invoice_count: int = 0
+    current: Money = Decimal("0.00")
+    days_30: Money = Decimal("0.00")
+    days_60: Money = Decimal("0.00")
+    days_90_plus: Money = Decimal("0.00")
+    total: Money = Decimal("0.00")
+
+
+class CustomerAgingRead(AgingBuckets):
+    customer_id: int
+    customer_name: str
+    status: InvoiceStatus
+
+
+class StatusAgingRead(AgingBuckets):
+    status: InvoiceStatus
+
+
+class AgingReportRead(BaseModel):
+    as_of: datetime
+    statuses: List[InvoiceStatus]
+    customers: List[CustomerAgingRead]
+    # Totals over all customers, one entry per requested status
+    overall: List[StatusAgingRead]
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Optional
 
 from sqlalchemy import (DateTime, Enum as SAEnum,
-                        ForeignKey, Integer, Numeric,
+                        ForeignKey, Index, Integer,
                         String, func, select)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -16,6 +16,21 @@ class Base(DeclarativeBase):
     pass
 
 
+# ---------- Schema version ---------- #
+class SchemaVersion(Base):
+    """Single row (id 1): the schema version the database was migrated to."""
+
+    __tablename__ = "schema_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# Money is stored as integer minor units (cents, 1/100 of the currency
+# unit), so sums are exact and computed with integer arithmetic
+DEFAULT_CURRENCY = "EUR"
+
+
 # ---------- Enums ---------- #
 class InvoiceStatus(str, Enum):
     draft = "draft"
@@ -23,18 +38,32 @@ class InvoiceStatus(str, Enum):
     paid = "paid"
 
 
+# Entity tables use AUTOINCREMENT: without it SQLite hands the id of a
+# deleted last row to the next insert, and a recreated row would match
+# the ETags (and caches) of the deleted one
+_NO_ID_REUSE = {"sqlite_autoincrement": True}
+
+
 # ---------- Entities ---------- #
 class Customer(Base):
     __tablename__ = "customer"
+    __table_args__ = _NO_ID_REUSE
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
-    email: Mapped[Optional[str]] = mapped_column(String(320))
+    email: Mapped[Optional[str]] = mapped_column(String(320), index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         server_default=func.now(),
         nullable=False
     )
+    # Bumped by the repositories on every change; used for ETags
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False
+    )
 
     invoices: Mapped[list["Invoice"]] = relationship(
         back_populates="customer",
@@ -48,6 +77,13 @@ class Customer(Base):
 
 class Invoice(Base):
     __tablename__ = "invoice"
+    __table_args__ = (
+        # A customer's invoices in id (keyset) order
+        Index("ix_invoice_customer_id_id", "customer_id", "id"),
+        # Aging and status reports: `status IN (...)` and an issue date range
+        Index("ix_invoice_status_issued_at", "status", "issued_at"),
+        _NO_ID_REUSE,
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     customer_id: Mapped[int] = mapped_column(
@@ -60,6 +96,39 @@ class Invoice(Base):
         nullable=False
     )
     issued_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    # ISO 4217 code of all amounts on the invoice
+    currency: Mapped[str] = mapped_column(
+        String(3),
+        default=DEFAULT_CURRENCY,
+        server_default=DEFAULT_CURRENCY,
+        nullable=False
+    )
+
+    # Denormalized aggregates of the invoice's line items, maintained
+    # incrementally by InvoiceRepository in the same transaction as the
+    # line item writes. `computed_total_cents` is the source of truth used
+    # to verify and rebuild them.
+    total_cents: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+    line_item_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+    # Bumped by the repositories on every change to the invoice or its
+    # line items; used for ETags
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False
+    )
+
     customer: Mapped[Customer] = relationship(back_populates="invoices")
     line_items: Mapped[list[LineItem]] = relationship(
         back_populates="invoice",
@@ -68,37 +137,55 @@ class Invoice(Base):
     )
 
     @hybrid_property
-    def total_amount(self) -> float:
-        return float(
-            sum(li.quantity * li.unit_price for li in self.line_items)
-            )
+    def computed_total_cents(self) -> int:
+        return sum(li.quantity * li.unit_price_cents for li in self.line_items)
 
-    @total_amount.expression
-    def total_amount(cls):
+    @computed_total_cents.expression
+    def computed_total_cents(cls):
         return (
             select(
                 func.coalesce(
-                    func.sum(LineItem.quantity * LineItem.unit_price), 0
+                    func.sum(LineItem.quantity * LineItem.unit_price_cents),
+                    0
                             )
                     )
             .where(LineItem.invoice_id == cls.id)
-            .correlate(cls.__tablename__)
+            .correlate(cls)
+            .scalar_subquery()
+        )
+
+    @hybrid_property
+    def computed_line_item_count(self) -> int:
+        return len(self.line_items)
+
+    @computed_line_item_count.expression
+    def computed_line_item_count(cls):
+        return (
+            select(func.count(LineItem.id))
+            .where(LineItem.invoice_id == cls.id)
+            .correlate(cls)
             .scalar_subquery()
         )
 
 
 class LineItem(Base):
     __tablename__ = "line_item"
+    __table_args__ = _NO_ID_REUSE
 
     id: Mapped[int] = mapped_column(primary_key=True)
     invoice_id: Mapped[int] = mapped_column(
-        ForeignKey("invoice.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("invoice.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
     )
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
-    unit_price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    unit_price_cents: Mapped[int] = mapped_column(Integer, nullable=False)
 
     invoice: Mapped[Invoice] = relationship(back_populates="line_items")
 
     def __repr__(self) -> str:
-        return f"<LineItem id = {self.id} qty={self.quantity} price={self.unit_price}>"
+        return (
+            f"<LineItem id = {self.id} qty={self.quantity} "
+            f"price_cents={self.unit_price_cents}>"
+        )
@@ -1,6 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional, Sequence
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
-from accounting_api.app.models.sqlalchemy_models import Customer
+from accounting_api.app.core.cache import (
+    customer_key,
+    invalidate_on_commit,
+    invoice_key,
+)
+from accounting_api.app.models.sqlalchemy_models import Customer, Invoice
+
+
+def _page_stmt(
+    limit: Optional[int],
+    after: Optional[int],
+) -> Select[tuple[Customer]]:
+    stmt = select(Customer).order_by(Customer.id.asc())
+    if after is not None:
+        stmt = stmt.where(Customer.id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _version_stmt(customer_id: int) -> Select[tuple[int]]:
+    return select(Customer.version).where(Customer.id == customer_id)
+
+
+def _invoice_ids_stmt(customer_id: int) -> Select[tuple[int]]:
+    return select(Invoice.id).where(Invoice.customer_id == customer_id)
+
+
+def _cache_keys(customer_id: int, invoice_ids: Sequence[int]) -> list[str]:
+    # Invoices go with their customer (ON DELETE CASCADE in the database)
+    return [customer_key(customer_id), *map(invoice_key, invoice_ids)]
+
+
+def _stream_stmt(batch_size: int) -> Select[tuple[Customer]]:
+    return (
+        select(Customer)
+        .order_by(Customer.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
 
 
 class CustomerRepository:
@@ -13,18 +55,101 @@ class CustomerRepository:
         customer = Customer(name=name, email=email)
         self.db.add(customer)
         self.db.flush()
+        invalidate_on_commit(self.db, customer_key(customer.id))
         return customer
 
+    def add_many(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Insert `rows` (mappings of column values) with one executemany
+        INSERT, bypassing the unit of work. Returns the number of rows.
+        """
+        if rows:
+            self.db.execute(insert(Customer), rows)
+        return len(rows)
+
     def get(self, customer_id: Optional[int]) -> Optional[Customer]:
         return self.db.get(Customer, customer_id)
 
+    def get_version(self, customer_id: int) -> Optional[int]:
+        """Current version alone, without loading the customer."""
+        return self.db.scalar(_version_stmt(customer_id))
+
+    def exists(self, customer_id: int) -> bool:
+        return self.get_version(customer_id) is not None
+
     def delete(self, customer_id: Optional[int]) -> bool:
         customer = self.get(customer_id)
         if not customer:
             return False
+        invoice_ids = self.db.scalars(_invoice_ids_stmt(customer.id)).all()
         self.db.delete(customer)
         self.db.flush()
+        invalidate_on_commit(self.db, *_cache_keys(customer.id, invoice_ids))
+        return True
+
+    def list(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[Customer]:
+        """
+        Keyset page ordered by id: rows with `id > after`, at most `limit`.
+        """
+        return list(self.db.scalars(_page_stmt(limit, after)))
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Customer]:
+        """
+        Stream every customer in id order, fetching `batch_size` rows at a
+        time so memory stays flat regardless of table size.
+        """
+        yield from self.db.scalars(_stream_stmt(batch_size))
+
+
+class AsyncCustomerRepository:
+    """`CustomerRepository` for an `AsyncSession`."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, name: str, email: Optional[str]) -> Customer:
+        customer = Customer(name=name, email=email)
+        self.db.add(customer)
+        await self.db.flush()
+        invalidate_on_commit(self.db, customer_key(customer.id))
+        return customer
+
+    async def get(self, customer_id: Optional[int]) -> Optional[Customer]:
+        return await self.db.get(Customer, customer_id)
+
+    async def get_version(self, customer_id: int) -> Optional[int]:
+        return await self.db.scalar(_version_stmt(customer_id))
+
+    async def exists(self, customer_id: int) -> bool:
+        return await self.get_version(customer_id) is not None
+
+    async def delete(self, customer_id: Optional[int]) -> bool:
+        customer = await self.get(customer_id)
+        if not customer:
+            return False
+        invoice_ids = (
+            await self.db.scalars(_invoice_ids_stmt(customer.id))
+        ).all()
+        await self.db.delete(customer)
+        await self.db.flush()
+        invalidate_on_commit(self.db, *_cache_keys(customer.id, invoice_ids))
         return True
 
-    def list(self) -> Optional[list[Customer]]:
-        return list(self.db.query(Customer).order_by(Customer.id.asc()))
+    async def list(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> list[Customer]:
+        return list(await self.db.scalars(_page_stmt(limit, after)))
+
+    async def iter_all(
+            self,
+            batch_size: int = 1000
+            ) -> AsyncIterator[Customer]:
+        result = await self.db.stream_scalars(_stream_stmt(batch_size))
+        async for customer in result:
+            yield customer
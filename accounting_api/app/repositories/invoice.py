@@ -1,14 +1,163 @@
 from __future__ import annotations
-from decimal import Decimal
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
+from sqlalchemy import (
+    Row,
+    Select,
+    Update,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
+from accounting_api.app.core.cache import (
+    get_cache,
+    invalidate_on_commit,
+    invoice_key,
+)
 from accounting_api.app.models.sqlalchemy_models import (
+    DEFAULT_CURRENCY,
     Invoice,
     LineItem,
     InvoiceStatus
 )
 
+# Reads eagerly load line items with one extra SELECT ... IN query, so
+# serializing `line_items` never lazy-loads per invoice.
+_WITH_LINE_ITEMS = [selectinload(Invoice.line_items)]
+
+
+def _new_invoice(
+    customer_id: int,
+    status: InvoiceStatus,
+    currency: str,
+) -> Invoice:
+    # An explicitly empty collection counts as loaded, so serializing a
+    # fresh invoice does not query for its (nonexistent) line items.
+    # `issued_at` is set explicitly for the same reason: the ORM only
+    # applies UPDATE values (see `_status_stmt`) to attributes it holds.
+    return Invoice(
+        customer_id=customer_id,
+        status=status,
+        currency=currency,
+        issued_at=None,
+        line_items=[],
+    )
+
+
+def _by_customer_stmt(
+    customer_id: int,
+    *,
+    status: Optional[InvoiceStatus] = None,
+    issued_from: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+    with_line_items: bool = True,
+) -> Select[tuple[Invoice]]:
+    stmt = (
+        select(Invoice)
+        .where(Invoice.customer_id == customer_id)
+        .order_by(Invoice.id.asc())
+    )
+    if with_line_items:
+        stmt = stmt.options(*_WITH_LINE_ITEMS)
+    if status is not None:
+        stmt = stmt.where(Invoice.status == status)
+    if issued_from is not None:
+        stmt = stmt.where(Invoice.issued_at >= issued_from)
+    if issued_before is not None:
+        stmt = stmt.where(Invoice.issued_at < issued_before)
+    if after is not None:
+        stmt = stmt.where(Invoice.id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _line_items_stmt(invoice_id: int) -> Select[tuple[LineItem]]:
+    return (
+        select(LineItem)
+        .where(LineItem.invoice_id == invoice_id)
+        .order_by(LineItem.id.asc())
+    )
+
+
+def _line_item_delta_stmt(
+    invoice_id: int,
+    amount_cents: int,
+    count: int,
+) -> Update:
+    """
+    Atomically adjust the stored aggregates of one invoice.
+
+    The increment is computed by the database (`col = col + delta`), so
+    concurrent writers never lose each other's updates; the invoice's
+    version is bumped the same way. Binding the delta
+    with the column's type lets the ORM apply the same increment to an
+    invoice already in the session instead of expiring it (which would
+    cost a SELECT on the next read).
+    """
+    return (
+        update(Invoice)
+        .where(Invoice.id == invoice_id)
+        .values(
+            total_cents=Invoice.total_cents
+            + literal(amount_cents, Invoice.total_cents.type),
+            line_item_count=Invoice.line_item_count + count,
+            version=Invoice.version + 1,
+        )
+    )
+
+
+def _status_stmt(
+    invoice_id: int,
+    status: InvoiceStatus,
+    issued_at: Optional[datetime] = None,
+) -> Update:
+    values: dict[str, Any] = {"status": status}
+    if issued_at is not None:
+        values["issued_at"] = issued_at
+    return (
+        update(Invoice)
+        .where(Invoice.id == invoice_id)
+        .values(**values, version=Invoice.version + 1)
+    )
+
+
+def _transition_stmt(
+    from_status: InvoiceStatus,
+    to_status: InvoiceStatus,
+    issued_at: Optional[datetime] = None,
+) -> Update:
+    """
+    Set-based status change of the invoices still in `from_status`,
+    returning the ids it changed. Callers narrow it down with `where`.
+    """
+    values: dict[str, Any] = {"status": to_status}
+    if issued_at is not None:
+        values["issued_at"] = issued_at
+    return (
+        update(Invoice)
+        .where(Invoice.status == from_status)
+        .values(**values, version=Invoice.version + 1)
+        .returning(Invoice.id)
+    )
+
+
+def _chunks(ids: Sequence[int], size: int) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _version_stmt(invoice_id: int) -> Select[tuple[int]]:
+    return select(Invoice.version).where(Invoice.id == invoice_id)
+
 
 class InvoiceRepository:
     """Repository for Invoice and LineItem operations."""
@@ -19,33 +168,151 @@ class InvoiceRepository:
     # --- CREATE ---
     def create(self,
                customer_id: int,
-               status: InvoiceStatus = InvoiceStatus.draft
+               status: InvoiceStatus = InvoiceStatus.draft,
+               currency: str = DEFAULT_CURRENCY
                ) -> Invoice:
-        invoice = Invoice(customer_id=customer_id, status=status)
+        invoice = _new_invoice(customer_id, status, currency)
         self.db.add(invoice)
         self.db.flush()
+        invalidate_on_commit(self.db, invoice_key(invoice.id))
         return invoice
 
     # --- READ ---
-    def get(self, invoice_id: int) -> Optional[Invoice]:
-        return self.db.get(Invoice, invoice_id)
+    def get(
+        self,
+        invoice_id: int,
+        with_line_items: bool = True,
+    ) -> Optional[Invoice]:
+        options = _WITH_LINE_ITEMS if with_line_items else []
+        return self.db.get(Invoice, invoice_id, options=options)
 
-    def list_by_customer(self, customer_id: int) -> List[Invoice]:
-        return list(
-            self.db.query(Invoice)
-            .filter(Invoice.customer_id == customer_id)
-            .order_by(Invoice.id.asc())
-        )
+    def list_by_customer(
+        self,
+        customer_id: int,
+        *,
+        status: Optional[InvoiceStatus] = None,
+        issued_from: Optional[datetime] = None,
+        issued_before: Optional[datetime] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_line_items: bool = True,
+    ) -> List[Invoice]:
+        """
+        A customer's invoices in id order, optionally filtered by status
+        and by `issued_from <= issued_at < issued_before`, as a keyset page
+        (`id > after`, at most `limit`).
+
+        Totals and line counts are stored on the invoice rows, so without
+        line items this is a single SELECT however many invoices match.
+        """
+        return list(self.db.scalars(_by_customer_stmt(
+            customer_id,
+            status=status,
+            issued_from=issued_from,
+            issued_before=issued_before,
+            after=after,
+            limit=limit,
+            with_line_items=with_line_items,
+        )))
+
+    def get_version(self, invoice_id: int) -> Optional[int]:
+        """Current version alone, without loading the invoice."""
+        return self.db.scalar(_version_stmt(invoice_id))
 
     # --- UPDATE ---
-    def update_status(self, invoice_id: int, status: InvoiceStatus) -> bool:
-        invoice = self.get(invoice_id)
-        if not invoice:
+    def update_status(
+        self,
+        invoice_id: int,
+        status: InvoiceStatus,
+        issued_at: Optional[datetime] = None,
+    ) -> bool:
+        result = self.db.execute(_status_stmt(invoice_id, status, issued_at))
+        if result.rowcount == 0:
             return False
-        invoice.status = status
-        self.db.flush()
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return True
+
+    def transition(
+        self,
+        invoice_id: int,
+        from_status: InvoiceStatus,
+        to_status: InvoiceStatus,
+        issued_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Move the invoice to `to_status` only if it is still in
+        `from_status`, in the UPDATE itself. False if it was not.
+        """
+        changed = self.db.scalar(
+            _transition_stmt(from_status, to_status, issued_at)
+            .where(Invoice.id == invoice_id)
+        )
+        if changed is None:
+            return False
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
         return True
 
+    def transition_status(
+        self,
+        from_status: InvoiceStatus,
+        to_status: InvoiceStatus,
+        *,
+        ids: Optional[Sequence[int]] = None,
+        customer_id: Optional[int] = None,
+        issued_before: Optional[datetime] = None,
+        issued_at: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> List[int]:
+        """
+        Move invoices from `from_status` to `to_status` with one UPDATE
+        per chunk of at most `chunk_size` rows, either the given `ids` or
+        all invoices matching the filters. Invoices in another status are
+        left alone. Returns the ids that changed.
+        """
+        stmt = _transition_stmt(from_status, to_status, issued_at)
+        changed: List[int] = []
+        if ids is not None:
+            for chunk in _chunks(ids, chunk_size):
+                changed += self.db.scalars(
+                    stmt.where(Invoice.id.in_(chunk))
+                ).all()
+        else:
+            # Changed rows leave `from_status`, so each round picks the
+            # next chunk until none match
+            matching = select(Invoice.id).where(
+                Invoice.status == from_status
+            )
+            if customer_id is not None:
+                matching = matching.where(Invoice.customer_id == customer_id)
+            if issued_before is not None:
+                matching = matching.where(Invoice.issued_at < issued_before)
+            next_chunk = (
+                matching.order_by(Invoice.id.asc()).limit(chunk_size)
+            )
+            while True:
+                chunk = self.db.scalars(
+                    stmt.where(Invoice.id.in_(next_chunk.scalar_subquery()))
+                ).all()
+                changed += chunk
+                if len(chunk) < chunk_size:
+                    break
+        if changed:
+            invalidate_on_commit(self.db, *map(invoice_key, changed))
+        return changed
+
+    def existing_ids(
+        self,
+        ids: Sequence[int],
+        chunk_size: int = 1000,
+    ) -> set[int]:
+        """The subset of `ids` that exist, looked up in chunks."""
+        found: set[int] = set()
+        for chunk in _chunks(ids, chunk_size):
+            found.update(self.db.scalars(
+                select(Invoice.id).where(Invoice.id.in_(chunk))
+            ))
+        return found
+
     # --- DELETE ---
     def delete(self, invoice_id: int) -> bool:
         invoice = self.get(invoice_id)
@@ -53,32 +320,124 @@ class InvoiceRepository:
             return False
         self.db.delete(invoice)
         self.db.flush()
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
         return True
 
+    # --- TOTALS ---
+    def find_total_drift(self) -> Sequence[Row]:
+        """
+        Invoices whose stored aggregates disagree with their line items.
+
+        Rows carry `id`, `total_cents`, `line_item_count`,
+        `actual_total_cents` and `actual_count`. Amounts are integers, so
+        any difference is drift.
+        """
+        actual = (
+            select(
+                LineItem.invoice_id,
+                func.sum(LineItem.quantity * LineItem.unit_price_cents)
+                .label("total"),
+                func.count(LineItem.id).label("count"),
+            )
+            .group_by(LineItem.invoice_id)
+            .subquery()
+        )
+        actual_total = func.coalesce(actual.c.total, 0)
+        actual_count = func.coalesce(actual.c.count, 0)
+        stmt = (
+            select(
+                Invoice.id,
+                Invoice.total_cents,
+                Invoice.line_item_count,
+                actual_total.label("actual_total_cents"),
+                actual_count.label("actual_count"),
+            )
+            .outerjoin(actual, actual.c.invoice_id == Invoice.id)
+            .where(
+                or_(
+                    Invoice.total_cents != actual_total,
+                    Invoice.line_item_count != actual_count,
+                )
+            )
+            .order_by(Invoice.id.asc())
+        )
+        return self.db.execute(stmt).all()
+
+    def rebuild_totals(
+        self,
+        invoice_ids: Optional[Sequence[int]] = None,
+    ) -> int:
+        """
+        Recompute stored aggregates from line items, for the given
+        invoices or for all of them. Returns the number of rows updated.
+        """
+        stmt = update(Invoice).values(
+            total_cents=Invoice.computed_total_cents,
+            line_item_count=Invoice.computed_line_item_count,
+            version=Invoice.version + 1,
+        )
+        if invoice_ids is not None:
+            stmt = stmt.where(Invoice.id.in_(invoice_ids))
+            invalidate_on_commit(self.db, *map(invoice_key, invoice_ids))
+        else:
+            get_cache().clear()
+        result = self.db.execute(
+            stmt.execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount
+
     # --- LINE ITEMS ---
     def add_line_item(
         self,
         invoice_id: int,
         description: str,
         quantity: int,
-        unit_price: float | Decimal
+        unit_price_cents: int
     ) -> LineItem:
         line = LineItem(
             invoice_id=invoice_id,
             description=description,
             quantity=quantity,
-            unit_price=unit_price,
+            unit_price_cents=unit_price_cents,
         )
         self.db.add(line)
         self.db.flush()
+        self.db.execute(
+            _line_item_delta_stmt(
+                invoice_id, quantity * unit_price_cents, 1
+            )
+        )
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
         return line
 
-    def list_line_items(self, invoice_id: int) -> List[LineItem]:
-        return list(
-            self.db.query(LineItem)
-            .filter(LineItem.invoice_id == invoice_id)
-            .order_by(LineItem.id.asc())
+    def add_line_items(
+        self,
+        invoice_id: int,
+        items: Sequence[Mapping[str, Any]],
+    ) -> List[LineItem]:
+        """
+        Insert many line items with one batched INSERT ... RETURNING and
+        a single update of the invoice aggregates.
+
+        `items` are mappings with `description`, `quantity` and
+        `unit_price_cents`; the created rows are returned in input order.
+        """
+        rows = [{**item, "invoice_id": invoice_id} for item in items]
+        # Ids follow insertion order; sorting here is cheaper than
+        # `sort_by_parameter_order`, which makes SQLite insert row by row.
+        lines = sorted(
+            self.db.scalars(insert(LineItem).returning(LineItem), rows),
+            key=lambda line: line.id,
         )
+        amount = sum(
+            row["quantity"] * row["unit_price_cents"] for row in rows
+        )
+        self.db.execute(_line_item_delta_stmt(invoice_id, amount, len(rows)))
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return lines
+
+    def list_line_items(self, invoice_id: int) -> List[LineItem]:
+        return list(self.db.scalars(_line_items_stmt(invoice_id)))
 
     def delete_line_item(self, line_item_id: int) -> bool:
         line = self.db.get(LineItem, line_item_id)
@@ -86,4 +445,141 @@ class InvoiceRepository:
             return False
         self.db.delete(line)
         self.db.flush()
+        self.db.execute(
+            _line_item_delta_stmt(
+                line.invoice_id, -(line.quantity * line.unit_price_cents), -1
+            )
+        )
+        invalidate_on_commit(self.db, invoice_key(line.invoice_id))
+        return True
+
+
+class AsyncInvoiceRepository:
+    """`InvoiceRepository` for an `AsyncSession`."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # --- CREATE ---
+    async def create(self,
+                     customer_id: int,
+                     status: InvoiceStatus = InvoiceStatus.draft,
+                     currency: str = DEFAULT_CURRENCY
+                     ) -> Invoice:
+        invoice = _new_invoice(customer_id, status, currency)
+        self.db.add(invoice)
+        await self.db.flush()
+        invalidate_on_commit(self.db, invoice_key(invoice.id))
+        return invoice
+
+    # --- READ ---
+    async def get(self, invoice_id: int) -> Optional[Invoice]:
+        return await self.db.get(
+            Invoice, invoice_id, options=_WITH_LINE_ITEMS
+        )
+
+    async def list_by_customer(
+        self,
+        customer_id: int,
+        *,
+        status: Optional[InvoiceStatus] = None,
+        issued_from: Optional[datetime] = None,
+        issued_before: Optional[datetime] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_line_items: bool = True,
+    ) -> List[Invoice]:
+        return list(await self.db.scalars(_by_customer_stmt(
+            customer_id,
+            status=status,
+            issued_from=issued_from,
+            issued_before=issued_before,
+            after=after,
+            limit=limit,
+            with_line_items=with_line_items,
+        )))
+
+    async def get_version(self, invoice_id: int) -> Optional[int]:
+        return await self.db.scalar(_version_stmt(invoice_id))
+
+    # --- UPDATE ---
+    async def update_status(
+            self,
+            invoice_id: int,
+            status: InvoiceStatus,
+            issued_at: Optional[datetime] = None
+            ) -> bool:
+        result = await self.db.execute(
+            _status_stmt(invoice_id, status, issued_at)
+        )
+        if result.rowcount == 0:
+            return False
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return True
+
+    async def transition(
+            self,
+            invoice_id: int,
+            from_status: InvoiceStatus,
+            to_status: InvoiceStatus,
+            issued_at: Optional[datetime] = None
+            ) -> bool:
+        changed = await self.db.scalar(
+            _transition_stmt(from_status, to_status, issued_at)
+            .where(Invoice.id == invoice_id)
+        )
+        if changed is None:
+            return False
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return True
+
+    # --- DELETE ---
+    async def delete(self, invoice_id: int) -> bool:
+        invoice = await self.get(invoice_id)
+        if not invoice:
+            return False
+        await self.db.delete(invoice)
+        await self.db.flush()
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return True
+
+    # --- LINE ITEMS ---
+    async def add_line_item(
+        self,
+        invoice_id: int,
+        description: str,
+        quantity: int,
+        unit_price_cents: int
+    ) -> LineItem:
+        line = LineItem(
+            invoice_id=invoice_id,
+            description=description,
+            quantity=quantity,
+            unit_price_cents=unit_price_cents,
+        )
+        self.db.add(line)
+        await self.db.flush()
+        await self.db.execute(
+            _line_item_delta_stmt(
+                invoice_id, quantity * unit_price_cents, 1
+            )
+        )
+        invalidate_on_commit(self.db, invoice_key(invoice_id))
+        return line
+
+    async def list_line_items(self, invoice_id: int) -> List[LineItem]:
+        return list(await self.db.scalars(_line_items_stmt(invoice_id)))
+
+    async def delete_line_item(self, line_item_id: int) -> bool:
+        line = await self.db.get(LineItem, line_item_id)
+        if not line:
+            return False
+        await self.db.delete(line)
+        await self.db.flush()
+        await self.db.execute(
+            _line_item_delta_stmt(
+                line.invoice_id, -(line.quantity * line.unit_price_cents), -1
+            )
+        )
+        invalidate_on_commit(self.db, invoice_key(line.invoice_id))
         return True
@@ -0,0 +1,200 @@
+"""
+Streaming bulk import of customers from NDJSON or CSV.
+
+Input is consumed line by line: each row is validated with
+`CustomerCreate` as soon as it is read, valid rows are buffered up to
+`chunk_size` and written with one bulk INSERT per chunk, and each chunk is
+committed on its own. Memory use therefore depends on the chunk size, not
+on the size of the input.
+
+Unlike the other services, the importer owns its transaction boundaries:
+a failure part-way through keeps the chunks committed so far, and the
+report says how far the import got.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from accounting_api.app.models.schemas.customer import (
+    CustomerCreate,
+    CustomerImportError,
+    CustomerImportReport,
+)
+from accounting_api.app.repositories.customer import CustomerRepository
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+IMPORT_FORMATS = ("ndjson", "csv")
+
+RowParser = Callable[[str], Optional[dict[str, Any]]]
+
+
+class RowFormatError(ValueError):
+    """A line that cannot be decoded into a row."""
+
+
+def _decode(line: bytes) -> str:
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise RowFormatError(f"invalid UTF-8 at byte {exc.start}") from None
+
+
+def _parse_ndjson(line: str) -> Optional[dict[str, Any]]:
+    if not line.strip():
+        return None
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise RowFormatError(f"invalid JSON: {exc.msg}") from None
+    if not isinstance(row, dict):
+        raise RowFormatError("expected a JSON object")
+    return row
+
+
+class _CsvRowParser:
+    """
+    Parses one CSV line at a time; the first non-empty line is the header.
+    Quoted fields may not span lines.
+    """
+
+    def __init__(self) -> None:
+        self.header: Optional[list[str]] = None
+
+    def __call__(self, line: str) -> Optional[dict[str, Any]]:
+        if not line.strip():
+            return None
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            raise RowFormatError(
+                f"expected {len(self.header)} fields, got {len(values)}"
+            )
+        # Empty cells mean "not provided" for optional fields
+        return {
+            name: value or None for name, value in zip(self.header, values)
+        }
+
+
+def make_row_parser(fmt: str) -> RowParser:
+    if fmt == "ndjson":
+        return _parse_ndjson
+    if fmt == "csv":
+        return _CsvRowParser()
+    raise ValueError(f"Unsupported import format {fmt!r}")
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class CustomerImporter:
+    """
+    Accumulates validated rows and writes them in chunks.
+
+    Callers feed lines with `add_line`, as text or as UTF-8 bytes (a line
+    that does not decode is reported like any other bad row); when it
+    returns True a chunk is full and `flush` should be called (possibly
+    from a worker thread when driven from async code). `finish` flushes
+    the remainder.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        fmt: str = "ndjson",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.db = db
+        self.repo = CustomerRepository(db)
+        self.parse = make_row_parser(fmt)
+        self.chunk_size = chunk_size
+        self.report = CustomerImportReport()
+        self._pending: list[dict[str, Any]] = []
+        self._line_no = 0
+
+    def add_line(self, line: str | bytes) -> bool:
+        self._line_no += 1
+        try:
+            if isinstance(line, bytes):
+                line = _decode(line)
+            raw = self.parse(line)
+            if raw is None:
+                return False
+            customer = CustomerCreate.model_validate(raw)
+        except RowFormatError as exc:
+            self._fail(str(exc))
+        except ValidationError as exc:
+            self._fail(_describe(exc))
+        else:
+            self._pending.append(
+                {"name": customer.name, "email": customer.email}
+            )
+        return len(self._pending) >= self.chunk_size
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        self.report.imported += self.repo.add_many(self._pending)
+        self.db.commit()
+        self._pending.clear()
+
+    def finish(self) -> CustomerImportReport:
+        self.flush()
+        return self.report
+
+    def _fail(self, message: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(
+                CustomerImportError(line=self._line_no, error=message)
+            )
+
+
+def import_customers(
+    db: Session,
+    lines: Iterable[str],
+    fmt: str = "ndjson",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CustomerImportReport:
+    """Import from an iterable of text lines (e.g. an open file)."""
+    importer = CustomerImporter(db, fmt=fmt, chunk_size=chunk_size)
+    for line in lines:
+        if importer.add_line(line):
+            importer.flush()
+    return importer.finish()
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[bytes]:
+    """
+    Split a stream of byte chunks into lines. They are left undecoded so
+    that `CustomerImporter.add_line` can reject an invalid line on its own
+    instead of failing the whole import.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for raw in complete:
+            yield raw.rstrip(b"\r")
+    if buffer:
+        yield buffer.rstrip(b"\r")
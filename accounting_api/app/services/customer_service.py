@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import AsyncIterator, Iterator, Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from accounting_api.app.repositories.customer import CustomerRepository
+from accounting_api.app.core.cache import (
+    aread_through,
+    cached,
+    customer_key,
+    read_through,
+)
+from accounting_api.app.models.schemas.customer import CustomerRead
+from accounting_api.app.repositories.customer import (
+    AsyncCustomerRepository,
+    CustomerRepository,
+)
 from accounting_api.app.models.sqlalchemy_models import Customer
+from accounting_api.app.services.pagination import split_page
 
 
 class CustomerService:
@@ -19,9 +31,89 @@ class CustomerService:
     def get_customer(self, customer_id: int) -> Optional[Customer]:
         return self.repo.get(customer_id)
 
-    def list_customers(self) -> Optional[List[Customer]]:
-        return self.repo.list()
+    def read_customer(self, customer_id: int) -> Optional[CustomerRead]:
+        """Read model of a customer, served from the entity cache."""
+        def load() -> Optional[CustomerRead]:
+            customer = self.repo.get(customer_id)
+            return CustomerRead.model_validate(customer) if customer else None
+
+        return read_through(self.db, customer_key(customer_id), load)
+
+    def customer_version(self, customer_id: int) -> Optional[int]:
+        """
+        Current version of a customer (None if it does not exist), from the
+        cached read model when present, else a single-column lookup.
+        """
+        read_model = cached(self.db, customer_key(customer_id))
+        if read_model is not None:
+            return read_model.version
+        return self.repo.get_version(customer_id)
+
+    def list_customers(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+    ) -> tuple[List[Customer], Optional[int]]:
+        """
+        Return one page of customers and the cursor for the next page
+        (None when this is the last page).
+        """
+        # Fetch one extra row to know whether another page exists
+        customers = self.repo.list(limit=limit + 1, after=after)
+        return split_page(customers, limit)
+
+    def iter_customers(self, batch_size: int = 1000) -> Iterator[Customer]:
+        return self.repo.iter_all(batch_size=batch_size)
 
     def delete_customer(self, customer_id: int) -> bool:
         deleted = self.repo.delete(customer_id)
         return deleted
+
+
+class AsyncCustomerService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = AsyncCustomerRepository(db)
+
+    async def create_customer(
+            self,
+            name: str,
+            email: Optional[str]
+            ) -> Customer:
+        return await self.repo.add(name=name, email=email)
+
+    async def get_customer(self, customer_id: int) -> Optional[Customer]:
+        return await self.repo.get(customer_id)
+
+    async def read_customer(
+            self,
+            customer_id: int
+            ) -> Optional[CustomerRead]:
+        async def load() -> Optional[CustomerRead]:
+            customer = await self.repo.get(customer_id)
+            return CustomerRead.model_validate(customer) if customer else None
+
+        return await aread_through(self.db, customer_key(customer_id), load)
+
+    async def customer_version(self, customer_id: int) -> Optional[int]:
+        read_model = cached(self.db, customer_key(customer_id))
+        if read_model is not None:
+            return read_model.version
+        return await self.repo.get_version(customer_id)
+
+    async def list_customers(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+    ) -> tuple[List[Customer], Optional[int]]:
+        customers = await self.repo.list(limit=limit + 1, after=after)
+        return split_page(customers, limit)
+
+    def iter_customers(
+            self,
+            batch_size: int = 1000
+            ) -> AsyncIterator[Customer]:
+        return self.repo.iter_all(batch_size=batch_size)
+
+    async def delete_customer(self, customer_id: int) -> bool:
+        return await self.repo.delete(customer_id)
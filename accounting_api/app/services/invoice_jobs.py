@@ -0,0 +1,30 @@
+"""
+Background job handlers for invoices, run by the `JobQueue` workers in a
+thread with their own unit of work.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from accounting_api.app.core.db_adapter import get_session_factory
+from accounting_api.app.core.db_infrastructure import session_scope
+from accounting_api.app.core.jobs import PermanentJobError
+from accounting_api.app.services.errors import NotFoundError
+from accounting_api.app.services.invoice_service import InvoiceService
+
+INVOICE_ISSUED = "invoice.issued"
+
+
+def invoice_issued(invoice_id: int) -> dict[str, Any]:
+    """
+    Follow-up work of issuing an invoice (documents, notifications, ledger
+    postings) belongs here, outside the request. Queued once the issue
+    has committed, so the invoice is already issued when this runs.
+    """
+    try:
+        with session_scope(get_session_factory()) as db:
+            invoice = InvoiceService(db).get_invoice(invoice_id)
+            return {"invoice_id": invoice.id, "status": invoice.status.value}
+    except NotFoundError as exc:
+        # Deleted in the meantime: retrying does not bring it back
+        raise PermanentJobError(str(exc)) from exc
@@ -1,11 +1,59 @@
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from accounting_api.app.core.cache import (
+    aread_through,
+    cached,
+    invoice_key,
+    read_through,
+)
+from accounting_api.app.models.schemas.invoice import (
+    BulkTransitionRead,
+    InvoiceRead,
+    InvoiceSummaryRead,
+)
 from accounting_api.app.services.errors import (
     InvalidOperationError,
     NotFoundError
 )
-from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
-from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.app.models.sqlalchemy_models import (
+    DEFAULT_CURRENCY,
+    InvoiceStatus,
+)
+from accounting_api.app.repositories.customer import (
+    AsyncCustomerRepository,
+    CustomerRepository,
+)
+from accounting_api.app.repositories.invoice import (
+    AsyncInvoiceRepository,
+    InvoiceRepository,
+)
+from accounting_api.app.services.pagination import split_page
+
+CustomerInvoicePage = tuple[List[InvoiceSummaryRead], Optional[int]]
+
+# Invoice lifecycle: target status -> the status it can be reached from
+INVOICE_TRANSITIONS = {
+    InvoiceStatus.issued: InvoiceStatus.draft,
+    InvoiceStatus.paid: InvoiceStatus.issued,
+}
+BULK_TRANSITION_CHUNK_SIZE = 1000
+
+
+def _issue_time() -> datetime:
+    # Naive UTC, like the database's CURRENT_TIMESTAMP
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _read_models(
+    invoices: Sequence[Any],
+    include_line_items: bool,
+) -> List[InvoiceSummaryRead]:
+    schema = InvoiceRead if include_line_items else InvoiceSummaryRead
+    return [schema.model_validate(invoice) for invoice in invoices]
 
 
 class InvoiceService:
@@ -13,8 +61,12 @@ class InvoiceService:
         self.db = db
         self.repo = InvoiceRepository(db)
 
-    def create_invoice(self, customer_id: int):
-        invoice = self.repo.create(customer_id)
+    def create_invoice(
+        self,
+        customer_id: int,
+        currency: str = DEFAULT_CURRENCY,
+    ):
+        invoice = self.repo.create(customer_id, currency=currency)
         return invoice
 
     def get_invoice(self, invoice_id: int):
@@ -23,6 +75,62 @@ class InvoiceService:
             raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
         return invoice
 
+    def read_invoice(self, invoice_id: int) -> InvoiceRead:
+        """Read model of an invoice, served from the entity cache."""
+        def load() -> Optional[InvoiceRead]:
+            invoice = self.repo.get(invoice_id)
+            return InvoiceRead.model_validate(invoice) if invoice else None
+
+        invoice = read_through(self.db, invoice_key(invoice_id), load)
+        if invoice is None:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        return invoice
+
+    def invoice_version(self, invoice_id: int) -> int:
+        """
+        Current version of an invoice, from the cached read model when
+        present, else a single-column lookup.
+        """
+        read_model = cached(self.db, invoice_key(invoice_id))
+        version = read_model.version if read_model else self.repo.get_version(
+            invoice_id
+        )
+        if version is None:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        return version
+
+    def list_customer_invoices(
+        self,
+        customer_id: int,
+        limit: int,
+        after: Optional[int] = None,
+        status: Optional[InvoiceStatus] = None,
+        issued_from: Optional[datetime] = None,
+        issued_before: Optional[datetime] = None,
+        include_line_items: bool = False,
+    ) -> CustomerInvoicePage:
+        """
+        One keyset page of a customer's invoices and the cursor for the
+        next page. Summaries come from the invoice rows alone (stored
+        totals and line counts); line items are loaded only on request.
+        """
+        invoices = self.repo.list_by_customer(
+            customer_id,
+            status=status,
+            issued_from=issued_from,
+            issued_before=issued_before,
+            after=after,
+            limit=limit + 1,
+            with_line_items=include_line_items,
+        )
+        # Only an empty page needs to tell "no such customer" apart
+        if not invoices and not CustomerRepository(self.db).exists(
+            customer_id
+        ):
+            raise NotFoundError(f"Customer with ID {customer_id} not found.")
+        page, next_cursor = split_page(invoices, limit)
+        return _read_models(page, include_line_items), next_cursor
+
     def delete_invoice(self, invoice_id: int) -> bool:
         deleted = self.repo.delete(invoice_id)
         return deleted
@@ -32,21 +140,184 @@ class InvoiceService:
         invoice_id: int,
         description: str,
         quantity: int,
-        unit_price: float,
+        unit_price_cents: int,
     ):
         lineItem = self.repo.add_line_item(
             invoice_id=invoice_id,
             description=description,
             quantity=quantity,
-            unit_price=unit_price,
+            unit_price_cents=unit_price_cents,
         )
         return lineItem
 
+    def add_line_items(
+        self,
+        invoice_id: int,
+        items: Sequence[Mapping[str, Any]],
+    ):
+        """
+        Add a batch of line items; returns the created items and the
+        invoice with its updated total.
+        """
+        invoice = self.repo.get(invoice_id, with_line_items=False)
+        if not invoice:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        lines = self.repo.add_line_items(invoice_id, items)
+        return lines, invoice
+
     def issue_invoice(self, invoice_id: int):
+        """
+        Issue a draft invoice. The UPDATE itself requires the draft
+        status, so a concurrent issue or payment cannot be overwritten.
+        """
+        issued = self.repo.transition(
+            invoice_id, InvoiceStatus.draft, InvoiceStatus.issued,
+            _issue_time(),
+        )
         invoice = self.get_invoice(invoice_id)
-        if invoice.status != InvoiceStatus.draft:
+        if not issued:
+            raise InvalidOperationError(
+                f"Invoice {invoice_id} is not a draft and cannot be issued."
+            )
+        return invoice
+
+    def bulk_transition(
+        self,
+        to_status: InvoiceStatus,
+        ids: Optional[Sequence[int]] = None,
+        customer_id: Optional[int] = None,
+        issued_before: Optional[datetime] = None,
+        chunk_size: int = BULK_TRANSITION_CHUNK_SIZE,
+    ) -> BulkTransitionRead:
+        """
+        Move the given invoices, or all matching the filters, to
+        `to_status` along the lifecycle (draft -> issued -> paid), with
+        set-based UPDATEs of `chunk_size` rows in this unit of work.
+        Requested invoices in another status are rejected, not changed.
+        """
+        from_status = INVOICE_TRANSITIONS.get(to_status)
+        if from_status is None:
+            raise InvalidOperationError(
+                f"Invoices cannot transition to {to_status.value}."
+            )
+        issuing = to_status == InvoiceStatus.issued
+        issued_at = _issue_time() if issuing else None
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+        changed = self.repo.transition_status(
+            from_status,
+            to_status,
+            ids=ids,
+            customer_id=customer_id,
+            issued_before=issued_before,
+            issued_at=issued_at,
+            chunk_size=chunk_size,
+        )
+
+        rejected = not_found = 0
+        if ids is not None:
+            changed_ids = set(changed)
+            unchanged = [i for i in ids if i not in changed_ids]
+            if unchanged:
+                rejected = len(self.repo.existing_ids(unchanged, chunk_size))
+                not_found = len(unchanged) - rejected
+        return BulkTransitionRead(
+            status=to_status,
+            transitioned=len(changed),
+            rejected=rejected,
+            not_found=not_found,
+        )
+
+
+class AsyncInvoiceService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = AsyncInvoiceRepository(db)
+
+    async def create_invoice(
+        self,
+        customer_id: int,
+        currency: str = DEFAULT_CURRENCY,
+    ):
+        return await self.repo.create(customer_id, currency=currency)
+
+    async def get_invoice(self, invoice_id: int):
+        invoice = await self.repo.get(invoice_id)
+        if not invoice:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        return invoice
+
+    async def read_invoice(self, invoice_id: int) -> InvoiceRead:
+        async def load() -> Optional[InvoiceRead]:
+            invoice = await self.repo.get(invoice_id)
+            return InvoiceRead.model_validate(invoice) if invoice else None
+
+        invoice = await aread_through(self.db, invoice_key(invoice_id), load)
+        if invoice is None:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        return invoice
+
+    async def invoice_version(self, invoice_id: int) -> int:
+        read_model = cached(self.db, invoice_key(invoice_id))
+        if read_model is not None:
+            version: Optional[int] = read_model.version
+        else:
+            version = await self.repo.get_version(invoice_id)
+        if version is None:
+            raise NotFoundError(f"Invoice with ID {invoice_id} not found.")
+        return version
+
+    async def list_customer_invoices(
+        self,
+        customer_id: int,
+        limit: int,
+        after: Optional[int] = None,
+        status: Optional[InvoiceStatus] = None,
+        issued_from: Optional[datetime] = None,
+        issued_before: Optional[datetime] = None,
+        include_line_items: bool = False,
+    ) -> CustomerInvoicePage:
+        invoices = await self.repo.list_by_customer(
+            customer_id,
+            status=status,
+            issued_from=issued_from,
+            issued_before=issued_before,
+            after=after,
+            limit=limit + 1,
+            with_line_items=include_line_items,
+        )
+        if not invoices and not await AsyncCustomerRepository(
+            self.db
+        ).exists(customer_id):
+            raise NotFoundError(f"Customer with ID {customer_id} not found.")
+        page, next_cursor = split_page(invoices, limit)
+        return _read_models(page, include_line_items), next_cursor
+
+    async def delete_invoice(self, invoice_id: int) -> bool:
+        return await self.repo.delete(invoice_id)
+
+    async def add_line_item(
+        self,
+        invoice_id: int,
+        description: str,
+        quantity: int,
+        unit_price_cents: int,
+    ):
+        return await self.repo.add_line_item(
+            invoice_id=invoice_id,
+            description=description,
+            quantity=quantity,
+            unit_price_cents=unit_price_cents,
+        )
+
+    async def issue_invoice(self, invoice_id: int):
+        issued = await self.repo.transition(
+            invoice_id, InvoiceStatus.draft, InvoiceStatus.issued,
+            _issue_time(),
+        )
+        invoice = await self.get_invoice(invoice_id)
+        if not issued:
             raise InvalidOperationError(
-                f"Cannot issue invoice with status {invoice.status}."
+                f"Invoice {invoice_id} is not a draft and cannot be issued."
             )
-        invoice.status = InvoiceStatus.issued
         return invoice
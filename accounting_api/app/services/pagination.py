@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import List, Optional, Protocol, TypeVar
+
+
+class _HasId(Protocol):
+    id: int
+
+
+RowT = TypeVar("RowT", bound=_HasId)
+
+
+def split_page(
+    rows: List[RowT],
+    limit: int,
+) -> tuple[List[RowT], Optional[int]]:
+    """
+    Trim a keyset page fetched with `limit + 1` rows. Returns the page and
+    the cursor for the next one (None when this is the last page).
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
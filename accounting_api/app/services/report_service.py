@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from accounting_api.app.models.schemas.invoice import from_cents
+from accounting_api.app.models.schemas.report import AgingReportRead
+from accounting_api.app.models.sqlalchemy_models import (
+    DEFAULT_CURRENCY,
+    InvoiceStatus,
+)
+from accounting_api.app.repositories.report import ReportRepository
+
+# Receivables: issued but not yet paid
+DEFAULT_AGING_STATUSES = (InvoiceStatus.issued,)
+_AMOUNTS = ("current", "days_30", "days_60", "days_90_plus", "total")
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    # `issued_at` is stored as naive UTC
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+class ReportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ReportRepository(db)
+
+    def aging_report(
+        self,
+        as_of: Optional[datetime] = None,
+        statuses: Optional[Sequence[InvoiceStatus]] = None,
+    ) -> AgingReportRead:
+        """
+        Accounts-receivable aging per customer, status and currency, plus
+        overall totals per status and currency, from a single aggregate
+        query. A requested status without invoices gets one zero entry.
+        """
+        as_of = _naive_utc(as_of or datetime.now(timezone.utc))
+        statuses = list(dict.fromkeys(statuses or DEFAULT_AGING_STATUSES))
+        rows = self.repo.aging(as_of, statuses)
+
+        def zero(status: InvoiceStatus, currency: str) -> dict[str, Any]:
+            return dict.fromkeys(_AMOUNTS, 0) | {
+                "status": status, "currency": currency, "invoice_count": 0
+            }
+
+        by_key: dict[tuple[InvoiceStatus, str], dict[str, Any]] = {}
+        # Sum exact cents first, convert to amounts once at the end
+        for row in rows:
+            key = row["status"], row["currency"]
+            totals = by_key.get(key) or by_key.setdefault(key, zero(*key))
+            totals["invoice_count"] += row["invoice_count"]
+            for name in _AMOUNTS:
+                totals[name] += row[name]
+        overall = []
+        for status in statuses:
+            currencies = sorted(
+                currency for (of, currency) in by_key if of == status
+            )
+            overall += [by_key[status, c] for c in currencies] or [
+                zero(status, DEFAULT_CURRENCY)
+            ]
+        for totals in (*rows, *overall):
+            for name in _AMOUNTS:
+                totals[name] = from_cents(totals[name])
+
+        # One validation pass over the whole report rather than a model
+        # per row
+        return AgingReportRead.model_validate({
+            "as_of": as_of,
+            "statuses": statuses,
+            "customers": rows,
+            "overall": overall,
+        })
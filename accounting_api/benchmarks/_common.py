@@ -0,0 +1,178 @@
+"""
+Shared helpers for the benchmark scripts in this package.
+
+Benchmarks run the application in-process against a throwaway SQLite file,
+so numbers are comparable between commits on the same machine rather than
+representative of a production deployment.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Generator, Sequence
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from accounting_api.app.api.routes import customers, invoices
+from accounting_api.app.core.db_adapter import get_db
+from accounting_api.app.core.db_infrastructure import (
+    make_engine,
+    make_session_factory,
+)
+from accounting_api.app.models.sqlalchemy_models import (
+    Base,
+    Customer,
+    Invoice,
+    InvoiceStatus,
+    LineItem,
+)
+
+
+def temp_sqlite_url(name: str = "bench.db") -> str:
+    """URL of a fresh SQLite file in a temporary directory."""
+    directory = Path(tempfile.mkdtemp(prefix="accounting-bench-"))
+    return f"sqlite:///{directory / name}"
+
+
+def build_sync_app(url: str) -> FastAPI:
+    """The customer and invoice routers wired to the database at `url`."""
+    factory = make_session_factory(make_engine(url))
+
+    def override_get_db() -> Generator[Any, None, None]:
+        with factory() as db:
+            yield db
+            db.commit()
+
+    app = FastAPI()
+    app.include_router(customers.router)
+    app.include_router(invoices.router)
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms: Sequence[float], elapsed_s: float) -> dict:
+    return {
+        "requests": len(latencies_ms),
+        "rps": round(len(latencies_ms) / elapsed_s, 1) if elapsed_s else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+    }
+
+
+def seed_dataset(
+    engine: Engine,
+    *,
+    customers: int,
+    invoices_per_customer: int,
+    items_per_invoice: int,
+    issued_within_days: int = 0,
+    seed: int = 42,
+    chunk_rows: int = 50_000,
+) -> None:
+    """
+    Create the schema and bulk insert a uniform dataset.
+
+    With `issued_within_days`, invoices get an `issued_at` spread uniformly
+    over that many days before now. Rows are inserted in chunks of about
+    `chunk_rows` line items, so million-row datasets fit in memory.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    Base.metadata.create_all(bind=engine)
+
+    customer_rows = [
+        {"id": c, "name": f"Customer {c}", "email": f"c{c}@example.com"}
+        for c in range(1, customers + 1)
+    ]
+    invoice_rows: list[dict[str, Any]] = []
+    item_rows: list[dict[str, Any]] = []
+
+    def flush(conn: Any) -> None:
+        # Invoices first: line items reference them
+        if invoice_rows:
+            conn.execute(insert(Invoice), invoice_rows)
+        if item_rows:
+            conn.execute(insert(LineItem), item_rows)
+        invoice_rows.clear()
+        item_rows.clear()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Customer), customer_rows)
+        invoice_id = 0
+        for customer_id in range(1, customers + 1):
+            for _ in range(invoices_per_customer):
+                invoice_id += 1
+                total = 0
+                for n in range(items_per_invoice):
+                    quantity = rng.randint(1, 10)
+                    unit_price_cents = rng.randint(100, 50_000)
+                    total += quantity * unit_price_cents
+                    item_rows.append({
+                        "invoice_id": invoice_id,
+                        "description": f"Item {n}",
+                        "quantity": quantity,
+                        "unit_price_cents": unit_price_cents,
+                    })
+                issued_at = None
+                if issued_within_days:
+                    age = rng.uniform(0, issued_within_days)
+                    issued_at = now - timedelta(days=age)
+                invoice_rows.append({
+                    "id": invoice_id,
+                    "customer_id": customer_id,
+                    "status": InvoiceStatus.issued,
+                    "issued_at": issued_at,
+                    "total_cents": total,
+                    "line_item_count": items_per_invoice,
+                })
+            if len(item_rows) >= chunk_rows:
+                flush(conn)
+        flush(conn)
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    paths: Sequence[str],
+    *,
+    concurrency: int,
+    requests: int,
+) -> tuple[list[float], float]:
+    """
+    Issue `requests` GETs cycling through `paths` from `concurrency`
+    concurrent clients. Returns per-request latencies (ms) and the
+    wall-clock duration (s).
+    """
+    latencies: list[float] = []
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            path = paths[next_index % len(paths)]
+            next_index += 1
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
@@ -0,0 +1,79 @@
+"""
+Latency of the accounts-receivable aging report on a large dataset.
+
+Seeds customers x invoices x line items (1,000,000 line items by default)
+with issue dates spread over a year, then times the report and exits
+non-zero when its p95 exceeds the latency budget.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_aging_report --budget-ms 750
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from accounting_api.app.core.db_infrastructure import (
+    make_engine,
+    make_session_factory,
+)
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.services.report_service import ReportService
+from accounting_api.benchmarks._common import (
+    percentile,
+    seed_dataset,
+    temp_sqlite_url,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="aging report latency")
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--invoices-per-customer", type=int, default=10)
+    parser.add_argument("--items-per-invoice", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=750.0)
+    args = parser.parse_args()
+
+    engine = make_engine(temp_sqlite_url())
+    start = time.perf_counter()
+    seed_dataset(
+        engine,
+        customers=args.customers,
+        invoices_per_customer=args.invoices_per_customer,
+        items_per_invoice=args.items_per_invoice,
+        issued_within_days=365,
+    )
+    seed_s = time.perf_counter() - start
+
+    factory = make_session_factory(engine)
+    statuses = [InvoiceStatus.issued, InvoiceStatus.paid]
+    latencies = []
+    for _ in range(args.repeat):
+        with factory() as db:
+            start = time.perf_counter()
+            report = ReportService(db).aging_report(statuses=statuses)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    p95 = percentile(latencies, 95)
+    print(json.dumps({
+        "line_items": (
+            args.customers * args.invoices_per_customer
+            * args.items_per_invoice
+        ),
+        "invoices": args.customers * args.invoices_per_customer,
+        "report_rows": len(report.customers),
+        "seed_seconds": round(seed_s, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(p95, 1),
+        "budget_ms": args.budget_ms,
+        "within_budget": p95 <= args.budget_ms,
+    }, indent=2))
+    if p95 > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
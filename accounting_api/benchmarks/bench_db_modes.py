@@ -0,0 +1,96 @@
+"""
+Throughput of the sync (threadpool) and async database paths.
+
+Both variants serve the same read mix from the same SQLite file: the sync
+routers with `get_db`, and the async routers with `get_async_db`.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_db_modes --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Any, AsyncGenerator
+
+import httpx
+from fastapi import FastAPI
+
+from accounting_api.app.api.routes import customers_async, invoices_async
+from accounting_api.app.core.db_adapter import get_async_db
+from accounting_api.app.core.db_infrastructure import (
+    make_async_engine,
+    make_async_session_factory,
+    make_engine,
+)
+from accounting_api.benchmarks._common import (
+    build_sync_app,
+    drive,
+    seed_dataset,
+    summarize,
+    temp_sqlite_url,
+)
+
+
+def build_async_app(url: str) -> FastAPI:
+    factory = make_async_session_factory(make_async_engine(url))
+
+    async def override_get_async_db() -> AsyncGenerator[Any, None]:
+        async with factory() as db:
+            yield db
+            await db.commit()
+
+    app = FastAPI()
+    app.include_router(customers_async.router)
+    app.include_router(invoices_async.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def run_mode(
+        app: FastAPI,
+        paths: list[str],
+        concurrency: int,
+        requests: int
+        ) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+            ) as client:
+        # Warm up connections and code paths before measuring
+        await drive(client, paths, concurrency=concurrency, requests=50)
+        latencies, elapsed = await drive(
+            client, paths, concurrency=concurrency, requests=requests
+        )
+    return summarize(latencies, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="sync vs async DB path")
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    url = temp_sqlite_url()
+    seed_dataset(
+        make_engine(url),
+        customers=args.customers,
+        invoices_per_customer=2,
+        items_per_invoice=5,
+    )
+    paths = []
+    for i in range(1, args.customers + 1):
+        paths += [f"/customers/{i}", f"/invoices/{i}", "/customers/?limit=50"]
+
+    results = {}
+    for mode, build in (("sync", build_sync_app), ("async", build_async_app)):
+        results[mode] = asyncio.run(
+            run_mode(build(url), paths, args.concurrency, args.requests)
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Read latency of GET /customers/{id} and GET /invoices/{id} with and
+without the entity cache.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_entity_cache --requests 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from accounting_api.app.core.cache import LRUCache, NullCache, set_cache
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.benchmarks._common import (
+    build_sync_app,
+    drive,
+    seed_dataset,
+    summarize,
+    temp_sqlite_url,
+)
+
+
+async def run(url: str, paths: list[str], args: argparse.Namespace) -> dict:
+    transport = httpx.ASGITransport(app=build_sync_app(url))
+    async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+            ) as client:
+        # Warm-up also fills the cache with every id
+        await drive(
+            client, paths, concurrency=args.concurrency, requests=len(paths)
+        )
+        latencies, elapsed = await drive(
+            client, paths, concurrency=args.concurrency,
+            requests=args.requests,
+        )
+    return summarize(latencies, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="entity cache on/off")
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    url = temp_sqlite_url()
+    seed_dataset(
+        make_engine(url),
+        customers=args.customers,
+        invoices_per_customer=1,
+        items_per_invoice=args.items,
+    )
+    paths = []
+    for i in range(1, args.customers + 1):
+        paths += [f"/customers/{i}", f"/invoices/{i}"]
+
+    results = {}
+    for name, cache in (("no_cache", NullCache()), ("lru", LRUCache())):
+        set_cache(cache)
+        results[name] = asyncio.run(run(url, paths, args))
+        if isinstance(cache, LRUCache):
+            results[name]["hits"] = cache.hits
+            results[name]["misses"] = cache.misses
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-item vs batch line item ingestion.
+
+Adds the same line items to fresh invoices once through
+`POST /invoices/{id}/items` (one request and flush per item) and once
+through `POST /invoices/{id}/items/batch` (one request, one INSERT).
+
+Run with:
+    python -m accounting_api.benchmarks.bench_line_items --items 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.benchmarks._common import (
+    build_sync_app,
+    seed_dataset,
+    temp_sqlite_url,
+)
+
+
+async def ingest(
+        client: httpx.AsyncClient,
+        invoice_id: int,
+        items: list[dict],
+        batch: bool
+        ) -> None:
+    if batch:
+        response = await client.post(
+            f"/invoices/{invoice_id}/items/batch", json=items
+        )
+        response.raise_for_status()
+        return
+    for item in items:
+        response = await client.post(
+            f"/invoices/{invoice_id}/items", json=item
+        )
+        response.raise_for_status()
+
+
+async def run(url: str, invoices: int, items: list[dict]) -> dict:
+    transport = httpx.ASGITransport(app=build_sync_app(url))
+    results = {}
+    async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"X-API-Key": settings.api_key},
+            ) as client:
+        # Invoices 1..n take the per-item path, n+1..2n the batch path
+        for label, first_id, batch in (
+                ("per_item", 1, False),
+                ("batch", invoices + 1, True),
+                ):
+            start = time.perf_counter()
+            for invoice_id in range(first_id, first_id + invoices):
+                await ingest(client, invoice_id, items, batch)
+            elapsed = time.perf_counter() - start
+            results[label] = {
+                "seconds": round(elapsed, 3),
+                "items_per_second": round(invoices * len(items) / elapsed),
+            }
+    results["speedup"] = round(
+        results["per_item"]["seconds"] / results["batch"]["seconds"], 1
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="per-item vs batch")
+    parser.add_argument("--invoices", type=int, default=5)
+    parser.add_argument("--items", type=int, default=200)
+    args = parser.parse_args()
+
+    url = temp_sqlite_url()
+    seed_dataset(
+        make_engine(url),
+        customers=1,
+        invoices_per_customer=2 * args.invoices,
+        items_per_invoice=0,
+    )
+    items = [
+        {"description": f"Item {n}", "quantity": 1 + n % 5, "unit_price": 9.5}
+        for n in range(args.items)
+    ]
+    print(json.dumps(asyncio.run(run(url, args.invoices, items)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
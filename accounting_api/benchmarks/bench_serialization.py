@@ -0,0 +1,134 @@
+"""
+Serialization cost of `InvoiceRead` responses, per 1,000 invoices.
+
+Times FastAPI's own response handling (validation against
+`response_model`, then its JSON encoding: pydantic-core `dump_json` on
+recent FastAPI releases, `json.dumps` on older ones) against the
+`fast_json` path (`typed_json` with a prebuilt `TypeAdapter`, and
+`FastJSONResponse` for content FastAPI has already turned into Python
+data). Inputs are ORM invoices as a route would load them, and prebuilt
+read models as the entity cache returns them.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_serialization --invoices 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import TypeAdapter
+
+from accounting_api.app.api.serialization import (
+    FastJSONResponse,
+    orjson,
+    typed_json,
+)
+from accounting_api.app.core.config import settings
+from accounting_api.app.models.schemas.invoice import InvoiceRead
+from accounting_api.app.models.sqlalchemy_models import (
+    Invoice,
+    InvoiceStatus,
+    LineItem,
+)
+
+INVOICE_LIST_ADAPTER = TypeAdapter(list[InvoiceRead])
+
+
+def make_invoices(count: int, items: int) -> list[Invoice]:
+    return [
+        Invoice(
+            id=n,
+            customer_id=1,
+            status=InvoiceStatus.issued,
+            issued_at=datetime(2024, 1, 1),
+            version=1,
+            currency="EUR",
+            total_cents=1000 * items,
+            line_item_count=items,
+            line_items=[
+                LineItem(
+                    id=n * items + i,
+                    description=f"Item {i}",
+                    quantity=2,
+                    unit_price_cents=500,
+                )
+                for i in range(items)
+            ],
+        )
+        for n in range(count)
+    ]
+
+
+def response_field() -> Any:
+    app = FastAPI()
+    app.get("/", response_model=list[InvoiceRead])(lambda: None)
+    route = app.routes[-1]
+    assert isinstance(route, APIRoute)
+    return route.response_field
+
+
+def time_ms(fn: Callable[[], Any], repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="response serialization")
+    parser.add_argument("--invoices", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    field = response_field()
+    orm = make_invoices(args.invoices, args.items)
+    models = INVOICE_LIST_ADAPTER.validate_python(orm, from_attributes=True)
+
+    def fastapi_path(value: Any, dump_json: bool) -> bytes:
+        content = asyncio.run(serialize_response(
+            field=field, response_content=value, dump_json=dump_json
+        ))
+        return content if dump_json else JSONResponse(content).body
+
+    def orjson_path(value: Any) -> bytes:
+        content = asyncio.run(serialize_response(
+            field=field, response_content=value
+        ))
+        return FastJSONResponse(content).body
+
+    def fast_path(value: Any) -> bytes:
+        return typed_json(INVOICE_LIST_ADAPTER, value).body
+
+    settings.fast_json = True
+    per_1k = 1000 / args.invoices
+    results = {}
+    for source, value in (("orm", orm), ("models", models)):
+        timings = {
+            "fastapi_json_dumps": lambda: fastapi_path(value, False),
+            "fastapi_dump_json": lambda: fastapi_path(value, True),
+            "fast_json_response": lambda: orjson_path(value),
+            "typed_json": lambda: fast_path(value),
+        }
+        results[source] = {
+            name: round(time_ms(fn, args.repeat) * per_1k, 2)
+            for name, fn in timings.items()
+        }
+    print(json.dumps({
+        "ms_per_1k_invoices": results,
+        "items_per_invoice": args.items,
+        "orjson": orjson is not None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Mixed read/write throughput of the SQLite profiles.
+
+Each profile gets its own freshly seeded SQLite file. Reader threads load
+random invoices with their line items while writer threads add line items
+and commit, for a fixed duration. In the default (rollback journal) mode a
+commit has to wait for every open reader, so writer latency and "database
+is locked" errors grow with the reader count; WAL lets both proceed.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_sqlite_profile --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from accounting_api.app.core.db_infrastructure import (
+    SQLITE_PROFILES,
+    make_engine,
+    make_session_factory,
+)
+from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.benchmarks._common import (
+    seed_dataset,
+    summarize,
+    temp_sqlite_url,
+)
+
+
+def read_invoice(db: Session, rng: random.Random, invoices: int) -> None:
+    invoice = InvoiceRepository(db).get(rng.randint(1, invoices))
+    assert invoice is not None
+    # Touch the collection so the whole read is measured
+    len(invoice.line_items)
+    db.rollback()
+
+
+def write_line_item(db: Session, rng: random.Random, invoices: int) -> None:
+    InvoiceRepository(db).add_line_item(
+        invoice_id=rng.randint(1, invoices),
+        description="bench",
+        quantity=rng.randint(1, 5),
+        unit_price_cents=rng.randint(100, 10_000),
+    )
+    db.commit()
+
+
+def run_workers(
+    factory: sessionmaker[Session],
+    operation: Callable[[Session, random.Random, int], None],
+    *,
+    threads: int,
+    invoices: int,
+    deadline: float,
+) -> tuple[list[float], int]:
+    """Run `operation` in a loop from `threads` threads until `deadline`."""
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(seed: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed)
+        with factory() as db:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    operation(db, rng, invoices)
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        errors += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+    pool = [
+        threading.Thread(target=worker, args=(seed,))
+        for seed in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies, errors
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> dict:
+    engine = make_engine(
+        temp_sqlite_url(f"{profile}.db"), sqlite_profile=profile
+    )
+    invoices = args.customers * 4
+    seed_dataset(
+        engine,
+        customers=args.customers,
+        invoices_per_customer=4,
+        items_per_invoice=5,
+    )
+    factory = make_session_factory(engine)
+
+    results: dict[str, dict] = {}
+    deadline = time.perf_counter() + args.seconds
+
+    def measure(
+            name: str,
+            operation: Callable[[Session, random.Random, int], None],
+            threads: int
+            ) -> None:
+        latencies, errors = run_workers(
+            factory,
+            operation,
+            threads=threads,
+            invoices=invoices,
+            deadline=deadline,
+        )
+        results[name] = {
+            **summarize(latencies, args.seconds),
+            "errors": errors,
+        }
+
+    runners = [
+        threading.Thread(
+            target=measure, args=("reads", read_invoice, args.readers)
+        ),
+        threading.Thread(
+            target=measure, args=("writes", write_line_item, args.writers)
+        ),
+    ]
+    for runner in runners:
+        runner.start()
+    for runner in runners:
+        runner.join()
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite profiles, mixed load")
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    results = {
+        profile: run_profile(profile, args) for profile in SQLITE_PROFILES
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
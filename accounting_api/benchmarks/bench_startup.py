@@ -0,0 +1,107 @@
+"""
+Startup cost of a new worker: importing the app, running its startup
+(schema check, job workers) and serving the first request.
+
+Each measurement runs in a fresh interpreter, so module imports are not
+already cached. The same SQLite file is started twice: `cold` creates
+the schema, `warm` finds it at the current version and only reads
+`schema_version`. Exits non-zero when the warm total exceeds the budget.
+
+Run with:
+    python -m accounting_api.benchmarks.bench_startup --budget-ms 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from accounting_api.benchmarks._common import temp_sqlite_url
+
+# Runs in the child interpreter; prints one JSON object
+_CHILD = """
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+from accounting_api.app import main
+imported = time.perf_counter()
+
+import httpx
+import accounting_api.app.core.db_adapter as db_adapter
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.migrations import schema_version
+
+engine_built_at_import = db_adapter.engine is not None
+
+
+async def first_request():
+    begin = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+                ) as client:
+            response = await client.get("/customers/")
+            response.raise_for_status()
+        served = time.perf_counter()
+    return begin, started, served
+
+
+# Untimed, on its own engine: which path startup is about to take
+probe = make_engine(settings.database_url)
+version = schema_version(probe)
+probe.dispose()
+
+begin, started, served = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": round((imported - start) * 1000, 1),
+    "startup_ms": round((started - begin) * 1000, 1),
+    "first_request_ms": round((served - started) * 1000, 1),
+    "total_ms": round((served - start) * 1000, 1),
+    "schema_version_before": version,
+    "engine_built_at_import": engine_built_at_import,
+}))
+"""
+
+
+def measure(url: str) -> dict:
+    """Start the app once in a new interpreter against `url`."""
+    root = Path(__file__).resolve().parents[2]
+    env = {**os.environ, "database_url": url, "PYTHONPATH": str(root)}
+    env.pop("database_replica_url", None)
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        env=env, cwd=root, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="app startup latency")
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    args = parser.parse_args(argv)
+
+    url = temp_sqlite_url()
+    results = {"cold": measure(url), "warm": measure(url)}
+    warm = results["warm"]["total_ms"]
+    results["budget_ms"] = args.budget_ms
+    results["within_budget"] = warm <= args.budget_ms
+    print(json.dumps(results, indent=2))
+    if warm > args.budget_ms:
+        print(
+            f"warm start {warm:.1f} ms exceeds budget "
+            f"{args.budget_ms:.1f} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""
+In-process load test across the customer and invoice routes.
+
+Seeds a dataset of configurable size, drives the ASGI app through
+`httpx.ASGITransport` from concurrent asyncio clients with a weighted mix
+of reads and writes, and writes a JSON artifact with throughput, latency
+percentiles, SQL statements per request and peak memory, overall and per
+route template. Artifacts from two commits can be compared:
+
+    python -m accounting_api.benchmarks.load_test --output before.json
+    # ... change something ...
+    python -m accounting_api.benchmarks.load_test --output after.json \\
+        --compare before.json
+
+With `--compare`, the exit status is non-zero when p95 latency or
+statements per request regress by more than `--max-regression`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from accounting_api.app.core.cache import NullCache, set_cache
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.instrumentation import (
+    RequestStats,
+    bind_request_stats,
+    reset_request_stats,
+)
+from accounting_api.benchmarks._common import (
+    build_sync_app,
+    seed_dataset,
+    summarize,
+    temp_sqlite_url,
+)
+
+# Relative weights of the request mix
+DEFAULT_MIX = {
+    "get_customer": 30,
+    "list_customers": 10,
+    "list_customer_invoices": 20,
+    "get_invoice": 30,
+    "add_line_item": 10,
+}
+# Metrics where a larger value is worse, checked by `--compare`
+REGRESSION_METRICS = ("p95_ms", "queries_per_request")
+
+
+@dataclass
+class Sample:
+    route: str
+    latency_ms: float
+    statements: int
+    status: int
+
+
+class StatementCounter:
+    """
+    ASGI wrapper attributing SQL statements to each request, the same way
+    `RequestContextMiddleware` does, and remembering them by route
+    template for the report.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.by_request: dict[str, tuple[str, int]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        stats = RequestStats()
+        token = bind_request_stats(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_stats(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            request_id = dict(scope["headers"]).get(b"x-load-id", b"")
+            self.by_request[request_id.decode()] = (
+                route, stats.db_statements
+            )
+
+
+def build_requests(
+        args: argparse.Namespace,
+        rng: random.Random
+        ) -> list[tuple[str, str, Optional[dict]]]:
+    """`args.requests` (method, path, body) tuples drawn from the mix."""
+    customers = args.customers
+    invoices = customers * args.invoices_per_customer
+    kinds = list(DEFAULT_MIX)
+    weights = [DEFAULT_MIX[k] for k in kinds]
+    plan = []
+    for kind in rng.choices(kinds, weights, k=args.requests):
+        customer_id = rng.randint(1, customers)
+        invoice_id = rng.randint(1, invoices)
+        if kind == "get_customer":
+            plan.append(("GET", f"/customers/{customer_id}", None))
+        elif kind == "list_customers":
+            after = rng.randint(0, max(customers - 50, 0))
+            plan.append(("GET", f"/customers/?limit=50&after={after}", None))
+        elif kind == "list_customer_invoices":
+            plan.append(
+                ("GET", f"/customers/{customer_id}/invoices?limit=50", None)
+            )
+        elif kind == "get_invoice":
+            plan.append(("GET", f"/invoices/{invoice_id}", None))
+        else:
+            body = {"description": "load", "quantity": 1, "unit_price": 9.5}
+            plan.append(("POST", f"/invoices/{invoice_id}/items", body))
+    return plan
+
+
+async def drive(
+        client: httpx.AsyncClient,
+        plan: list[tuple[str, str, Optional[dict]]],
+        concurrency: int
+        ) -> tuple[list[tuple[str, float, int]], float]:
+    """
+    Run `plan` from `concurrency` clients. Returns (request id, latency
+    in ms, status) per request and the wall-clock duration in seconds.
+    """
+    results: list[tuple[str, float, int]] = []
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < len(plan):
+            index = next_index
+            next_index += 1
+            method, path, body = plan[index]
+            request_id = str(index)
+            start = time.perf_counter()
+            response = await client.request(
+                method, path, json=body, headers={"X-Load-Id": request_id}
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            results.append((request_id, elapsed, response.status_code))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def report(samples: list[Sample], elapsed_s: float) -> dict[str, Any]:
+    def describe(group: list[Sample], seconds: float) -> dict[str, Any]:
+        summary = summarize([s.latency_ms for s in group], seconds)
+        summary["queries_per_request"] = round(
+            sum(s.statements for s in group) / len(group), 2
+        )
+        summary["errors"] = sum(s.status >= 400 for s in group)
+        return summary
+
+    by_route: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+    return {
+        "overall": describe(samples, elapsed_s),
+        # Per-route rps is that route's share of the overall throughput
+        "routes": {
+            route: describe(group, elapsed_s)
+            for route, group in sorted(by_route.items())
+        },
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def run(args: argparse.Namespace, url: str) -> dict[str, Any]:
+    counter = StatementCounter(build_sync_app(url))
+    transport = httpx.ASGITransport(app=counter)
+    rng = random.Random(args.seed)
+    async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://load",
+            headers={"X-API-Key": settings.api_key},
+            ) as client:
+        warmup = argparse.Namespace(**{**vars(args), "requests": 100})
+        await drive(client, build_requests(warmup, rng), args.concurrency)
+
+        plan = build_requests(args, rng)
+        counter.by_request.clear()
+        if args.trace_memory:
+            tracemalloc.start()
+        results, elapsed = await drive(client, plan, args.concurrency)
+        traced_peak = None
+        if args.trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    samples = []
+    for request_id, latency, status in results:
+        route, statements = counter.by_request[request_id]
+        samples.append(Sample(route, latency, statements, status))
+    result = report(samples, elapsed)
+    result["memory"] = {
+        "peak_rss_mb": _peak_rss_mb(),
+        "traced_peak_mb": (
+            round(traced_peak / 2**20, 1) if traced_peak is not None else None
+        ),
+    }
+    return result
+
+
+def compare(
+        current: dict[str, Any],
+        baseline: dict[str, Any],
+        max_regression: float
+        ) -> tuple[dict[str, Any], list[str]]:
+    """
+    Relative change of every numeric metric against `baseline`, and the
+    list of regressions beyond `max_regression` (a fraction).
+    """
+    def delta(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old, 3) if old else None
+
+    changes: dict[str, Any] = {}
+    regressions = []
+    sections = {"overall": current["overall"], **current["routes"]}
+    old_sections = {"overall": baseline["overall"], **baseline["routes"]}
+    for name, metrics in sections.items():
+        old = old_sections.get(name)
+        if old is None:
+            continue
+        changes[name] = {
+            key: delta(value, old[key])
+            for key, value in metrics.items()
+            if isinstance(value, (int, float)) and key in old
+            and key != "requests"
+        }
+        for key in REGRESSION_METRICS:
+            change = changes[name].get(key)
+            if change is not None and change > max_regression:
+                regressions.append(f"{name} {key} +{change:.0%}")
+    return changes, regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="in-process load test")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--invoices-per-customer", type=int, default=5)
+    parser.add_argument("--items-per-invoice", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="also report the tracemalloc peak (slows requests down)",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.no_cache:
+        set_cache(NullCache())
+
+    url = temp_sqlite_url()
+    seed_dataset(
+        make_engine(url),
+        customers=args.customers,
+        invoices_per_customer=args.invoices_per_customer,
+        items_per_invoice=args.items_per_invoice,
+        seed=args.seed,
+    )
+    artifact = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "params": {
+                k: str(v) if isinstance(v, Path) else v
+                for k, v in vars(args).items()
+            },
+        },
+        **asyncio.run(run(args, url)),
+    }
+
+    status = 0
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        changes, regressions = compare(
+            artifact, baseline, args.max_regression
+        )
+        artifact["comparison"] = {
+            "baseline_commit": baseline["meta"].get("commit"),
+            "changes": changes,
+            "regressions": regressions,
+        }
+        status = 1 if regressions else 0
+
+    text = json.dumps(artifact, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
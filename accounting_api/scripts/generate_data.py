@@ -0,0 +1,384 @@
+"""
+Synthetic data generator for load and query-plan testing.
+
+Builds customers, invoices and line items at volume (millions of rows)
+with Core bulk inserts in large transactions, bypassing the ORM. Invoice
+aggregates (`total_cents`, `line_item_count`) and `version` are written
+alongside, so the data is indistinguishable from rows written through
+the repositories.
+
+Output is a pure function of the parameters and `--seed`: every customer
+draws from its own RNG, so the same rows come out however the work is
+split. Customers are split into partitions with precomputed, disjoint id
+ranges, which `--workers` processes generate and insert in parallel.
+(SQLite still serializes the inserts; workers wait for the write lock.)
+
+For a handful of demo rows written through the repositories, see
+`seed_demo_data.py`.
+
+Run with:
+    python -m accounting_api.scripts.generate_data --customers 100000 \\
+        --invoices-mean 10 --items 5-15 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.migrations import upgrade_schema
+from accounting_api.app.models.sqlalchemy_models import (
+    Customer,
+    Invoice,
+    InvoiceStatus,
+    LineItem,
+)
+
+DISTRIBUTIONS = ("fixed", "uniform", "geometric")
+DESCRIPTIONS = (
+    "Consulting services", "Support services", "Software license",
+    "Hosting", "Training", "Hardware", "Maintenance", "Travel expenses",
+)
+# SQLite: how long a worker waits for another worker's write transaction
+SQLITE_LOCK_TIMEOUT_S = 600
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    customers: int = 1000
+    # Invoices per customer: `fixed` (always the mean), `uniform`
+    # (0..2*mean) or `geometric` (long tail: most customers have a few,
+    # some have many)
+    invoices_mean: float = 10.0
+    invoices_distribution: str = "geometric"
+    items_min: int = 1
+    items_max: int = 10
+    status_mix: tuple[tuple[InvoiceStatus, float], ...] = (
+        (InvoiceStatus.draft, 0.1),
+        (InvoiceStatus.issued, 0.5),
+        (InvoiceStatus.paid, 0.4),
+    )
+    # Issued and paid invoices are dated uniformly over this many days
+    # before `now`; drafts have no issue date
+    days: int = 365
+    now: datetime = datetime(2025, 1, 1)
+    seed: int = 42
+    # Line items per transaction
+    chunk_items: int = 100_000
+
+    def __post_init__(self) -> None:
+        if self.invoices_distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution {self.invoices_distribution!r}"
+            )
+        if not 1 <= self.items_min <= self.items_max:
+            raise ValueError("Need 1 <= items_min <= items_max")
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A contiguous range of customers and the ids reserved for them."""
+
+    first_customer_id: int
+    customers: int
+    first_invoice_id: int
+    first_item_id: int
+    invoices: int
+    items: int
+
+
+def _invoice_count(config: GeneratorConfig, rng: random.Random) -> int:
+    mean = config.invoices_mean
+    if config.invoices_distribution == "fixed":
+        return round(mean)
+    if config.invoices_distribution == "uniform":
+        return rng.randint(0, round(2 * mean))
+    # Geometric on 0, 1, 2, ... with the requested mean
+    p = 1 / (1 + mean)
+    count = 0
+    while rng.random() > p:
+        count += 1
+    return count
+
+
+def _customer_plan(
+        config: GeneratorConfig,
+        customer_id: int
+        ) -> tuple[random.Random, list[int]]:
+    """
+    The customer's own RNG and the line item count of each of its
+    invoices. Counts are drawn first, so the partition planner and the
+    workers agree on them without generating anything else.
+    """
+    rng = random.Random(config.seed * 1_000_003 + customer_id)
+    invoices = _invoice_count(config, rng)
+    items = [
+        rng.randint(config.items_min, config.items_max)
+        for _ in range(invoices)
+    ]
+    return rng, items
+
+
+def plan_partitions(
+        config: GeneratorConfig,
+        partition_size: int,
+        first_ids: tuple[int, int, int] = (1, 1, 1)
+        ) -> list[Partition]:
+    """
+    Split the customers into partitions of `partition_size` and reserve
+    contiguous invoice and line item id ranges for each, starting at
+    `first_ids` (customer, invoice, line item).
+    """
+    customer_id, invoice_id, item_id = first_ids
+    partitions = []
+    remaining = config.customers
+    while remaining > 0:
+        size = min(partition_size, remaining)
+        invoices = items = 0
+        for offset in range(size):
+            _, counts = _customer_plan(config, customer_id + offset)
+            invoices += len(counts)
+            items += sum(counts)
+        partitions.append(Partition(
+            customer_id, size, invoice_id, item_id, invoices, items
+        ))
+        customer_id += size
+        invoice_id += invoices
+        item_id += items
+        remaining -= size
+    return partitions
+
+
+def _customer_rows(
+        config: GeneratorConfig,
+        partition: Partition
+        ) -> Iterator[tuple[dict, list[dict], list[dict]]]:
+    """Customer, invoice and line item rows, one customer at a time."""
+    statuses = [status for status, _ in config.status_mix]
+    weights = [weight for _, weight in config.status_mix]
+    invoice_id = partition.first_invoice_id
+    item_id = partition.first_item_id
+    for customer_id in range(
+            partition.first_customer_id,
+            partition.first_customer_id + partition.customers
+            ):
+        rng, item_counts = _customer_plan(config, customer_id)
+        customer = {
+            "id": customer_id,
+            "name": f"Customer {customer_id}",
+            "email": f"customer{customer_id}@example.com",
+        }
+        invoices, items = [], []
+        for count in item_counts:
+            total = 0
+            for _ in range(count):
+                quantity = rng.randint(1, 20)
+                # Skewed prices: mostly small, occasionally large
+                price = min(rng.lognormvariate(3.5, 1.0), 9999)
+                unit_price_cents = round(price * 100)
+                total += quantity * unit_price_cents
+                items.append({
+                    "id": item_id,
+                    "invoice_id": invoice_id,
+                    "description": rng.choice(DESCRIPTIONS),
+                    "quantity": quantity,
+                    "unit_price_cents": unit_price_cents,
+                })
+                item_id += 1
+            status = rng.choices(statuses, weights)[0]
+            issued_at = None
+            if status != InvoiceStatus.draft:
+                age = timedelta(days=rng.uniform(0, config.days))
+                issued_at = config.now - age
+            invoices.append({
+                "id": invoice_id,
+                "customer_id": customer_id,
+                "status": status,
+                "issued_at": issued_at,
+                "total_cents": total,
+                "line_item_count": count,
+                "version": 1,
+            })
+            invoice_id += 1
+        yield customer, invoices, items
+
+
+def _flush(
+        conn: Connection,
+        customers: list[dict],
+        invoices: list[dict],
+        items: list[dict]
+        ) -> None:
+    # Parents first: foreign keys are enforced
+    for table, rows in (
+            (Customer, customers), (Invoice, invoices), (LineItem, items)
+            ):
+        if rows:
+            conn.execute(insert(table), rows)
+        rows.clear()
+
+
+def _make_engine(url: str) -> Engine:
+    connect_args = (
+        {"timeout": SQLITE_LOCK_TIMEOUT_S} if url.startswith("sqlite") else {}
+    )
+    return make_engine(url, connect_args=connect_args)
+
+
+def write_partition(
+        url: str,
+        config: GeneratorConfig,
+        partition: Partition
+        ) -> Partition:
+    """Generate and insert one partition, `chunk_items` per transaction."""
+    engine = _make_engine(url)
+    customers: list[dict] = []
+    invoices: list[dict] = []
+    items: list[dict] = []
+    try:
+        rows = _customer_rows(config, partition)
+        for customer, customer_invoices, customer_items in rows:
+            customers.append(customer)
+            invoices.extend(customer_invoices)
+            items.extend(customer_items)
+            if len(items) >= config.chunk_items:
+                with engine.begin() as conn:
+                    _flush(conn, customers, invoices, items)
+        with engine.begin() as conn:
+            _flush(conn, customers, invoices, items)
+    finally:
+        engine.dispose()
+    return partition
+
+
+def _next_ids(engine: Engine) -> tuple[int, int, int]:
+    with engine.connect() as conn:
+        return tuple(  # type: ignore[return-value]
+            (conn.scalar(select(func.max(table.id))) or 0) + 1
+            for table in (Customer, Invoice, LineItem)
+        )
+
+
+def generate(
+        url: str,
+        config: GeneratorConfig,
+        workers: int = 1,
+        partition_size: int = 10_000
+        ) -> dict[str, Any]:
+    """
+    Create or upgrade the schema if needed and append the generated
+    dataset after any existing rows. Returns row counts and the elapsed
+    time.
+    """
+    start = time.perf_counter()
+    engine = _make_engine(url)
+    try:
+        upgrade_schema(engine)
+        partitions = plan_partitions(
+            config, partition_size, _next_ids(engine)
+        )
+    finally:
+        engine.dispose()
+
+    if workers <= 1:
+        for partition in partitions:
+            write_partition(url, config, partition)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                write_partition,
+                [url] * len(partitions),
+                [config] * len(partitions),
+                partitions,
+            ))
+
+    return {
+        "customers": config.customers,
+        "invoices": sum(p.invoices for p in partitions),
+        "line_items": sum(p.items for p in partitions),
+        "partitions": len(partitions),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+
+
+def _parse_status_mix(
+        text: str
+        ) -> tuple[tuple[InvoiceStatus, float], ...]:
+    # "draft=0.1,issued=0.5,paid=0.4"
+    pairs = (part.split("=") for part in text.split(","))
+    return tuple((InvoiceStatus(name), float(w)) for name, w in pairs)
+
+
+def _parse_range(text: str) -> tuple[int, int]:
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="synthetic data generator")
+    parser.add_argument("--url", default=settings.database_url)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--invoices-mean", type=float, default=10.0)
+    parser.add_argument(
+        "--invoices-distribution", choices=DISTRIBUTIONS, default="geometric"
+    )
+    parser.add_argument(
+        "--items", type=_parse_range, default=(1, 10),
+        help="line items per invoice, e.g. 5-15",
+    )
+    parser.add_argument(
+        "--status-mix", type=_parse_status_mix,
+        default="draft=0.1,issued=0.5,paid=0.4",
+    )
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument(
+        "--now", type=datetime.fromisoformat, default=None,
+        help="end of the issue date spread (naive UTC); defaults to now",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-items", type=int, default=100_000)
+    parser.add_argument("--partition-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    config = GeneratorConfig(
+        customers=args.customers,
+        invoices_mean=args.invoices_mean,
+        invoices_distribution=args.invoices_distribution,
+        items_min=args.items[0],
+        items_max=args.items[1],
+        status_mix=args.status_mix,
+        days=args.days,
+        now=args.now or datetime.now(timezone.utc).replace(tzinfo=None),
+        seed=args.seed,
+        chunk_items=args.chunk_items,
+    )
+    result = generate(
+        args.url,
+        config,
+        workers=args.workers,
+        partition_size=args.partition_size,
+    )
+    print(
+        f"Generated {result['customers']} customers, "
+        f"{result['invoices']} invoices and {result['line_items']} line "
+        f"items in {result['seconds']} s "
+        f"({result['partitions']} partitions, {result['workers']} workers)."
+    )
+
+
+if __name__ == "__main__":
+    main()
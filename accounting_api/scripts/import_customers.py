@@ -0,0 +1,57 @@
+"""
+Bulk import customers from an NDJSON or CSV file.
+
+The file is streamed line by line, validated row by row and inserted in
+committed chunks, so arbitrarily large files run in constant memory.
+
+Run with:
+    python -m accounting_api.scripts.import_customers customers.ndjson
+    python -m accounting_api.scripts.import_customers customers.csv \\
+        --chunk-size 5000
+    cat customers.ndjson | python -m accounting_api.scripts.import_customers -
+"""
+
+import argparse
+import sys
+
+from accounting_api.app.core.db_adapter import get_session_factory
+from accounting_api.app.services.customer_import import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    import_customers,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("path", help="input file, or - for stdin")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="input format (default: from the file extension, else ndjson)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE
+    )
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.path.lower().endswith(".csv") else "ndjson"
+
+    # The importer commits each chunk itself, so a plain session is used
+    # instead of `session_scope`.
+    with get_session_factory()() as db:
+        if args.path == "-":
+            report = import_customers(db, sys.stdin, fmt, args.chunk_size)
+        else:
+            with open(args.path, encoding="utf-8", newline="") as lines:
+                report = import_customers(db, lines, fmt, args.chunk_size)
+
+    print(report.model_dump_json(indent=2))
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Verify or rebuild the stored invoice aggregates.
+
+`invoice.total_cents` and `invoice.line_item_count` are maintained
+incrementally by `InvoiceRepository`. Rows written outside the repository
+(manual SQL, restores, older versions of the application) can drift from
+their line items; this script reports and repairs such drift.
+
+Run with:
+    python -m accounting_api.scripts.rebuild_invoice_totals --check
+    python -m accounting_api.scripts.rebuild_invoice_totals
+    python -m accounting_api.scripts.rebuild_invoice_totals --all
+"""
+
+import argparse
+import sys
+
+from accounting_api.app.core.db_adapter import get_session_factory
+from accounting_api.app.core.db_infrastructure import session_scope
+from accounting_api.app.repositories.invoice import InvoiceRepository
+
+
+def rebuild_invoice_totals(check_only: bool, rebuild_all: bool) -> int:
+    """
+    Report drifted invoices and, unless `check_only`, rebuild them.
+    Returns the number of drifted invoices found.
+    """
+    with session_scope(get_session_factory()) as db:
+        repo = InvoiceRepository(db)
+        drift = repo.find_total_drift()
+        for row in drift:
+            print(
+                f"invoice {row.id}: stored total_cents={row.total_cents} "
+                f"count={row.line_item_count}, actual "
+                f"total_cents={row.actual_total_cents} "
+                f"count={row.actual_count}"
+            )
+
+        if check_only:
+            return len(drift)
+
+        if rebuild_all:
+            updated = repo.rebuild_totals()
+        else:
+            updated = repo.rebuild_totals([row.id for row in drift])
+        print(f"Rebuilt totals for {updated} invoice(s).")
+        return len(drift)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report drift; exit with status 1 if any is found",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="recompute every invoice, not only the drifted ones",
+    )
+    args = parser.parse_args()
+
+    drifted = rebuild_invoice_totals(check_only=args.check,
+                                     rebuild_all=args.all)
+    if args.check:
+        print(f"{drifted} invoice(s) with drifted totals.")
+        if drifted:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,20 @@ One-off data seeding script.
 
 This script demonstrates the intended usage of `session_scope`,
 which provides explicit transaction control outside the HTTP
-request lifecycle.
+request lifecycle. For realistic volumes use `generate_data.py`.
 
 Run with:
     python -m accounting_api.scripts.seed_demo_data
 """
 
-from accounting_api.app.core.db_adapter import SessionLocal
+from accounting_api.app.core.db_adapter import get_session_factory
 from accounting_api.app.core.db_infrastructure import session_scope
 from accounting_api.app.models.sqlalchemy_models import (
     Customer,
     Invoice,
-    LineItem
 )
 from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.repositories.invoice import InvoiceRepository
 
 
 def seed_demo_data() -> None:
@@ -29,7 +29,7 @@ def seed_demo_data() -> None:
     - There is no request lifecycle
     - We want explicit, script-level transaction control
     """
-    with session_scope(SessionLocal) as db:
+    with session_scope(get_session_factory()) as db:
         customer = Customer(
             name="Demo Customer",
             email="demo@example.com",
@@ -44,22 +44,21 @@ def seed_demo_data() -> None:
         db.add(invoice)
         db.flush()
 
-        items = [
-            LineItem(
-                invoice_id=invoice.id,
-                description="Consulting services",
-                quantity=10,
-                unit_price=150.00,
-            ),
-            LineItem(
-                invoice_id=invoice.id,
-                description="Support services",
-                quantity=5,
-                unit_price=80.00,
-            ),
-        ]
-
-        db.add_all(items)
+        # Line items go through the repository so the invoice's stored
+        # total and line item count are kept in sync.
+        invoices = InvoiceRepository(db)
+        invoices.add_line_item(
+            invoice_id=invoice.id,
+            description="Consulting services",
+            quantity=10,
+            unit_price_cents=15000,
+        )
+        invoices.add_line_item(
+            invoice_id=invoice.id,
+            description="Support services",
+            quantity=5,
+            unit_price_cents=8000,
+        )
 
         # No explicit commit needed here:
         # `session_scope` will commit if no exception is raised.
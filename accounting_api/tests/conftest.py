@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Generator
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Generator, Iterator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import event
 from sqlalchemy.orm import Session
-from sqlalchemy.engine.base import Transaction
 from sqlalchemy.pool import StaticPool
 
+from accounting_api.app.core.cache import get_cache
 from accounting_api.app.core.db_infrastructure import (
     make_engine,
     make_session_factory
@@ -38,10 +39,9 @@ TestSessionLocal = make_session_factory(TEST_ENGINE)
 # Ensure the app uses the test engine (important if main.py does create_all on startup)
 @pytest.fixture(scope="session", autouse=True)
 def _wire_app_to_test_engine() -> Generator[None, Any, None]:
-    # Patch any module-level engine references used by the app
+    # Pre-set the lazily built engine and session factory of the app
     db_adapter.engine = TEST_ENGINE
     db_adapter.SessionLocal = TestSessionLocal
-    main.engine = TEST_ENGINE
 
     yield
 
@@ -56,49 +56,72 @@ def _create_test_schema() -> Generator[None, Any, None]:
     Base.metadata.drop_all(bind=TEST_ENGINE)
 
 
+# pysqlite begins transactions implicitly and lazily, which breaks
+# SAVEPOINT semantics; let SQLAlchemy emit BEGIN itself instead.
+@event.listens_for(TEST_ENGINE, "connect")
+def _disable_pysqlite_implicit_begin(dbapi_conn: Any, _: Any) -> None:
+    dbapi_conn.isolation_level = None
+
+
+@event.listens_for(TEST_ENGINE, "begin")
+def _emit_begin(conn: Any) -> None:
+    conn.exec_driver_sql("BEGIN")
+
+
 # DB session per test:
 #   - One outer transaction per test (rollback at teardown)
-#   - One SAVEPOINT (nested transaction) that automatically restarts
+#   - The session runs inside SAVEPOINTs, so code under test can call
+#     session.commit() safely; each commit releases the current SAVEPOINT
+#     and the next statement opens a new one
 @pytest.fixture()
 def test_db_session() -> Generator[Session, Any, None]:
     with TEST_ENGINE.connect() as connection:
         outer_tx = connection.begin()
 
-        session: Session = TestSessionLocal(bind=connection)
-
-        # Start SAVEPOINT so code under test can call session.commit() safely
-        session.begin_nested()
-
-        @event.listens_for(session, "after_transaction_end")
-        def _restart_savepoint(sess: Session, trans: Transaction) -> None:
-            """
-            If the nested transaction(SAVEPOINT)
-            ends (e.g. via sess.commit()),
-            restart it as long as we are still
-            inside the outer transaction.
-            """
-            if trans.nested and trans._parent is not None and not trans._parent.nested:
-                sess.begin_nested()
+        session: Session = TestSessionLocal(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+        )
 
         try:
             yield session
         finally:
-            # Prevent event listener accumulation in long-running runs
-            event.remove(session, "after_transaction_end", _restart_savepoint)
-
             session.close()
             outer_tx.rollback()  # restore pristine state for next test
 
 
+# Test transactions roll back (and ids get reused), so cached read models
+# must not outlive the test that produced them
+@pytest.fixture(autouse=True)
+def _clear_entity_cache() -> Generator[None, Any, None]:
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+# App lifespan runs once per test session, before any test transaction is
+# open: startup work on the shared in-memory connection (create_all commits)
+# would otherwise end the outer transaction of the running test.
+@pytest.fixture(scope="session")
+def _app_client(
+        _wire_app_to_test_engine: None,
+        _create_test_schema: None
+        ) -> Generator[TestClient, Any, None]:
+    with TestClient(main.app) as c:
+        yield c
+
+
 # FastAPI client with dependency override
 @pytest.fixture()
-def client(test_db_session: Session) -> Generator[TestClient, Any, None]:
+def client(
+        _app_client: TestClient,
+        test_db_session: Session
+        ) -> Generator[TestClient, Any, None]:
     def override_get_db() -> Generator[Session, Any, None]:
         yield test_db_session
 
     main.app.dependency_overrides[get_db] = override_get_db
-    with TestClient(main.app) as c:
-        yield c
+    yield _app_client
     main.app.dependency_overrides.clear()
 
 
@@ -108,3 +131,65 @@ def auth_headers() -> dict[str, str]:
     Standard auth headers for protected endpoints.
     """
     return {"X-API-Key": settings.api_key}
+
+
+@pytest.fixture()
+def query_counter() -> Callable[[], ContextManager[list[str]]]:
+    """
+    Context manager collecting every SQL statement sent to the test engine
+    inside the block:
+
+        with query_counter() as statements:
+            ...
+        assert len(statements) == 2
+    """
+    @contextmanager
+    def _count() -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def _record(
+                conn: Any,
+                cursor: Any,
+                statement: str,
+                parameters: Any,
+                context: Any,
+                executemany: bool
+                ) -> None:
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _record)
+
+    return _count
+
+
+@pytest.fixture()
+def query_budget(
+        query_counter: Callable[[], ContextManager[list[str]]]
+        ) -> Callable[[int], ContextManager[list[str]]]:
+    """
+    Fails the test when the block runs more SQL statements than declared,
+    listing the statements so N+1 regressions are easy to spot:
+
+        with query_budget(2):
+            client.get("/invoices/1")
+    """
+    @contextmanager
+    def _budget(max_statements: int) -> Iterator[list[str]]:
+        with query_counter() as statements:
+            yield statements
+        if len(statements) > max_statements:
+            listing = "\n".join(
+                f"  {n}. {' '.join(sql.split())}"
+                for n, sql in enumerate(statements, start=1)
+            )
+            pytest.fail(
+                f"{len(statements)} SQL statements, budget is "
+                f"{max_statements}:\n{listing}",
+                pytrace=False,
+            )
+
+    return _budget
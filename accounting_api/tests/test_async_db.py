@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from accounting_api.app.api.routes import customers_async, invoices_async
+from accounting_api.app.core.config import settings
+from accounting_api.app.core.db_adapter import get_async_db
+from accounting_api.app.core.db_infrastructure import (
+    make_async_engine,
+    make_async_session_factory,
+    to_async_url,
+)
+from accounting_api.app.models.sqlalchemy_models import Base
+from accounting_api.app.services.customer_service import AsyncCustomerService
+from accounting_api.app.services.invoice_service import AsyncInvoiceService
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("sqlite:///./dev.db", "sqlite+aiosqlite:///./dev.db"),
+        ("sqlite+pysqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ],
+)
+def test_to_async_url(url: str, expected: str):
+    assert to_async_url(url) == expected
+
+
+async def _make_factory(path: Path):
+    engine = make_async_engine(f"sqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, make_async_session_factory(engine)
+
+
+def test_async_services_round_trip(tmp_path: Path):
+    async def scenario() -> None:
+        engine, factory = await _make_factory(tmp_path / "async.db")
+        try:
+            async with factory() as db:
+                customer = await AsyncCustomerService(db).create_customer(
+                    name="Async", email="async@example.com"
+                )
+                invoices = AsyncInvoiceService(db)
+                invoice = await invoices.create_invoice(customer.id)
+                await invoices.add_line_item(invoice.id, "a", 2, 1000)
+                await invoices.add_line_item(invoice.id, "b", 1, 500)
+                await db.commit()
+                invoice_id = invoice.id
+
+            async with factory() as db:
+                invoice = await AsyncInvoiceService(db).get_invoice(invoice_id)
+                assert invoice.total_cents == 2500
+                assert invoice.line_item_count == 2
+                assert len(invoice.line_items) == 2
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_async_routes(tmp_path: Path):
+    async def scenario() -> None:
+        engine, factory = await _make_factory(tmp_path / "routes.db")
+
+        async def override_get_async_db() -> AsyncGenerator[Any, None]:
+            async with factory() as db:
+                yield db
+                await db.commit()
+
+        app = FastAPI()
+        app.include_router(customers_async.router)
+        app.include_router(invoices_async.router)
+        app.dependency_overrides[get_async_db] = override_get_async_db
+
+        transport = httpx.ASGITransport(app=app)
+        headers = {"X-API-Key": settings.api_key}
+        try:
+            async with httpx.AsyncClient(
+                    transport=transport, base_url="http://test"
+                    ) as client:
+                res = await client.post(
+                    "/customers/",
+                    headers=headers,
+                    json={"name": "Async", "email": None},
+                )
+                assert res.status_code == 201
+                customer_id = res.json()["id"]
+
+                res = await client.post(
+                    "/invoices/",
+                    headers=headers,
+                    json={"customer_id": customer_id},
+                )
+                assert res.status_code == 201
+                invoice_id = res.json()["id"]
+
+                await client.post(
+                    f"/invoices/{invoice_id}/items",
+                    json={"description": "A", "quantity": 3, "unit_price": 2},
+                )
+                res = await client.get(f"/invoices/{invoice_id}")
+                assert res.json()["total_amount"] == 6
+
+                res = await client.get(f"/customers/{customer_id}/invoices")
+                assert res.json()[0]["line_item_count"] == 1
+
+                res = await client.get("/customers/", params={"stream": True})
+                assert len(res.text.splitlines()) == 1
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -1,5 +1,18 @@
+from typing import Any, Generator
+
+import pytest
 from fastapi.testclient import TestClient
 
+from accounting_api.app.api.dependencies.auth import (
+    API_KEY_REQUESTS,
+    RATE_LIMITER,
+    READ_REQUESTS_THROTTLED,
+    api_key_table,
+    hash_api_key,
+)
+from accounting_api.app.core.config import ApiKeyConfig, settings
+from accounting_api.app.core.rate_limit import RateLimiter, TokenBucket
+
 
 def test_missing_api_key(client: TestClient):
     response = client.post(
@@ -28,3 +41,127 @@ def test_create_and_get_customer_with_api_key(
         json={"name": "ValidKey", "email": "validKey@gmail.com"}
     )
     assert response.status_code == 201
+
+
+@pytest.fixture()
+def configured_keys(
+        monkeypatch: pytest.MonkeyPatch
+        ) -> Generator[None, Any, None]:
+    monkeypatch.setattr(settings, "api_keys", {
+        "billing": ApiKeyConfig(sha256=hash_api_key("billing-key")),
+        "reports": ApiKeyConfig(
+            sha256=hash_api_key("reports-key"), rate_per_second=1, burst=2
+        ),
+    })
+    api_key_table.cache_clear()
+    RATE_LIMITER.reset()
+    yield
+    api_key_table.cache_clear()
+    RATE_LIMITER.reset()
+
+
+def test_multiple_hashed_api_keys(
+        client: TestClient,
+        configured_keys: None
+        ):
+    for key in ("billing-key", "reports-key"):
+        response = client.get("/reports/aging", headers={"X-API-Key": key})
+        assert response.status_code == 200
+
+    # The single development key is disabled once keys are configured
+    response = client.get(
+        "/reports/aging", headers={"X-API-Key": settings.api_key}
+    )
+    assert response.status_code == 401
+
+
+def test_rate_limit_per_key(client: TestClient, configured_keys: None):
+    throttled_before = API_KEY_REQUESTS.value("throttled")
+    reports = {"X-API-Key": "reports-key"}
+
+    statuses = [
+        client.get("/reports/aging", headers=reports).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+    response = client.get("/reports/aging", headers=reports)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert API_KEY_REQUESTS.value("throttled") == throttled_before + 2
+
+    # Other keys have their own (here unlimited) budget
+    response = client.get(
+        "/reports/aging", headers={"X-API-Key": "billing-key"}
+    )
+    assert response.status_code == 200
+
+
+def test_unauthenticated_reads_are_rate_limited(
+        client: TestClient,
+        configured_keys: None,
+        monkeypatch: pytest.MonkeyPatch
+        ):
+    monkeypatch.setattr(settings, "rate_limit_per_second", 1)
+    monkeypatch.setattr(settings, "rate_limit_burst", 2)
+    throttled = READ_REQUESTS_THROTTLED.value("client")
+
+    # Without a (valid) key, reads share a bucket per client address
+    statuses = [
+        client.get("/customers/", headers=headers).status_code
+        for headers in ({}, {"X-API-Key": "unknown"}, {})
+    ]
+    assert statuses == [200, 200, 429]
+    assert READ_REQUESTS_THROTTLED.value("client") == throttled + 1
+
+    # A valid key is charged to its own bucket instead
+    reports = {"X-API-Key": "reports-key"}
+    statuses = [
+        client.get("/customers/", headers=reports).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+    response = client.get("/reports/aging", headers=reports)
+    assert response.status_code == 429
+
+
+def test_metrics_do_not_expose_key_names(
+        client: TestClient,
+        configured_keys: None
+        ):
+    client.get("/reports/aging", headers={"X-API-Key": "billing-key"})
+
+    body = client.get("/metrics").text
+    assert 'api_key_requests_total{result="allowed"}' in body
+    assert "billing" not in body
+
+
+def test_rate_limiter_evicts_least_recently_used_past_its_cap():
+    limiter = RateLimiter(clock=lambda: 0.0, max_buckets=2)
+    limiter.acquire("a", rate=1, burst=1)
+    limiter.acquire("b", rate=1, burst=1)
+    assert limiter.acquire("a", rate=1, burst=1) > 0  # "b" is now LRU
+
+    # A spray of new keys, none of them refilled, never exceeds the cap
+    for n in range(1000):
+        limiter.acquire(f"client:{n}", rate=1, burst=1)
+        assert len(limiter) == 2
+
+    limiter.acquire("a", rate=1, burst=1)
+    limiter.acquire("c", rate=1, burst=1)
+    # "a" was used more recently than "client:999" and is kept
+    assert limiter.acquire("a", rate=1, burst=1) > 0
+    assert limiter.acquire("b", rate=1, burst=1) == 0  # evicted, starts over
+
+
+def test_token_bucket_refills_over_time():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+    now[0] = 0.5
+    assert bucket.acquire() == 0
+    now[0] = 10.0  # refill is capped at the burst size
+    assert [bucket.acquire() for _ in range(3)][-1] > 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from accounting_api.app.core.cache import (
+    LRUCache,
+    get_cache,
+    invalidate_on_commit,
+    invoice_key,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def _create_invoice(client, auth_headers) -> int:
+    customer = client.post(
+        "/customers/",
+        json={"name": "Cached", "email": "cached@example.com"},
+        headers=auth_headers,
+    ).json()
+    invoice = client.post(
+        "/invoices/",
+        json={"customer_id": customer["id"]},
+        headers=auth_headers,
+    ).json()
+    return invoice["id"]
+
+
+def test_repeated_reads_are_served_from_cache(
+        client, auth_headers, test_db_session, query_counter
+        ):
+    invoice_id = _create_invoice(client, auth_headers)
+    # Rows written in a transaction are only cached once it committed
+    test_db_session.commit()
+    client.get(f"/invoices/{invoice_id}")
+
+    with query_counter() as statements:
+        response = client.get(f"/invoices/{invoice_id}")
+
+    assert response.status_code == 200
+    assert statements == []
+
+    # The shared cached model cannot be changed by one request for others
+    cached = get_cache().get(invoice_key(invoice_id))
+    with pytest.raises(ValidationError):
+        cached.status = "paid"
+    assert isinstance(cached.line_items, tuple)
+
+
+def test_writes_invalidate_cached_invoice(client, auth_headers):
+    invoice_id = _create_invoice(client, auth_headers)
+    assert client.get(f"/invoices/{invoice_id}").json()["total_amount"] == 0
+
+    client.post(
+        f"/invoices/{invoice_id}/items",
+        json={"description": "Work", "quantity": 2, "unit_price": 5.0},
+        headers=auth_headers,
+    )
+
+    assert client.get(f"/invoices/{invoice_id}").json()["total_amount"] == 10
+
+
+def test_customer_delete_invalidates_its_invoices(client, auth_headers):
+    invoice_id = _create_invoice(client, auth_headers)
+    invoice = client.get(f"/invoices/{invoice_id}").json()
+
+    client.delete(f"/customers/{invoice['customer_id']}")
+
+    assert client.get(f"/invoices/{invoice_id}").status_code == 404
+
+
+def test_keys_are_invalidated_again_after_commit(test_db_session):
+    key = invoice_key(12345)
+    invalidate_on_commit(test_db_session, key)
+    # A concurrent reader caching the pre-commit row
+    get_cache().set(key, "stale")
+
+    test_db_session.commit()
+
+    assert get_cache().get(key) is None
@@ -1,4 +1,10 @@
+import json
+from datetime import datetime
+
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from accounting_api.app.models.sqlalchemy_models import Invoice, InvoiceStatus
 
 
 def test_create_and_get_customer(
@@ -34,3 +40,250 @@ def test_create_and_get_customer(
     # Verify Deletion
     response = client.get(f"/customers/{customer_id}")
     assert response.status_code == 404
+
+
+def test_list_customers_keyset_pagination(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    created_ids = []
+    for name in ("Page A", "Page B", "Page C"):
+        res = client.post(
+            "/customers/",
+            headers=auth_headers,
+            json={"name": name, "email": None}
+        )
+        created_ids.append(res.json()["id"])
+
+    # First page stops early and hands back a cursor
+    response = client.get("/customers/", params={"limit": 2})
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == created_ids[:2]
+    cursor = response.headers["X-Next-Cursor"]
+
+    # Last page has no cursor
+    response = client.get(
+        "/customers/",
+        params={"limit": 2, "after": cursor}
+    )
+    assert [c["id"] for c in response.json()] == created_ids[2:]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_customers_stream(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    for name in ("Stream A", "Stream B"):
+        client.post(
+            "/customers/",
+            headers=auth_headers,
+            json={"name": name, "email": None}
+        )
+
+    response = client.get("/customers/", params={"stream": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [
+        "Stream A", "Stream B"
+    ]
+
+
+def test_import_customers_ndjson(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    body = "\n".join([
+        json.dumps({"name": "Imported 1", "email": "i1@example.com"}),
+        json.dumps({"name": "Imported 2", "email": None}),
+        "{not json",
+        json.dumps({"name": "Bad email", "email": "nope"}),
+        "",
+        json.dumps({"name": "Imported 3", "email": "i3@example.com"}),
+    ])
+    response = client.post(
+        "/customers/import",
+        params={"chunk_size": 2},
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 3
+    assert report["failed"] == 2
+    assert [e["line"] for e in report["errors"]] == [3, 4]
+    assert report["errors"][1]["error"].startswith("email:")
+
+    names = [c["name"] for c in client.get("/customers/").json()]
+    assert names == ["Imported 1", "Imported 2", "Imported 3"]
+
+
+def test_import_reports_invalid_utf8_lines_and_keeps_going(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    body = b"\n".join([
+        json.dumps({"name": "Before", "email": None}).encode(),
+        b'{"name": "Bad \xff", "email": null}',
+        json.dumps({"name": "After", "email": None}).encode(),
+    ])
+    # chunk_size 1: the first row is already committed when the bad one
+    # is read
+    response = client.post(
+        "/customers/import",
+        params={"chunk_size": 1},
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"line": 2, "error": "invalid UTF-8 at byte 14"}
+    ]
+
+    names = [c["name"] for c in client.get("/customers/").json()]
+    assert names == ["Before", "After"]
+
+
+def test_import_customers_csv(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    body = (
+        "name,email\n"
+        "CSV One,one@example.com\n"
+        "\"CSV, Two\",\n"
+        "Too,many,fields\n"
+    )
+    response = client.post(
+        "/customers/import",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+        content=body,
+    )
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"line": 4, "error": "expected 2 fields, got 3"}
+    ]
+
+    customers = client.get("/customers/").json()
+    assert [(c["name"], c["email"]) for c in customers] == [
+        ("CSV One", "one@example.com"),
+        ("CSV, Two", None),
+    ]
+
+
+def test_get_customer_conditional_request(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    customer_id = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Etag", "email": "etag@example.com"},
+    ).json()["id"]
+
+    res = client.get(f"/customers/{customer_id}")
+    etag = res.headers["ETag"]
+    assert etag == f'W/"customer-{customer_id}-v1"'
+
+    res = client.get(
+        f"/customers/{customer_id}",
+        headers={"If-None-Match": f'"other", {etag}'},
+    )
+    assert res.status_code == 304
+
+    res = client.get(
+        f"/customers/{customer_id}", headers={"If-None-Match": '"other"'}
+    )
+    assert res.status_code == 200
+    assert res.json()["version"] == 1
+
+
+def test_recreated_customer_does_not_match_the_deleted_etag(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    body = {"name": "Gone", "email": "gone@example.com"}
+    customer_id = client.post(
+        "/customers/", headers=auth_headers, json=body
+    ).json()["id"]
+    etag = client.get(f"/customers/{customer_id}").headers["ETag"]
+    client.delete(f"/customers/{customer_id}", headers=auth_headers)
+
+    # The new row must not reuse the id of the deleted last row
+    recreated = client.post(
+        "/customers/", headers=auth_headers,
+        json={"name": "New", "email": "new@example.com"},
+    ).json()["id"]
+    assert recreated != customer_id
+
+    res = client.get(
+        f"/customers/{recreated}", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 200
+    assert res.json()["name"] == "New"
+
+
+def test_list_customer_invoices(
+        client: TestClient,
+        auth_headers: dict[str, str],
+        test_db_session: Session
+        ) -> None:
+    customer_id = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Invoices", "email": None}
+    ).json()["id"]
+    invoice_ids = [
+        client.post(
+            "/invoices/",
+            headers=auth_headers,
+            json={"customer_id": customer_id}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    client.post(
+        f"/invoices/{invoice_ids[0]}/items",
+        json={"description": "a", "quantity": 2, "unit_price": 5.0},
+    )
+    first = test_db_session.get(Invoice, invoice_ids[0])
+    first.status = InvoiceStatus.issued
+    first.issued_at = datetime(2024, 3, 1)
+    test_db_session.flush()
+    url = f"/customers/{customer_id}/invoices"
+
+    # Summaries carry the stored aggregates but no line items
+    response = client.get(url, params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [i["id"] for i in page] == invoice_ids[:2]
+    assert page[0]["total_amount"] == 10.0
+    assert page[0]["line_item_count"] == 1
+    assert "line_items" not in page[0]
+
+    response = client.get(
+        url, params={"limit": 2, "after": response.headers["X-Next-Cursor"]}
+    )
+    assert [i["id"] for i in response.json()] == invoice_ids[2:]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get(url, params={"include": "line_items"})
+    assert response.json()[0]["line_items"][0]["description"] == "a"
+
+    # Filters
+    response = client.get(url, params={"status": "issued"})
+    assert [i["id"] for i in response.json()] == invoice_ids[:1]
+    response = client.get(url, params={"issued_from": "2024-04-01"})
+    assert response.json() == []
+    response = client.get(
+        url,
+        params={"issued_from": "2024-03-01", "issued_before": "2024-04-01"}
+    )
+    assert [i["id"] for i in response.json()] == invoice_ids[:1]
+
+    # An empty page is fine for an existing customer only
+    assert client.get("/customers/999999/invoices").status_code == 404
+    assert client.get(url, params={"include": "other"}).status_code == 422
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.migrations import upgrade_schema
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_default_sqlite_profile_only_enables_foreign_keys(tmp_path: Path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'default.db'}")
+
+    assert _pragma(engine, "foreign_keys") == 1
+    assert _pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_performance_sqlite_profile(tmp_path: Path):
+    engine = make_engine(
+        f"sqlite:///{tmp_path / 'perf.db'}", sqlite_profile="performance"
+    )
+
+    assert _pragma(engine, "foreign_keys") == 1
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "cache_size") == -64_000
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "busy_timeout") == 5_000
+    engine.dispose()
+
+
+def test_unknown_sqlite_profile_is_rejected():
+    with pytest.raises(ValueError):
+        make_engine("sqlite://", sqlite_profile="turbo")
+
+
+# Schema as created by the first release: no aggregates, versions or
+# secondary indexes
+_LEGACY_SCHEMA = """
+CREATE TABLE customer (
+    id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, email VARCHAR(320),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE TABLE invoice (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER NOT NULL REFERENCES customer (id) ON DELETE CASCADE,
+    status VARCHAR(6) NOT NULL, issued_at DATETIME
+);
+CREATE TABLE line_item (
+    id INTEGER PRIMARY KEY,
+    invoice_id INTEGER NOT NULL REFERENCES invoice (id) ON DELETE CASCADE,
+    description VARCHAR(500) NOT NULL, quantity INTEGER NOT NULL,
+    unit_price NUMERIC(10, 2) NOT NULL
+);
+INSERT INTO customer (id, name) VALUES (1, 'legacy');
+INSERT INTO invoice (id, customer_id, status) VALUES (1, 1, 'draft');
+INSERT INTO line_item VALUES (1, 1, 'a', 2, 10), (2, 1, 'b', 1, 5.5);
+"""
+
+
+def test_upgrade_schema_migrates_legacy_database(tmp_path: Path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.connection.dbapi_connection.executescript(_LEGACY_SCHEMA)
+
+    changes = upgrade_schema(engine)
+
+    assert "line_item.unit_price -> unit_price_cents" in changes
+    assert "invoice.total_cents" in changes
+    assert "customer.version" in changes
+    indexes = {
+        index["name"]
+        for table in ("customer", "invoice", "line_item")
+        for index in inspect(engine).get_indexes(table)
+    }
+    assert indexes == {
+        "ix_customer_email",
+        "ix_invoice_customer_id_id",
+        "ix_invoice_status_issued_at",
+        "ix_line_item_invoice_id",
+    }
+    with engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT total_cents, line_item_count, version, currency "
+            "FROM invoice"
+        )).one()
+        prices = conn.execute(text(
+            "SELECT unit_price_cents FROM line_item ORDER BY id"
+        )).scalars().all()
+    assert tuple(row) == (2550, 2, 1, "EUR")
+    assert prices == [1000, 550]
+
+    # Idempotent: nothing left to do on the next start
+    assert upgrade_schema(engine) == []
+    engine.dispose()
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.models.sqlalchemy_models import Invoice, LineItem
+from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.scripts.generate_data import GeneratorConfig, generate
+
+CONFIG = GeneratorConfig(customers=30, invoices_mean=3, items_max=4)
+
+
+def _dump(url: str) -> tuple[list, list]:
+    engine = make_engine(url)
+    with Session(engine) as db:
+        invoices = db.execute(
+            select(Invoice.__table__).order_by(Invoice.id)
+        ).all()
+        items = db.execute(
+            select(LineItem.__table__).order_by(LineItem.id)
+        ).all()
+        assert InvoiceRepository(db).find_total_drift() == []
+    engine.dispose()
+    return invoices, items
+
+
+def test_generated_data_is_deterministic_and_consistent(tmp_path: Path):
+    one = f"sqlite:///{tmp_path / 'one.db'}"
+    many = f"sqlite:///{tmp_path / 'many.db'}"
+    result = generate(one, CONFIG, partition_size=1000)
+    generate(many, CONFIG, partition_size=7)
+
+    invoices, items = _dump(one)
+    assert (len(invoices), len(items)) == (
+        result["invoices"], result["line_items"]
+    )
+    # Same rows however the customers are partitioned
+    assert _dump(many) == (invoices, items)
+    assert [row.id for row in items] == list(range(1, len(items) + 1))
+
+    # A second run appends new customers after the existing ids
+    again = generate(one, CONFIG, partition_size=1000)
+    _, all_items = _dump(one)
+    assert len(all_items) == len(items) + again["line_items"]
+    assert all_items[-1].id == len(all_items)
@@ -37,3 +37,218 @@ def test_invoice_flow(
 
     assert data["total_amount"] == 25
     assert len(data["line_items"]) == 2
+
+
+def test_amounts_are_exact_cents(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    res = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Cents", "email": None}
+    )
+    res = client.post(
+        "/invoices/",
+        headers=auth_headers,
+        json={"customer_id": res.json()["id"], "currency": "USD"})
+    invoice_id = res.json()["id"]
+    assert res.json()["currency"] == "USD"
+
+    # 0.1 + 0.2 drifts as floats; as cents it is exactly 30
+    for price in (0.1, "0.2"):
+        res = client.post(
+            f"/invoices/{invoice_id}/items",
+            json={"description": "x", "quantity": 1, "unit_price": price},
+        )
+        assert res.status_code == 201
+    assert res.json()["unit_price_cents"] == 20
+    assert res.json()["unit_price"] == 0.2
+
+    data = client.get(f"/invoices/{invoice_id}").json()
+    assert (data["total_cents"], data["total_amount"]) == (30, 0.3)
+
+    # Fractions of a cent and unknown currency formats are rejected
+    res = client.post(
+        f"/invoices/{invoice_id}/items",
+        json={"description": "x", "quantity": 1, "unit_price": 0.125},
+    )
+    assert res.status_code == 422
+    res = client.post(
+        "/invoices/",
+        headers=auth_headers,
+        json={"customer_id": 1, "currency": "usd"})
+    assert res.status_code == 422
+
+
+def test_add_line_items_batch(
+        client: TestClient,
+        auth_headers: dict[str, str],
+        query_counter
+        ) -> None:
+    res = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Batch", "email": None}
+    )
+    res = client.post(
+        "/invoices/",
+        headers=auth_headers,
+        json={"customer_id": res.json()["id"]})
+    invoice_id = res.json()["id"]
+
+    items = [
+        {"description": f"Line {n}", "quantity": n, "unit_price": 1.5}
+        for n in range(1, 51)
+    ]
+    with query_counter() as statements:
+        res = client.post(
+            f"/invoices/{invoice_id}/items/batch",
+            headers=auth_headers,
+            json=items,
+        )
+    assert res.status_code == 201
+    data = res.json()
+    assert [item["description"] for item in data["items"]] == [
+        f"Line {n}" for n in range(1, 51)
+    ]
+    assert data["line_item_count"] == 50
+    assert data["total_amount"] == 1.5 * sum(range(1, 51))
+    # Invoice lookup, one batched INSERT, one aggregate UPDATE
+    assert len(statements) == 3
+
+    res = client.get(f"/invoices/{invoice_id}")
+    assert res.json()["total_amount"] == data["total_amount"]
+
+
+def test_add_line_items_batch_validation(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    res = client.post(
+        "/invoices/999999/items/batch",
+        headers=auth_headers,
+        json=[{"description": "A", "quantity": 1, "unit_price": 1}],
+    )
+    assert res.status_code == 404
+
+    res = client.post(
+        "/invoices/999999/items/batch",
+        headers=auth_headers,
+        json=[{"description": "A", "quantity": 0, "unit_price": 1}],
+    )
+    assert res.status_code == 422
+
+
+def test_get_invoice_conditional_request(
+        client: TestClient,
+        auth_headers: dict[str, str],
+        test_db_session,
+        query_counter
+        ) -> None:
+    customer_id = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Poller", "email": "poller@example.com"},
+    ).json()["id"]
+    invoice_id = client.post(
+        "/invoices/",
+        headers=auth_headers,
+        json={"customer_id": customer_id},
+    ).json()["id"]
+
+    res = client.get(f"/invoices/{invoice_id}")
+    etag = res.headers["ETag"]
+    assert etag == f'W/"invoice-{invoice_id}-v1"'
+
+    test_db_session.expunge_all()
+    with query_counter() as statements:
+        res = client.get(
+            f"/invoices/{invoice_id}", headers={"If-None-Match": etag}
+        )
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert res.content == b""
+    # Version lookup only: no invoice row or line items loaded
+    assert len(statements) == 1
+    assert "line_item" not in statements[0]
+
+    client.post(
+        f"/invoices/{invoice_id}/items",
+        json={"description": "Work", "quantity": 1, "unit_price": 10},
+    )
+    res = client.get(
+        f"/invoices/{invoice_id}", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 200
+    assert res.headers["ETag"] == f'W/"invoice-{invoice_id}-v2"'
+    assert res.json()["version"] == 2
+
+    res = client.get("/invoices/999999", headers={"If-None-Match": etag})
+    assert res.status_code == 404
+
+
+def test_bulk_status_transitions(
+        client: TestClient,
+        auth_headers: dict[str, str]
+        ) -> None:
+    res = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Bulk", "email": "bulk@example.com"}
+    )
+    customer_id = res.json()["id"]
+    a, b, c = (
+        client.post(
+            "/invoices/",
+            headers=auth_headers,
+            json={"customer_id": customer_id},
+        ).json()["id"]
+        for _ in range(3)
+    )
+    # Cached before the bulk update, which must invalidate it
+    assert client.get(f"/invoices/{a}").json()["status"] == "draft"
+
+    res = client.post(
+        "/invoices:issue", headers=auth_headers, json={"ids": [a, b, 999999]}
+    )
+    assert res.status_code == 200
+    assert res.json() == {
+        "status": "issued", "transitioned": 2, "rejected": 0, "not_found": 1
+    }
+    invoice = client.get(f"/invoices/{a}").json()
+    assert invoice["status"] == "issued"
+    assert invoice["issued_at"] is not None
+    assert invoice["version"] == 2
+
+    # Already issued invoices are rejected, not issued again
+    res = client.post(
+        "/invoices:issue", headers=auth_headers, json={"ids": [a, c, c]}
+    )
+    assert res.json()["transitioned"] == 1
+    assert res.json()["rejected"] == 1
+
+    res = client.post(
+        "/invoices:pay",
+        headers=auth_headers,
+        json={"filter": {"customer_id": customer_id}},
+    )
+    assert res.json()["transitioned"] == 3
+    assert client.get(f"/invoices/{c}").json()["status"] == "paid"
+
+    for body in (
+            {}, {"ids": [a], "filter": {}}, {"ids": []}, {"filter": {}}
+            ):
+        res = client.post("/invoices:pay", headers=auth_headers, json=body)
+        assert res.status_code == 422
+    # Drafts are never issued before anything: no `issued_before` filter
+    issued_before = {
+        "customer_id": customer_id, "issued_before": "2030-01-01T00:00:00"
+    }
+    for selection in ({}, issued_before):
+        res = client.post(
+            "/invoices:issue",
+            headers=auth_headers,
+            json={"filter": selection},
+        )
+        assert res.status_code == 422
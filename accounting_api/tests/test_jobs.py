@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import accounting_api.app.core.db_adapter as db_adapter
+from accounting_api.app.core.jobs import (
+    JOBS,
+    JobQueue,
+    JobStatus,
+    PermanentJobError,
+    QueueClosedError,
+    QueueFullError,
+)
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
+from accounting_api.app.repositories.customer import CustomerRepository
+from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.app.services import invoice_jobs
+
+
+def test_job_queue_retries_with_backoff_and_drains():
+    calls: list[float] = []
+
+    def flaky() -> str:
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError("temporary")
+        return "done"
+
+    def broken() -> None:
+        raise PermanentJobError("cannot succeed")
+
+    async def scenario() -> None:
+        queue = JobQueue(workers=2, max_attempts=3, retry_backoff_seconds=0.01)
+        await queue.start()
+        retried = queue.submit("flaky", flaky)
+        failed = queue.submit("broken", broken)
+
+        assert await queue.drain(timeout=5)
+        assert (retried.status, retried.attempts) == (JobStatus.succeeded, 3)
+        assert retried.result == "done" and retried.error is None
+        # Second retry waits twice as long as the first
+        assert calls[2] - calls[1] >= calls[1] - calls[0] >= 0.01
+        assert (failed.status, failed.attempts) == (JobStatus.failed, 1)
+        assert failed.error == "PermanentJobError: cannot succeed"
+        assert queue.get(failed.id) is failed
+
+        with pytest.raises(QueueClosedError):
+            queue.submit("late", flaky)
+
+    asyncio.run(scenario())
+
+
+def test_job_queue_rejects_jobs_beyond_capacity():
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def blocked() -> None:
+            await release.wait()
+
+        queue = JobQueue(capacity=2, workers=1)
+        await queue.start()
+        queue.submit("running", blocked)
+        await asyncio.sleep(0)  # the worker takes the first job
+        queue.submit("waiting", blocked)
+        queue.submit("waiting", blocked)
+        with pytest.raises(QueueFullError):
+            queue.submit("rejected", blocked)
+
+        release.set()
+        assert await queue.drain(timeout=5)
+
+    asyncio.run(scenario())
+
+
+def test_drain_timeout_cancels_unfinished_jobs():
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def blocked() -> None:
+            await release.wait()
+
+        def flaky() -> None:
+            raise RuntimeError("temporary")
+
+        queue = JobQueue(workers=2, max_attempts=3, retry_backoff_seconds=60)
+        await queue.start()
+        running = queue.submit("running", blocked)
+        retrying = queue.submit("flaky", flaky)
+        await asyncio.sleep(0.05)  # the first attempt failed
+        queue.submit("running", blocked)
+        queued = queue.submit("queued", blocked)
+
+        assert not await queue.drain(timeout=0.05)
+        for job in (running, retrying, queued):
+            assert job.status == JobStatus.cancelled
+            assert job.finished_at is not None
+        assert retrying.error == "RuntimeError: temporary"
+        assert queued.error == "Cancelled at shutdown."
+        assert len(queue) == 0
+
+    asyncio.run(scenario())
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.01)
+
+
+def test_issue_invoice_queues_follow_up_after_commit(
+        client: TestClient,
+        test_db_session: Session,
+        auth_headers: dict[str, str],
+        monkeypatch: pytest.MonkeyPatch
+        ):
+    # The job's unit of work runs on the test transaction
+    monkeypatch.setattr(db_adapter, "SessionLocal", lambda: test_db_session)
+    customer = CustomerRepository(test_db_session).add("jobs", None)
+    invoice_id = InvoiceRepository(test_db_session).create(customer.id).id
+    succeeded = JOBS.value(invoice_jobs.INVOICE_ISSUED, "succeeded")
+
+    response = client.post(
+        f"/invoices/{invoice_id}/issue", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == InvoiceStatus.issued
+    assert response.json()["issued_at"] is not None
+
+    # The follow-up waits for the commit (the test's get_db never commits)
+    time.sleep(0.05)
+    assert JOBS.value(invoice_jobs.INVOICE_ISSUED, "succeeded") == succeeded
+    test_db_session.commit()
+    _wait_for(lambda: JOBS.value(
+        invoice_jobs.INVOICE_ISSUED, "succeeded"
+    ) == succeeded + 1)
+
+    # Issuing twice, or an unknown invoice, is refused and queues nothing
+    response = client.post(
+        f"/invoices/{invoice_id}/issue", headers=auth_headers
+    )
+    assert response.status_code == 409
+    response = client.post("/invoices/999999/issue", headers=auth_headers)
+    assert response.status_code == 404
+
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_follow_up_of_a_deleted_invoice_fails_at_once(
+        test_db_session: Session,
+        monkeypatch: pytest.MonkeyPatch
+        ):
+    monkeypatch.setattr(db_adapter, "SessionLocal", lambda: test_db_session)
+
+    async def scenario() -> None:
+        queue = JobQueue(workers=1)
+        await queue.start()
+        job = queue.submit(
+            invoice_jobs.INVOICE_ISSUED, invoice_jobs.invoice_issued, 999999
+        )
+        assert await queue.drain(timeout=5)
+        # A missing invoice is permanent: retrying cannot help
+        assert (job.status, job.attempts) == (JobStatus.failed, 1)
+
+    asyncio.run(scenario())
+
+
+def test_submit_threadsafe_queues_from_another_thread():
+    async def scenario() -> None:
+        queue = JobQueue(workers=1)
+        await queue.start()
+        done = asyncio.Event()
+
+        async def mark() -> None:
+            done.set()
+
+        await asyncio.to_thread(queue.submit_threadsafe, "mark", mark)
+        await asyncio.wait_for(done.wait(), 5)
+        assert await queue.drain(timeout=5)
+
+    asyncio.run(scenario())
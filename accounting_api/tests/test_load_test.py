@@ -0,0 +1,29 @@
+import json
+from pathlib import Path
+
+from accounting_api.benchmarks import load_test
+
+
+def test_load_test_artifact_and_compare(tmp_path: Path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = [
+        "--customers", "10", "--invoices-per-customer", "2",
+        "--requests", "60", "--concurrency", "4",
+    ]
+    assert load_test.main([*args, "--output", str(baseline)]) == 0
+    artifact = json.loads(baseline.read_text())
+    assert artifact["overall"]["requests"] == 60
+    assert artifact["overall"]["errors"] == 0
+    assert artifact["routes"]["/invoices/{invoice_id}"]["queries_per_request"]
+    capsys.readouterr()
+
+    # A baseline that was twice as fast makes the comparison fail
+    artifact["overall"]["p95_ms"] *= 2
+    faster = {**artifact, "overall": {
+        **artifact["overall"], "p95_ms": artifact["overall"]["p95_ms"] / 4
+    }}
+    changes, regressions = load_test.compare(artifact, faster, 0.2)
+    assert changes["overall"]["p95_ms"] > 0.2
+    assert regressions == [
+        f"overall p95_ms +{changes['overall']['p95_ms']:.0%}"
+    ]
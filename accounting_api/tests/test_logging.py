@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+import pytest
+
+from accounting_api.app.core.logging import (
+    LOG_RECORDS_DROPPED,
+    DroppingQueueHandler,
+    JsonFormatter,
+    make_queue_logging,
+    setup_logging,
+    stop_logging,
+)
+
+
+@pytest.fixture()
+def logger():
+    logger = logging.getLogger("test.queue_logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.handlers.clear()
+
+
+def _output_handler() -> tuple[logging.Handler, io.StringIO]:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    return handler, stream
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_extra_fields_and_tracebacks(logger):
+    handler, stream = _output_handler()
+    queue_handler, listener = make_queue_logging(handler)
+    logger.addHandler(queue_handler)
+
+    listener.start()
+    logger.info(
+        "request", extra={"request_id": "r1", "status_code": 201,
+                          "duration_ms": 12}
+    )
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed %s", "job")
+    listener.stop()
+
+    request, error = _lines(stream)
+    assert request["message"] == "request"
+    assert request["level"] == "INFO"
+    assert request["logger"] == "test.queue_logging"
+    assert (request["request_id"], request["status_code"]) == ("r1", 201)
+    assert request["duration_ms"] == 12
+    assert error["message"] == "failed job"
+    assert "ValueError: boom" in error["exc_info"]
+
+
+def test_full_queue_drops_records_without_blocking(logger):
+    handler, stream = _output_handler()
+    queue_handler, listener = make_queue_logging(handler, queue_size=2)
+    logger.addHandler(queue_handler)
+    dropped = LOG_RECORDS_DROPPED.value("queue_full")
+
+    # Listener not running yet: nothing takes records off the queue
+    for n in range(5):
+        logger.info("record %d", n)
+    assert LOG_RECORDS_DROPPED.value("queue_full") == dropped + 3
+
+    listener.start()
+    listener.stop()
+    assert [line["message"] for line in _lines(stream)] == [
+        "record 0", "record 1"
+    ]
+
+
+def test_successful_request_logs_are_sampled(logger):
+    handler, stream = _output_handler()
+    queue_handler, listener = make_queue_logging(
+        handler, success_sample_rate=0.0
+    )
+    logger.addHandler(queue_handler)
+    sampled = LOG_RECORDS_DROPPED.value("sampled")
+
+    listener.start()
+    logger.info("request", extra={"status_code": 200})
+    logger.info("request", extra={"status_code": 503})
+    logger.warning("slow query")
+    listener.stop()
+
+    kept = _lines(stream)
+    assert [line.get("status_code") for line in kept] == [503, None]
+    assert LOG_RECORDS_DROPPED.value("sampled") == sampled + 1
+
+
+def test_setup_and_stop_logging_are_repeatable():
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    try:
+        first = setup_logging("INFO", stream=stream)
+        first.start()  # already running: not a second thread
+        logging.getLogger("test.setup").info("first")
+        second = setup_logging("INFO", stream=stream)
+        logging.getLogger("test.setup").info("second")
+    finally:
+        stop_logging()
+        stop_logging()
+        root.setLevel(level)
+
+    # The first setup was stopped, with its records written, when the
+    # second replaced it; nothing is left on the root logger
+    assert [line["message"] for line in _lines(stream)] == [
+        "first", "second"
+    ]
+    assert first._thread is None and second._thread is None
+    assert not any(
+        isinstance(handler, DroppingQueueHandler)
+        for handler in root.handlers
+    )
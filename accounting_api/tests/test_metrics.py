@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_OVERFLOW,
+    HTTP_REQUESTS,
+    Counter,
+    Histogram,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(
+        "demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, "/x")
+
+    lines = list(histogram.render())
+
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{route="/x"} 4' in lines
+    assert 'demo_seconds_sum{route="/x"} 4.25' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("demo_total", "Demo.", ("path",))
+    counter.inc('a"b')
+
+    assert 'demo_total{path="a\\"b"} 1.0' in list(counter.render())
+
+
+def test_metrics_endpoint_reports_requests_per_route(client):
+    route = "/invoices/{invoice_id}"
+    before = HTTP_REQUESTS.value("GET", route, "404")
+
+    client.get("/invoices/424242")
+    client.get("/invoices/434343")
+    client.get("/no/such/path")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert HTTP_REQUESTS.value("GET", route, "404") == before + 2
+    assert HTTP_REQUESTS.value("GET", "<unmatched>", "404") >= 1
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_db_statements_bucket{method="GET",'
+        f'route="{route}",le="+Inf"}}'
+    ) in body
+    assert DB_POOL_CHECKOUTS.value("primary") > 0
+
+
+def test_pool_metrics_are_labelled_per_engine(tmp_path: Path):
+    first, second = (
+        make_engine(f"sqlite:///{tmp_path / f'{name}.db'}", pool_name=name)
+        for name in ("pool_a", "pool_b")
+    )
+    with first.connect(), first.connect(), second.connect():
+        assert DB_POOL_CHECKED_OUT.value("pool_a") == 2
+        assert DB_POOL_CHECKED_OUT.value("pool_b") == 1
+        # Each pool keeps its own overflow instead of the last writer's
+        assert DB_POOL_OVERFLOW.value("pool_a") == (
+            DB_POOL_OVERFLOW.value("pool_b") + 1
+        )
+    assert DB_POOL_CHECKED_OUT.value("pool_a") == 0
+
+    # The pool name outlives the pool being recreated
+    first.dispose()
+    with first.connect():
+        pass
+    lines = list(DB_POOL_CHECKOUT_WAIT.render())
+    assert 'db_pool_checkout_wait_seconds_count{pool="pool_a"} 3' in lines
+    first.dispose()
+    second.dispose()
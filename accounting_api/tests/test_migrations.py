@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from accounting_api.app.core.db_infrastructure import make_engine
+from accounting_api.app.core.migrations import (
+    SCHEMA_VERSION,
+    ensure_schema,
+    schema_version,
+)
+from accounting_api.app.models.sqlalchemy_models import Base, SchemaVersion
+
+# Fingerprint of the models at each schema version. A model change fails
+# this test until SCHEMA_VERSION is bumped and its fingerprint added, so
+# existing databases are migrated at their next startup.
+KNOWN_SCHEMAS = {
+    1: "9ea592698f9bdca6",
+    2: "084f67aaa822df97",
+    3: "b269737549864702",
+}
+
+
+def _schema_fingerprint() -> str:
+    dialect = sqlite.dialect()
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(str(CreateTable(table).compile(dialect=dialect)))
+        parts += sorted(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in table.indexes
+        )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def test_model_changes_bump_schema_version():
+    assert KNOWN_SCHEMAS.get(SCHEMA_VERSION) == _schema_fingerprint(), (
+        "The models changed: bump SCHEMA_VERSION in app/core/migrations.py "
+        "and record the new fingerprint in KNOWN_SCHEMAS"
+    )
+
+
+def test_ensure_schema_migrates_only_when_behind(tmp_path: Path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert schema_version(engine) is None
+
+    ensure_schema(engine)
+    assert schema_version(engine) == SCHEMA_VERSION
+
+    statements: list[str] = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    assert ensure_schema(engine) == []
+    assert len(statements) == 1 and "schema_version" in statements[0]
+
+    # An older recorded version runs the (idempotent) upgrade again
+    with engine.begin() as conn:
+        conn.execute(SchemaVersion.__table__.update().values(version=0))
+    ensure_schema(engine)
+    with engine.connect() as conn:
+        assert conn.scalar(select(SchemaVersion.version)) == SCHEMA_VERSION
+    engine.dispose()
+
+
+def test_version_1_money_columns_become_exact_cents(tmp_path: Path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'v1.db'}")
+    # Version 1 stored prices as NUMERIC (REAL on SQLite) and the invoice
+    # total as a float that had drifted
+    with engine.begin() as conn:
+        conn.connection.dbapi_connection.executescript("""
+            CREATE TABLE customer (
+                id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL,
+                email VARCHAR(320), version INTEGER DEFAULT 1 NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+            );
+            CREATE TABLE invoice (
+                id INTEGER PRIMARY KEY, customer_id INTEGER NOT NULL,
+                status VARCHAR(6) NOT NULL, issued_at DATETIME,
+                total_amount NUMERIC(12, 2) NOT NULL DEFAULT 0
+            );
+            CREATE TABLE line_item (
+                id INTEGER PRIMARY KEY, invoice_id INTEGER NOT NULL,
+                description VARCHAR(500) NOT NULL,
+                quantity INTEGER NOT NULL,
+                unit_price NUMERIC(10, 2) NOT NULL
+            );
+            CREATE TABLE schema_version (id INTEGER PRIMARY KEY, version INT);
+            INSERT INTO schema_version VALUES (1, 1);
+            INSERT INTO customer (id, name) VALUES (1, 'v1');
+            INSERT INTO invoice VALUES (1, 1, 'draft', NULL, 0.30000000004);
+            INSERT INTO line_item VALUES
+                (1, 1, 'a', 1, 0.1), (2, 1, 'b', 1, 0.2);
+        """)
+
+    changes = ensure_schema(engine)
+
+    assert "line_item.unit_price -> unit_price_cents" in changes
+    assert "drop invoice.total_amount" in changes
+    with engine.connect() as conn:
+        prices = conn.execute(text(
+            "SELECT unit_price_cents FROM line_item ORDER BY id"
+        )).scalars().all()
+        total = conn.execute(text("SELECT total_cents FROM invoice")).scalar()
+    assert prices == [10, 20]
+    assert total == 30
+    assert schema_version(engine) == SCHEMA_VERSION
+    engine.dispose()
+
+
+def test_version_2_tables_stop_reusing_deleted_ids(tmp_path: Path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'v2.db'}")
+    with engine.begin() as conn:
+        conn.connection.dbapi_connection.executescript("""
+            CREATE TABLE customer (
+                id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL,
+                email VARCHAR(320), version INTEGER DEFAULT 1 NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+            );
+            CREATE TABLE invoice (
+                id INTEGER PRIMARY KEY,
+                customer_id INTEGER NOT NULL
+                    REFERENCES customer (id) ON DELETE CASCADE,
+                status VARCHAR(6) NOT NULL, issued_at DATETIME
+            );
+            CREATE TABLE schema_version (id INTEGER PRIMARY KEY, version INT);
+            INSERT INTO schema_version VALUES (1, 2);
+            INSERT INTO customer (id, name) VALUES (1, 'a'), (2, 'b');
+            INSERT INTO invoice VALUES (1, 1, 'draft', NULL);
+        """)
+
+    changes = ensure_schema(engine)
+
+    assert "customer.id -> AUTOINCREMENT" in changes
+    assert "invoice.id -> AUTOINCREMENT" in changes
+    with engine.begin() as conn:
+        # Rebuilding the customer table did not cascade to its invoices
+        assert conn.scalar(text("SELECT count(*) FROM invoice")) == 1
+        assert conn.scalar(text("PRAGMA foreign_keys")) == 1
+        conn.execute(text("DELETE FROM customer WHERE id = 2"))
+        conn.execute(text("INSERT INTO customer (name) VALUES ('c')"))
+        ids = conn.execute(
+            text("SELECT id FROM customer ORDER BY id")
+        ).scalars().all()
+        indexes = {i["name"] for i in inspect(conn).get_indexes("invoice")}
+    assert ids == [1, 3]
+    assert "ix_invoice_customer_id_id" in indexes
+    assert schema_version(engine) == SCHEMA_VERSION
+    engine.dispose()
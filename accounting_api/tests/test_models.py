@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import math
 # from typing import Any, Generator
 # import pytest
 from sqlalchemy.orm import Session
@@ -40,13 +39,13 @@ def test_invoice_line_items_relationship(test_db_session: Session):
         invoice_id=inv.id,
         description="Apples",
         quantity=2,
-        unit_price=3.50
+        unit_price_cents=350
         )
     li2 = LineItem(
         invoice_id=inv.id,
         description="Oranges",
         quantity=3,
-        unit_price=4.00
+        unit_price_cents=400
         )
     test_db_session.add_all([li1, li2])
     test_db_session.flush()
@@ -54,7 +53,7 @@ def test_invoice_line_items_relationship(test_db_session: Session):
     # Validate relationships
     assert len(inv.line_items) == 2
     assert inv.customer.id == c.id
-    assert math.isclose(inv.total_amount, 2 * 3.5 + 3 * 4.0, rel_tol=1e-9)
+    assert inv.computed_total_cents == 2 * 350 + 3 * 400
 
     # Ensure bidirectional relationship works
     assert li1.invoice == inv
@@ -64,8 +63,8 @@ def test_cascade_delete_invoice_removes_line_items(test_db_session: Session):
     c = Customer(name="Carol", email="carol@example.com")
     inv = Invoice(customer=c)
     inv.line_items = [
-        LineItem(description="A", quantity=1, unit_price=10),
-        LineItem(description="B", quantity=2, unit_price=5),
+        LineItem(description="A", quantity=1, unit_price_cents=1000),
+        LineItem(description="B", quantity=2, unit_price_cents=500),
     ]
     test_db_session.add(inv)
     test_db_session.flush()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from accounting_api.app.core.db_infrastructure import make_engine
+
+# Statements each read route may run, whatever the data size. Raise a
+# budget only together with the change that needs it.
+ROUTE_BUDGETS = {
+    "/customers/{customer_id}": 1,
+    "/customers/?limit=50": 1,
+    "/customers/{customer_id}/invoices": 1,
+    "/customers/{customer_id}/invoices?include=line_items": 2,
+    "/invoices/{invoice_id}": 2,
+}
+
+
+@pytest.fixture()
+def seeded(client, auth_headers, test_db_session) -> dict[str, int]:
+    customer = client.post(
+        "/customers/",
+        json={"name": "Budget", "email": "budget@example.com"},
+        headers=auth_headers,
+    ).json()
+    for _ in range(3):
+        invoice = client.post(
+            "/invoices/",
+            json={"customer_id": customer["id"]},
+            headers=auth_headers,
+        ).json()
+        client.post(
+            f"/invoices/{invoice['id']}/items",
+            json={"description": "x", "quantity": 1, "unit_price": 1.0},
+            headers=auth_headers,
+        )
+    # Start from an empty identity map, as a fresh request would
+    test_db_session.expunge_all()
+    return {"customer_id": customer["id"], "invoice_id": invoice["id"]}
+
+
+@pytest.mark.parametrize("route", sorted(ROUTE_BUDGETS))
+def test_read_routes_stay_within_query_budget(
+        client, seeded, query_budget, route
+        ):
+    with query_budget(ROUTE_BUDGETS[route]):
+        response = client.get(route.format(**seeded))
+    assert response.status_code == 200
+
+
+def test_query_budget_fails_when_exceeded(query_budget, test_db_session):
+    with pytest.raises(pytest.fail.Exception, match="budget is 1"):
+        with query_budget(1):
+            test_db_session.execute(text("SELECT 1"))
+            test_db_session.execute(text("SELECT 2"))
+
+
+def test_slow_queries_are_logged_with_plan(tmp_path: Path, caplog):
+    engine = make_engine(
+        f"sqlite:///{tmp_path / 'slow.db'}", slow_query_ms=1e-9
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+        with caplog.at_level(logging.WARNING, logger="app.sql"):
+            conn.execute(text("SELECT * FROM t WHERE v = :v"), {"v": "x"})
+    engine.dispose()
+
+    [record] = [
+        r for r in caplog.records
+        if getattr(r, "statement", "").startswith("SELECT * FROM t")
+    ]
+    assert record.name == "app.sql"
+    assert "SCAN t" in record.query_plan
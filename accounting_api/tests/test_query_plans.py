@@ -0,0 +1,177 @@
+"""
+Index regression tests: every hot repository query must be answered by an
+index lookup (`SEARCH`), never a full table scan (`SCAN`), according to
+SQLite's `EXPLAIN QUERY PLAN`.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, ContextManager
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from accounting_api.app.models.sqlalchemy_models import (
+    Customer,
+    InvoiceStatus,
+)
+from accounting_api.app.repositories.customer import CustomerRepository
+from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.app.repositories.report import ReportRepository
+
+QueryCounter = Callable[[], ContextManager[list[str]]]
+TABLE_SCAN = re.compile(r"\bSCAN (customer|invoice|line_item)\b")
+
+
+def _query_plan(db: Session, statement: str) -> list[str]:
+    # Plans do not depend on bound values (no ANALYZE statistics)
+    params = (None,) * statement.count("?")
+    rows = db.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", params
+    )
+    return [str(row[-1]) for row in rows]
+
+
+def _plans(db: Session, statements: list[str]) -> list[list[str]]:
+    reads_and_writes = ("SELECT", "UPDATE", "DELETE")
+    return [
+        _query_plan(db, statement) for statement in statements
+        if statement.lstrip().upper().startswith(reads_and_writes)
+    ]
+
+
+def _assert_no_table_scan(db: Session, statements: list[str]) -> str:
+    plans = _plans(db, statements)
+    assert plans, "no statements captured"
+    for plan in plans:
+        scans = [step for step in plan if TABLE_SCAN.search(step)]
+        assert not scans, f"full table scan: {plan}"
+    return "\n".join(step for plan in plans for step in plan)
+
+
+@pytest.fixture()
+def seeded(test_db_session: Session) -> tuple[int, int]:
+    """(customer id, invoice id) of an issued invoice with a line item."""
+    customer = CustomerRepository(test_db_session).add("plans", None)
+    invoices = InvoiceRepository(test_db_session)
+    invoice = invoices.create(customer.id)
+    invoices.add_line_item(invoice.id, "a", 1, 1000)
+    invoices.update_status(
+        invoice.id, InvoiceStatus.issued, issued_at=datetime(2025, 1, 1)
+    )
+    test_db_session.expire_all()
+    return customer.id, invoice.id
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"after": 0, "limit": 50},
+    {"status": InvoiceStatus.issued},
+    {
+        "issued_from": datetime(2024, 1, 1),
+        "issued_before": datetime(2026, 1, 1),
+    },
+])
+def test_list_by_customer_uses_index(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int],
+        filters: dict[str, Any]
+        ) -> None:
+    customer_id, _ = seeded
+    with query_counter() as statements:
+        InvoiceRepository(test_db_session).list_by_customer(
+            customer_id, **filters
+        )
+
+    plan = _assert_no_table_scan(test_db_session, statements)
+    # Line items are loaded by invoice id as well
+    assert "ix_line_item_invoice_id" in plan
+
+
+def test_customer_invoice_page_uses_keyset_index(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int]
+        ) -> None:
+    customer_id, _ = seeded
+    with query_counter() as statements:
+        InvoiceRepository(test_db_session).list_by_customer(
+            customer_id, after=0, limit=10,
+            with_line_items=False,
+        )
+
+    plan = _assert_no_table_scan(test_db_session, statements)
+    assert "ix_invoice_customer_id_id" in plan
+    # Rows come out in index order, no separate sort
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_line_item_queries_use_index(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int]
+        ) -> None:
+    _, invoice_id = seeded
+    invoices = InvoiceRepository(test_db_session)
+    with query_counter() as statements:
+        invoices.list_line_items(invoice_id)
+        invoices.rebuild_totals([invoice_id])
+
+    plan = _assert_no_table_scan(test_db_session, statements)
+    assert "ix_line_item_invoice_id" in plan
+
+
+def test_customer_delete_finds_invoices_by_index(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int]
+        ) -> None:
+    customer_id, _ = seeded
+    with query_counter() as statements:
+        CustomerRepository(test_db_session).delete(customer_id)
+
+    _assert_no_table_scan(test_db_session, statements)
+
+
+def test_aging_report_uses_status_issued_at_index(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int]
+        ) -> None:
+    as_of = datetime(2025, 1, 1) + timedelta(days=10)
+    with query_counter() as statements:
+        ReportRepository(test_db_session).aging(
+            as_of, [InvoiceStatus.issued]
+        )
+
+    plan = _assert_no_table_scan(test_db_session, statements)
+    assert "ix_invoice_status_issued_at" in plan
+
+
+def test_customer_email_lookup_uses_index(test_db_session: Session) -> None:
+    stmt = select(Customer).where(Customer.email == "a@example.com")
+    sql = str(stmt.compile(dialect=test_db_session.get_bind().dialect))
+
+    plan = _query_plan(test_db_session, sql)
+    assert any("ix_customer_email" in step for step in plan), plan
+
+
+def test_bulk_transition_uses_indexes(
+        test_db_session: Session,
+        query_counter: QueryCounter,
+        seeded: tuple[int, int]
+        ) -> None:
+    customer_id, invoice_id = seeded
+    invoices = InvoiceRepository(test_db_session)
+    with query_counter() as statements:
+        invoices.transition_status(
+            InvoiceStatus.issued, InvoiceStatus.paid, ids=[invoice_id]
+        )
+        invoices.transition_status(
+            InvoiceStatus.paid, InvoiceStatus.issued, customer_id=customer_id
+        )
+
+    _assert_no_table_scan(test_db_session, statements)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import accounting_api.app.core.db_adapter as db_adapter
+from accounting_api.app.api.errors import not_found_handler
+from accounting_api.app.api.routes import customers, invoices
+from accounting_api.app.core.db_infrastructure import (
+    RoutingSession,
+    make_engine,
+    make_session_factory,
+)
+from accounting_api.app.models.sqlalchemy_models import Base, Customer
+from accounting_api.app.services.errors import NotFoundError
+
+PRIMARY_UNTIL = db_adapter.PRIMARY_UNTIL_HEADER
+
+
+def sync_replica(primary: Path, replica: Path) -> None:
+    """Copy the primary database over the replica (the "replication")."""
+    with closing(sqlite3.connect(primary)) as source, \
+            closing(sqlite3.connect(replica)) as target:
+        source.backup(target)
+
+
+@pytest.fixture()
+def replicated(tmp_path: Path) -> Generator[dict[str, Any], Any, None]:
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "ro.db"
+    primary = make_engine(f"sqlite:///{primary_path}")
+    replica = make_engine(f"sqlite:///{replica_path}")
+    Base.metadata.create_all(bind=primary)
+    sync_replica(primary_path, replica_path)
+    yield {
+        "factory": make_session_factory(primary, replica=replica),
+        "sync": lambda: sync_replica(primary_path, replica_path),
+    }
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture()
+def replica_client(
+        replicated: dict[str, Any],
+        monkeypatch: pytest.MonkeyPatch
+        ) -> Generator[TestClient, Any, None]:
+    # The real `get_db`, with sessions that can read from the replica
+    monkeypatch.setattr(db_adapter, "SessionLocal", replicated["factory"])
+    app = FastAPI()
+    app.include_router(customers.router)
+    app.include_router(invoices.router)
+    app.add_exception_handler(NotFoundError, not_found_handler)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_reads_use_replica_except_within_read_your_writes_window(
+        replica_client: TestClient,
+        replicated: dict[str, Any],
+        auth_headers: dict[str, str]
+        ) -> None:
+    response = replica_client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Replicated", "email": "replica@example.com"},
+    )
+    assert response.status_code == 201
+    customer_id = response.json()["id"]
+    sticky = {PRIMARY_UNTIL: response.headers[PRIMARY_UNTIL]}
+
+    # Not replicated yet: other clients read from the stale replica
+    response = replica_client.get(f"/customers/{customer_id}")
+    assert response.status_code == 404
+    assert PRIMARY_UNTIL not in response.headers
+
+    # The writer echoes its window and reads the primary
+    response = replica_client.get(f"/customers/{customer_id}", headers=sticky)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Replicated"
+
+    replicated["sync"]()
+    response = replica_client.get(f"/customers/{customer_id}")
+    assert response.status_code == 200
+
+    # An expired window reads the replica again
+    expired = {PRIMARY_UNTIL: "1"}
+    response = replica_client.get("/customers/", headers=expired)
+    assert [c["id"] for c in response.json()] == [customer_id]
+
+
+def test_replica_reads_do_not_fill_the_cache(
+        replica_client: TestClient,
+        replicated: dict[str, Any],
+        auth_headers: dict[str, str]
+        ) -> None:
+    customer_id = replica_client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Cached", "email": "cached@example.com"},
+    ).json()["id"]
+    invoice_id = replica_client.post(
+        "/invoices/", headers=auth_headers, json={"customer_id": customer_id}
+    ).json()["id"]
+    replicated["sync"]()
+
+    response = replica_client.post(
+        f"/invoices/{invoice_id}/items",
+        json={"description": "a", "quantity": 1, "unit_price": 5},
+    )
+    assert response.status_code == 201
+
+    # The lagging replica still has the old total ...
+    response = replica_client.get(f"/invoices/{invoice_id}")
+    assert response.json()["total_cents"] == 0
+
+    # ... but it was not cached: once replicated, everyone sees the write
+    replicated["sync"]()
+    response = replica_client.get(f"/invoices/{invoice_id}")
+    assert response.json()["total_cents"] == 500
+
+
+def test_routing_session_writes_go_to_primary(
+        replicated: dict[str, Any]
+        ) -> None:
+    with replicated["factory"]() as db:
+        assert isinstance(db, RoutingSession)
+        db.use_replica = True
+        assert db.scalars(select(Customer)).all() == []
+
+        db.add(Customer(name="Written"))
+        db.flush()
+        # After the first write the session reads what it wrote
+        assert not db.use_replica
+        names = db.scalars(select(Customer.name)).all()
+        assert names == ["Written"]
+        db.commit()
+
+    replicated["sync"]()
+    with replicated["factory"]() as db:
+        db.use_replica = True
+        assert db.scalars(select(Customer.name)).all() == ["Written"]
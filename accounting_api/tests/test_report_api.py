@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from accounting_api.app.models.sqlalchemy_models import (
+    Customer,
+    Invoice,
+    InvoiceStatus,
+)
+from accounting_api.app.services.errors import InvalidOperationError
+from accounting_api.app.services.invoice_service import InvoiceService
+
+AS_OF = datetime(2024, 6, 30)
+
+
+def _invoice(
+        customer: Customer,
+        status: InvoiceStatus,
+        days_old: int | None,
+        total: float
+        ) -> Invoice:
+    issued_at = None if days_old is None else AS_OF - timedelta(days=days_old)
+    return Invoice(
+        customer=customer,
+        status=status,
+        issued_at=issued_at,
+        total_cents=round(total * 100),
+    )
+
+
+def test_aging_report(
+        client: TestClient,
+        auth_headers: dict[str, str],
+        test_db_session: Session,
+        query_counter
+        ) -> None:
+    acme, globex = Customer(name="Acme"), Customer(name="Globex")
+    test_db_session.add_all([
+        _invoice(acme, InvoiceStatus.issued, 5, 100.0),
+        _invoice(acme, InvoiceStatus.issued, 29, 1.5),
+        _invoice(acme, InvoiceStatus.issued, 45, 20.0),
+        _invoice(acme, InvoiceStatus.issued, 75, 30.0),
+        _invoice(acme, InvoiceStatus.paid, 200, 7.0),
+        _invoice(globex, InvoiceStatus.issued, 90, 40.0),
+        _invoice(globex, InvoiceStatus.issued, -1, 999.0),  # after as_of
+        _invoice(globex, InvoiceStatus.draft, None, 5.0),
+    ])
+    test_db_session.flush()
+
+    with query_counter() as statements:
+        response = client.get(
+            "/reports/aging",
+            params={"as_of": AS_OF.isoformat()},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert len(statements) == 1
+    report = response.json()
+    assert report["statuses"] == ["issued"]
+
+    rows = {r["customer_name"]: r for r in report["customers"]}
+    assert rows["Acme"] == {
+        "customer_id": acme.id,
+        "customer_name": "Acme",
+        "status": "issued",
+        "currency": "EUR",
+        "invoice_count": 4,
+        "current": 101.5,
+        "days_30": 20.0,
+        "days_60": 30.0,
+        "days_90_plus": 0.0,
+        "total": 151.5,
+    }
+    assert rows["Globex"]["days_90_plus"] == 40.0
+    assert rows["Globex"]["invoice_count"] == 1
+
+    [overall] = report["overall"]
+    assert overall["invoice_count"] == 5
+    assert overall["total"] == 191.5
+    assert overall["days_90_plus"] == 40.0
+
+    # Several statuses; each gets its own rows and overall entry
+    response = client.get(
+        "/reports/aging",
+        params={"as_of": AS_OF.isoformat(), "status": ["issued", "paid"]},
+        headers=auth_headers,
+    )
+    overall = {o["status"]: o for o in response.json()["overall"]}
+    assert overall["paid"]["days_90_plus"] == 7.0
+    assert overall["issued"]["total"] == 191.5
+
+
+def test_aging_report_keeps_currencies_apart(
+        client: TestClient,
+        auth_headers: dict[str, str],
+        test_db_session: Session
+        ) -> None:
+    initech = Customer(name="Initech")
+    usd = _invoice(initech, InvoiceStatus.issued, 10, 12.5)
+    usd.currency = "USD"
+    test_db_session.add_all([
+        _invoice(initech, InvoiceStatus.issued, 10, 100.0), usd
+    ])
+    test_db_session.flush()
+
+    report = client.get(
+        "/reports/aging",
+        params={"as_of": AS_OF.isoformat(), "status": ["issued", "paid"]},
+        headers=auth_headers,
+    ).json()
+
+    rows = [
+        (r["currency"], r["total"]) for r in report["customers"]
+        if r["customer_name"] == "Initech"
+    ]
+    assert rows == [("EUR", 100.0), ("USD", 12.5)]
+    overall = [
+        (o["status"], o["currency"], o["total"]) for o in report["overall"]
+    ]
+    assert overall == [
+        ("issued", "EUR", 100.0),
+        ("issued", "USD", 12.5),
+        ("paid", "EUR", 0.0),
+    ]
+
+
+def test_aging_report_requires_api_key(client: TestClient) -> None:
+    response = client.get("/reports/aging", headers={"X-API-Key": "wrong"})
+    assert response.status_code == 401
+
+
+def test_issuing_sets_issued_at(test_db_session: Session) -> None:
+    customer = Customer(name="Issuer")
+    test_db_session.add(customer)
+    test_db_session.flush()
+    service = InvoiceService(test_db_session)
+    invoice = service.create_invoice(customer.id)
+
+    service.issue_invoice(invoice.id)
+    assert invoice.status == InvoiceStatus.issued
+    assert invoice.issued_at is not None
+
+
+def test_issue_does_not_overwrite_a_concurrent_payment(
+        test_db_session: Session
+        ) -> None:
+    customer = Customer(name="Racer")
+    test_db_session.add(customer)
+    test_db_session.flush()
+    service = InvoiceService(test_db_session)
+    invoice = service.create_invoice(customer.id)
+    # Another transaction pays the invoice after this session loaded it
+    # as a draft
+    test_db_session.execute(
+        update(Invoice)
+        .where(Invoice.id == invoice.id)
+        .values(status=InvoiceStatus.paid)
+        .execution_options(synchronize_session=False)
+    )
+    assert invoice.status == InvoiceStatus.draft
+
+    with pytest.raises(InvalidOperationError):
+        service.issue_invoice(invoice.id)
+    stored = test_db_session.execute(
+        select(Invoice.status, Invoice.issued_at)
+        .where(Invoice.id == invoice.id)
+    ).one()
+    assert tuple(stored) == (InvoiceStatus.paid, None)
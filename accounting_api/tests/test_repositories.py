@@ -1,8 +1,9 @@
 
-import pytest
 from sqlalchemy.orm import Session
 from accounting_api.app.repositories.customer import CustomerRepository
 from accounting_api.app.repositories.invoice import InvoiceRepository
+from accounting_api.app.models.schemas.invoice import InvoiceRead
+from accounting_api.app.models.sqlalchemy_models import InvoiceStatus
 
 
 def test_customer_and_invoice_repositories(test_db_session: Session):
@@ -13,13 +14,136 @@ def test_customer_and_invoice_repositories(test_db_session: Session):
     assert c.id is not None
 
     inv = invoices.create(c.id)
-    invoices.add_line_item(inv.id, "a", 2, float(10))
-    invoices.add_line_item(inv.id, "b", 1, float(15))
+    invoices.add_line_item(inv.id, "a", 2, 1000)
+    invoices.add_line_item(inv.id, "b", 1, 1500)
 
-    assert inv.total_amount == pytest.approx(35)
+    assert inv.total_cents == 3500
     assert len(invoices.list_by_customer(c.id)) == 1
 
     invoices.delete(inv.id)
     assert invoices.get(inv.id) is None
     customers.delete(c.id)
     assert customers.get(c.id) is None
+
+
+def _seed_invoices(db: Session, count: int) -> int:
+    customers = CustomerRepository(db)
+    invoices = InvoiceRepository(db)
+    c = customers.add(f"customer-{count}", None)
+    for _ in range(count):
+        inv = invoices.create(c.id)
+        invoices.add_line_item(inv.id, "a", 1, 1000)
+        invoices.add_line_item(inv.id, "b", 2, 500)
+    db.expire_all()
+    return c.id
+
+
+def _statements_for_listing(db, query_counter, customer_id) -> int:
+    with query_counter() as statements:
+        rows = InvoiceRepository(db).list_by_customer(customer_id)
+        payload = [InvoiceRead.model_validate(inv) for inv in rows]
+    assert all(inv.total_amount == 20 for inv in payload)
+    return len(statements)
+
+
+def test_list_by_customer_statement_count_is_constant(
+        test_db_session: Session,
+        query_counter
+        ):
+    few = _seed_invoices(test_db_session, 2)
+    many = _seed_invoices(test_db_session, 10)
+
+    few_count = _statements_for_listing(test_db_session, query_counter, few)
+    many_count = _statements_for_listing(test_db_session, query_counter, many)
+
+    # One SELECT for invoices plus one SELECT ... IN for their line items
+    assert few_count == many_count == 2
+
+
+def test_line_item_writes_maintain_invoice_totals(test_db_session: Session):
+    customers = CustomerRepository(test_db_session)
+    invoices = InvoiceRepository(test_db_session)
+
+    c = customers.add("totals", None)
+    inv = invoices.create(c.id)
+    assert inv.total_cents == 0
+    assert inv.line_item_count == 0
+
+    first = invoices.add_line_item(inv.id, "a", 3, 250)
+    invoices.add_line_item(inv.id, "b", 1, 400)
+    assert inv.total_cents == 1150
+    assert inv.line_item_count == 2
+
+    invoices.delete_line_item(first.id)
+    assert inv.total_cents == 400
+    assert inv.line_item_count == 1
+    assert invoices.find_total_drift() == []
+
+
+def test_rebuild_totals_repairs_drift(test_db_session: Session):
+    customers = CustomerRepository(test_db_session)
+    invoices = InvoiceRepository(test_db_session)
+
+    c = customers.add("drift", None)
+    inv = invoices.create(c.id)
+    invoices.add_line_item(inv.id, "a", 2, 1000)
+
+    # Simulate a write that bypassed the repository; off by one cent
+    inv.total_cents = 1999
+    test_db_session.flush()
+
+    drift = invoices.find_total_drift()
+    assert [row.id for row in drift] == [inv.id]
+    assert drift[0].actual_total_cents == 2000
+
+    assert invoices.rebuild_totals([inv.id]) == 1
+    assert inv.total_cents == 2000
+    assert invoices.find_total_drift() == []
+
+
+def test_invoice_writes_bump_version(test_db_session: Session):
+    customers = CustomerRepository(test_db_session)
+    invoices = InvoiceRepository(test_db_session)
+
+    c = customers.add("versions", None)
+    inv = invoices.create(c.id)
+    assert invoices.get_version(inv.id) == 1
+
+    line = invoices.add_line_item(inv.id, "a", 1, 100)
+    invoices.add_line_items(inv.id, [
+        {"description": "b", "quantity": 1, "unit_price_cents": 200},
+    ])
+    invoices.delete_line_item(line.id)
+    assert invoices.update_status(inv.id, InvoiceStatus.issued)
+
+    assert invoices.get_version(inv.id) == 5
+    assert inv.version == 5
+    assert inv.status == InvoiceStatus.issued
+    assert not invoices.update_status(999999, InvoiceStatus.paid)
+
+
+def test_transition_status_in_chunks(
+        test_db_session: Session,
+        query_counter
+        ):
+    customer_id = _seed_invoices(test_db_session, 5)
+    invoices = InvoiceRepository(test_db_session)
+    other = invoices.create(CustomerRepository(test_db_session).add(
+        "other", None
+    ).id)
+
+    with query_counter() as statements:
+        changed = invoices.transition_status(
+            InvoiceStatus.draft,
+            InvoiceStatus.issued,
+            customer_id=customer_id,
+            chunk_size=2,
+        )
+    assert len(changed) == 5
+    # Chunks of 2, 2 and 1 rows, one UPDATE each
+    assert sum(s.startswith("UPDATE") for s in statements) == 3
+    statuses = {
+        inv.status for inv in invoices.list_by_customer(customer_id)
+    }
+    assert statuses == {InvoiceStatus.issued}
+    assert invoices.get(other.id).status == InvoiceStatus.draft
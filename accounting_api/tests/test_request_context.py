@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import re
+
+from accounting_api.app.api.middleware.request_context import (
+    REQUEST_ID_HEADER,
+    SERVER_TIMING_HEADER,
+)
+
+
+def _timings(header: str) -> dict[str, float]:
+    return {
+        name: float(dur)
+        for name, dur in re.findall(r"(\w+);dur=([\d.]+)", header)
+    }
+
+
+def test_request_id_is_generated_or_propagated(client):
+    generated = client.get("/healthz")
+    assert generated.headers[REQUEST_ID_HEADER]
+
+    propagated = client.get("/healthz", headers={REQUEST_ID_HEADER: "abc"})
+    assert propagated.headers[REQUEST_ID_HEADER] == "abc"
+
+
+def test_error_body_carries_request_id(client):
+    response = client.get(
+        "/invoices/999999", headers={REQUEST_ID_HEADER: "r1"}
+    )
+
+    assert response.status_code == 404
+    assert response.json()["error"]["request_id"] == "r1"
+
+
+def test_server_timing_breaks_down_request_time(client, auth_headers):
+    client.post(
+        "/customers/",
+        json={"name": "Timing", "email": "timing@example.com"},
+        headers=auth_headers,
+    )
+    response = client.get("/customers/?limit=10")
+
+    timings = _timings(response.headers[SERVER_TIMING_HEADER])
+    assert set(timings) == {"total", "db", "serialize"}
+    assert timings["db"] > 0
+    assert timings["db"] + timings["serialize"] <= timings["total"]
+
+
+def test_streaming_response_passes_through(client, auth_headers):
+    client.post(
+        "/customers/",
+        json={"name": "Streamed", "email": "streamed@example.com"},
+        headers=auth_headers,
+    )
+    response = client.get("/customers/?stream=true")
+
+    assert response.status_code == 200
+    assert SERVER_TIMING_HEADER in response.headers
+    assert "Streamed" in response.text
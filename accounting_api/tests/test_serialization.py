@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from accounting_api.app.api.serialization import FastJSONResponse
+from accounting_api.app.core.config import settings
+
+
+def _get_both(client: TestClient, monkeypatch, path: str, **kwargs):
+    slow = client.get(path, **kwargs)
+    monkeypatch.setattr(settings, "fast_json", True)
+    fast = client.get(path, **kwargs)
+    monkeypatch.setattr(settings, "fast_json", False)
+    return slow, fast
+
+
+@pytest.fixture()
+def customer_with_invoices(client, auth_headers) -> dict[str, int]:
+    customer = client.post(
+        "/customers/",
+        headers=auth_headers,
+        json={"name": "Fast", "email": "fast@example.com"},
+    ).json()
+    for _ in range(3):
+        invoice = client.post(
+            "/invoices/",
+            headers=auth_headers,
+            json={"customer_id": customer["id"]},
+        ).json()
+        client.post(
+            f"/invoices/{invoice['id']}/items",
+            json={"description": "x", "quantity": 2, "unit_price": 1.25},
+        )
+    return {"customer_id": customer["id"], "invoice_id": invoice["id"]}
+
+
+@pytest.mark.parametrize("path", [
+    "/customers/{customer_id}",
+    "/customers/?limit=1",
+    "/customers/{customer_id}/invoices?limit=2",
+    "/customers/{customer_id}/invoices?include=line_items",
+    "/invoices/{invoice_id}",
+])
+def test_fast_json_matches_default_serialization(
+        client, monkeypatch, customer_with_invoices, path
+        ):
+    slow, fast = _get_both(
+        client, monkeypatch, path.format(**customer_with_invoices)
+    )
+    assert fast.status_code == slow.status_code == 200
+    assert fast.json() == slow.json()
+    assert fast.headers["content-type"] == "application/json"
+    # Headers set by the endpoint survive the bypass
+    for header in ("ETag", "X-Next-Cursor"):
+        assert fast.headers.get(header) == slow.headers.get(header)
+
+
+def test_amounts_are_json_numbers_on_both_paths(
+        client, monkeypatch, auth_headers, customer_with_invoices
+        ):
+    invoice, report = (
+        _get_both(client, monkeypatch, path, headers=auth_headers)
+        for path in (
+            "/invoices/{invoice_id}".format(**customer_with_invoices),
+            "/reports/aging?status=draft",
+        )
+    )
+    for response in invoice:
+        assert response.json()["total_amount"] == 2.5
+        assert response.json()["line_items"][0]["unit_price"] == 1.25
+    slow, fast = (response.json()["overall"] for response in report)
+    assert fast == slow
+    assert isinstance(slow[0]["total"], float)
+
+
+def test_fast_json_response_renders_plain_content():
+    response = FastJSONResponse({"status": "ok", "n": [1, 2.5, None]})
+    assert response.body.replace(b" ", b"") == (
+        b'{"status":"ok","n":[1,2.5,null]}'
+    )
@@ -0,0 +1,20 @@
+import json
+
+from accounting_api.benchmarks import bench_startup
+
+# Far above the ~1 s measured locally: catches eager imports or startup
+# work that grows by whole seconds, not noise
+BUDGET_MS = 10_000
+
+
+def test_startup_is_lazy_and_within_budget(capsys):
+    assert bench_startup.main(["--budget-ms", str(BUDGET_MS)]) == 0
+    results = json.loads(capsys.readouterr().out)
+    cold, warm = results["cold"], results["warm"]
+
+    # Importing the app does not connect to the database
+    assert not cold["engine_built_at_import"]
+    # The first start creates the schema, the next one only checks it
+    assert cold["schema_version_before"] is None
+    assert warm["schema_version_before"] is not None
+    assert warm["total_ms"] <= BUDGET_MS